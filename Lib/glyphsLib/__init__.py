@@ -25,9 +25,10 @@ from fontTools.misc.py23 import tostr
 from glyphsLib.classes import __all__ as __all_classes__
 from glyphsLib.classes import *
 from glyphsLib.builder import to_ufos, to_designspace, to_glyphs
+from glyphsLib.builder.builders import UFOBuilder
 from glyphsLib.builder.instances import InstanceData
 from glyphsLib.interpolation import interpolate
-from glyphsLib.parser import load, loads
+from glyphsLib.parser import load, loads, iterparse
 from glyphsLib.writer import dump, dumps
 from glyphsLib.util import clean_ufo
 
@@ -39,7 +40,7 @@ __version__ = "2.4.1.dev0"
 # https://bugs.python.org/issue21720
 __all__ = [tostr(s) for s in [
     "build_masters", "build_instances", "load_to_ufos",
-    "load", "loads", "dump", "dumps",
+    "load", "loads", "iterparse", "dump", "dumps",
  ] + __all_classes__]
 
 logger = logging.getLogger(__name__)
@@ -52,7 +53,7 @@ def load_to_ufos(file_or_path, include_instances=False, family_name=None,
     if hasattr(file_or_path, 'read'):
         font = load(file_or_path)
     else:
-        with open(file_or_path, 'r', encoding='utf-8') as ifile:
+        with open(file_or_path, 'rb') as ifile:
             font = load(ifile)
     logger.info('Loading to UFOs')
     return to_ufos(font, include_instances=include_instances,
@@ -61,7 +62,7 @@ def load_to_ufos(file_or_path, include_instances=False, family_name=None,
 
 
 def build_masters(filename, master_dir, designspace_instance_dir=None,
-                  family_name=None, propagate_anchors=True):
+                  family_name=None, propagate_anchors=True, stream=False):
     """Write and return UFOs from the masters defined in a .glyphs file.
 
     Args:
@@ -70,6 +71,9 @@ def build_masters(filename, master_dir, designspace_instance_dir=None,
             written alongside the master UFOs though no instances will be built.
         family_name: If provided, the master UFOs will be given this name and
             only instances with this name will be included in the designspace.
+        stream: If True, each master UFO is written as soon as it is built and
+            then released, so that only one of them is in memory at a time.
+            The paths of the UFOs are returned instead of the UFOs.
 
     Returns:
         A list of master UFOs, and if designspace_instance_dir is provided, a
@@ -81,15 +85,20 @@ def build_masters(filename, master_dir, designspace_instance_dir=None,
     instance_dir = None
     if designspace_instance_dir is not None:
         instance_dir = os.path.relpath(designspace_instance_dir, master_dir)
-    designspace = to_designspace(
+    builder = UFOBuilder(
         font, family_name=family_name, propagate_anchors=propagate_anchors,
-        instance_dir=instance_dir)
+        instance_dir=instance_dir, use_designspace=True)
+    if stream:
+        sources = builder.stream_masters()
+    else:
+        sources = builder.designspace.sources
     ufos = []
-    for source in designspace.sources:
-        ufos.append(source.font)
+    for source in sources:
         ufo_path = os.path.join(master_dir, source.filename)
         clean_ufo(ufo_path)
         source.font.save(ufo_path)
+        ufos.append(ufo_path if stream else source.font)
+    designspace = builder.designspace
 
     if designspace_instance_dir is not None:
         designspace_path = os.path.join(master_dir, designspace.filename)
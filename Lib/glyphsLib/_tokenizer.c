@@ -0,0 +1,393 @@
+/*
+ * Copyright 2018 Google Inc. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Optional accelerator for the "fast" engine of glyphsLib.parser.
+ *
+ * next_token(text, pos) behaves exactly like glyphsLib.parser._py_next_token:
+ * it skips whitespace, reads one token of the Glyphs property list dialect
+ * and returns a (kind, value, start, end) tuple, or None if no token can be
+ * read at pos. Quoted strings are returned without quotes and with their
+ * escapes decoded, hexadecimal data is returned as bytes.
+ *
+ * next_bytes_token(data, pos) is the same for UTF-8 encoded data, like
+ * glyphsLib.parser._py_next_bytes_token: data is any object that supports
+ * the buffer protocol, positions are byte offsets.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* Token kinds, keep in sync with glyphsLib/parser.py */
+enum {
+    START_DICT = 1,
+    START_LIST,
+    STRING,
+    BARE,
+    HEX,
+    END_DICT,
+    END_LIST,
+    DICT_DELIM,
+    LIST_DELIM,
+    ASSIGN
+};
+
+static int
+is_bare_char(Py_UCS4 c)
+{
+    return ((c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z') ||
+            (c >= '0' && c <= '9') || c == '-' || c == '_' || c == '.' ||
+            c == '/' || c == '$');
+}
+
+static int
+hex_digit(Py_UCS4 c)
+{
+    if (c >= '0' && c <= '9')
+        return (int)(c - '0');
+    if (c >= 'a' && c <= 'f')
+        return (int)(c - 'a' + 10);
+    if (c >= 'A' && c <= 'F')
+        return (int)(c - 'A' + 10);
+    return -1;
+}
+
+/*
+ * Decode the content of a quoted string between start and end (exclusive),
+ * like Parser._trim_value: \" becomes ", \0oo is an octal escape between
+ * \000 and \077 and \Uhhhh is a hexadecimal escape. Any other backslash is
+ * kept as is.
+ */
+static PyObject *
+decode_string(PyObject *text, int kind, const void *data,
+              Py_ssize_t start, Py_ssize_t end)
+{
+    Py_ssize_t i, n = 0;
+    Py_UCS4 *buffer;
+    PyObject *result;
+
+    for (i = start; i < end; i++) {
+        if (PyUnicode_READ(kind, data, i) == '\\')
+            break;
+    }
+    if (i == end)
+        return PyUnicode_Substring(text, start, end);
+
+    buffer = PyMem_New(Py_UCS4, end - start);
+    if (buffer == NULL)
+        return PyErr_NoMemory();
+
+    i = start;
+    while (i < end) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        if (c == '\\' && i + 1 < end) {
+            Py_UCS4 next = PyUnicode_READ(kind, data, i + 1);
+            if (next == '"') {
+                buffer[n++] = '"';
+                i += 2;
+                continue;
+            }
+            if (next == '0' && i + 3 < end) {
+                Py_UCS4 d1 = PyUnicode_READ(kind, data, i + 2);
+                Py_UCS4 d2 = PyUnicode_READ(kind, data, i + 3);
+                if (d1 >= '0' && d1 <= '7' && d2 >= '0' && d2 <= '7') {
+                    buffer[n++] = (d1 - '0') * 8 + (d2 - '0');
+                    i += 4;
+                    continue;
+                }
+            }
+            if (next == 'U' && i + 5 < end) {
+                int j, digit;
+                Py_UCS4 value = 0;
+                for (j = 0; j < 4; j++) {
+                    digit = hex_digit(PyUnicode_READ(kind, data, i + 2 + j));
+                    if (digit < 0)
+                        break;
+                    value = value * 16 + (Py_UCS4)digit;
+                }
+                if (j == 4) {
+                    buffer[n++] = value;
+                    i += 6;
+                    continue;
+                }
+            }
+        }
+        buffer[n++] = c;
+        i++;
+    }
+
+    result = PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buffer, n);
+    PyMem_Free(buffer);
+    return result;
+}
+
+static PyObject *
+decode_hex(int kind, const void *data, Py_ssize_t start, Py_ssize_t end)
+{
+    Py_ssize_t i, size;
+    PyObject *result;
+    char *bytes;
+
+    if ((end - start) % 2) {
+        PyErr_SetString(PyExc_ValueError, "Odd-length string");
+        return NULL;
+    }
+    size = (end - start) / 2;
+    result = PyBytes_FromStringAndSize(NULL, size);
+    if (result == NULL)
+        return NULL;
+    bytes = PyBytes_AS_STRING(result);
+    for (i = 0; i < size; i++) {
+        int high = hex_digit(PyUnicode_READ(kind, data, start + 2 * i));
+        int low = hex_digit(PyUnicode_READ(kind, data, start + 2 * i + 1));
+        bytes[i] = (char)(high * 16 + low);
+    }
+    return result;
+}
+
+static int
+is_byte_space(char c)
+{
+    return (c == ' ' || c == '\t' || c == '\n' || c == '\r' || c == '\v' ||
+            c == '\f');
+}
+
+static PyObject *
+decode_bytes_string(const char *data, Py_ssize_t start, Py_ssize_t end)
+{
+    PyObject *raw, *result;
+
+    raw = PyUnicode_DecodeUTF8(data + start, end - start, NULL);
+    if (raw == NULL || memchr(data + start, '\\', end - start) == NULL)
+        return raw;
+    result = decode_string(raw, PyUnicode_KIND(raw), PyUnicode_DATA(raw),
+                           0, PyUnicode_GET_LENGTH(raw));
+    Py_DECREF(raw);
+    return result;
+}
+
+static PyObject *
+decode_bytes_hex(const char *data, Py_ssize_t start, Py_ssize_t end)
+{
+    Py_ssize_t i, size;
+    PyObject *result;
+    char *bytes;
+
+    if ((end - start) % 2) {
+        PyErr_SetString(PyExc_ValueError, "Odd-length string");
+        return NULL;
+    }
+    size = (end - start) / 2;
+    result = PyBytes_FromStringAndSize(NULL, size);
+    if (result == NULL)
+        return NULL;
+    bytes = PyBytes_AS_STRING(result);
+    for (i = 0; i < size; i++) {
+        int high = hex_digit((unsigned char)data[start + 2 * i]);
+        int low = hex_digit((unsigned char)data[start + 2 * i + 1]);
+        bytes[i] = (char)(high * 16 + low);
+    }
+    return result;
+}
+
+static PyObject *
+next_token(PyObject *self, PyObject *args)
+{
+    PyObject *text, *value;
+    Py_ssize_t pos, length, start, end;
+    int kind, token;
+    const void *data;
+    Py_UCS4 c;
+
+    if (!PyArg_ParseTuple(args, "Un:next_token", &text, &pos))
+        return NULL;
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(text) < 0)
+        return NULL;
+#endif
+    length = PyUnicode_GET_LENGTH(text);
+    kind = PyUnicode_KIND(text);
+    data = PyUnicode_DATA(text);
+
+    if (pos < 0)
+        pos = 0;
+    while (pos < length && Py_UNICODE_ISSPACE(PyUnicode_READ(kind, data, pos)))
+        pos++;
+    if (pos >= length)
+        Py_RETURN_NONE;
+
+    start = pos;
+    c = PyUnicode_READ(kind, data, pos);
+    switch (c) {
+    case '{': token = START_DICT; break;
+    case '(': token = START_LIST; break;
+    case '}': token = END_DICT; break;
+    case ')': token = END_LIST; break;
+    case ';': token = DICT_DELIM; break;
+    case ',': token = LIST_DELIM; break;
+    case '=': token = ASSIGN; break;
+    case '"': token = STRING; break;
+    case '<': token = HEX; break;
+    default:
+        if (!is_bare_char(c))
+            Py_RETURN_NONE;
+        token = BARE;
+    }
+
+    if (token == STRING) {
+        /* The string ends at the first quote not preceded by a backslash */
+        for (end = start + 1; end < length; end++) {
+            if (PyUnicode_READ(kind, data, end) == '"' &&
+                    PyUnicode_READ(kind, data, end - 1) != '\\')
+                break;
+        }
+        if (end >= length)
+            Py_RETURN_NONE;
+        end++;
+        value = decode_string(text, kind, data, start + 1, end - 1);
+    }
+    else if (token == HEX) {
+        for (end = start + 1; end < length; end++) {
+            if (hex_digit(PyUnicode_READ(kind, data, end)) < 0)
+                break;
+        }
+        if (end == start + 1 || end >= length ||
+                PyUnicode_READ(kind, data, end) != '>')
+            Py_RETURN_NONE;
+        end++;
+        value = decode_hex(kind, data, start + 1, end - 1);
+    }
+    else if (token == BARE) {
+        for (end = start + 1; end < length; end++) {
+            if (!is_bare_char(PyUnicode_READ(kind, data, end)))
+                break;
+        }
+        value = PyUnicode_Substring(text, start, end);
+    }
+    else {
+        end = start + 1;
+        value = PyUnicode_Substring(text, start, end);
+    }
+    if (value == NULL)
+        return NULL;
+    return Py_BuildValue("(iNnn)", token, value, start, end);
+}
+
+static PyObject *
+next_bytes_token(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    PyObject *value;
+    Py_ssize_t pos, length, start, end;
+    int token;
+    const char *data;
+    char c;
+
+    if (!PyArg_ParseTuple(args, "y*n:next_bytes_token", &buffer, &pos))
+        return NULL;
+    length = buffer.len;
+    data = (const char *)buffer.buf;
+
+    if (pos < 0)
+        pos = 0;
+    while (pos < length && is_byte_space(data[pos]))
+        pos++;
+    if (pos >= length)
+        goto none;
+
+    start = pos;
+    c = data[pos];
+    switch (c) {
+    case '{': token = START_DICT; break;
+    case '(': token = START_LIST; break;
+    case '}': token = END_DICT; break;
+    case ')': token = END_LIST; break;
+    case ';': token = DICT_DELIM; break;
+    case ',': token = LIST_DELIM; break;
+    case '=': token = ASSIGN; break;
+    case '"': token = STRING; break;
+    case '<': token = HEX; break;
+    default:
+        if (!is_bare_char((unsigned char)c))
+            goto none;
+        token = BARE;
+    }
+
+    if (token == STRING) {
+        /* UTF-8 continuation bytes are never quotes or backslashes */
+        for (end = start + 1; end < length; end++) {
+            if (data[end] == '"' && data[end - 1] != '\\')
+                break;
+        }
+        if (end >= length)
+            goto none;
+        end++;
+        value = decode_bytes_string(data, start + 1, end - 1);
+    }
+    else if (token == HEX) {
+        for (end = start + 1; end < length; end++) {
+            if (hex_digit((unsigned char)data[end]) < 0)
+                break;
+        }
+        if (end == start + 1 || end >= length || data[end] != '>')
+            goto none;
+        end++;
+        value = decode_bytes_hex(data, start + 1, end - 1);
+    }
+    else if (token == BARE) {
+        for (end = start + 1; end < length; end++) {
+            if (!is_bare_char((unsigned char)data[end]))
+                break;
+        }
+        value = PyUnicode_DecodeASCII(data + start, end - start, NULL);
+    }
+    else {
+        end = start + 1;
+        value = PyUnicode_FromOrdinal((unsigned char)c);
+    }
+    PyBuffer_Release(&buffer);
+    if (value == NULL)
+        return NULL;
+    return Py_BuildValue("(iNnn)", token, value, start, end);
+
+none:
+    PyBuffer_Release(&buffer);
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef tokenizer_methods[] = {
+    {"next_token", next_token, METH_VARARGS,
+     "next_token(text, pos) -> (kind, value, start, end) or None\n\n"
+     "Read the token of the Glyphs source `text` that follows `pos`."},
+    {"next_bytes_token", next_bytes_token, METH_VARARGS,
+     "next_bytes_token(data, pos) -> (kind, value, start, end) or None\n\n"
+     "Like next_token, for UTF-8 encoded data."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef tokenizer_module = {
+    PyModuleDef_HEAD_INIT,
+    "glyphsLib._tokenizer",
+    "C implementation of the tokenizer used by glyphsLib.parser.",
+    -1,
+    tokenizer_methods
+};
+
+PyMODINIT_FUNC
+PyInit__tokenizer(void)
+{
+    return PyModule_Create(&tokenizer_module);
+}
@@ -29,7 +29,8 @@ def to_ufos(font,
             family_name=None,
             propagate_anchors=True,
             ufo_module=defcon,
-            minimize_glyphs_diffs=False):
+            minimize_glyphs_diffs=False,
+            workers=1):
     """Take a GSFont object and convert it into one UFO per master.
 
     Takes in data as Glyphs.app-compatible classes, as documented at
@@ -39,13 +40,17 @@ def to_ufos(font,
 
     If family_name is provided, the master UFOs will be given this name and
     only instances with this name will be returned.
+
+    If workers is greater than 1, the glyphs of the master UFOs are built in
+    that many processes (None: one per CPU), for fonts with many masters.
     """
     builder = UFOBuilder(
         font,
         ufo_module=ufo_module,
         family_name=family_name,
         propagate_anchors=propagate_anchors,
-        minimize_glyphs_diffs=minimize_glyphs_diffs)
+        minimize_glyphs_diffs=minimize_glyphs_diffs,
+        workers=workers)
 
     result = list(builder.masters)
 
@@ -59,7 +64,8 @@ def to_designspace(font,
                    instance_dir=None,
                    propagate_anchors=True,
                    ufo_module=defcon,
-                   minimize_glyphs_diffs=False):
+                   minimize_glyphs_diffs=False,
+                   workers=1):
     """Take a GSFont object and convert it into a Designspace Document + UFOS.
     The UFOs are available as the attribute `font` of each SourceDescriptor of
     the DesignspaceDocument:
@@ -78,6 +84,9 @@ def to_designspace(font,
 
     If family_name is provided, the master UFOs will be given this name and
     only instances with this name will be returned.
+
+    If workers is greater than 1, the glyphs of the master UFOs are built in
+    that many processes (None: one per CPU), for fonts with many masters.
     """
     builder = UFOBuilder(
         font,
@@ -86,7 +95,8 @@ def to_designspace(font,
         instance_dir=instance_dir,
         propagate_anchors=propagate_anchors,
         use_designspace=True,
-        minimize_glyphs_diffs=minimize_glyphs_diffs)
+        minimize_glyphs_diffs=minimize_glyphs_diffs,
+        workers=workers)
     return builder.designspace
 
 
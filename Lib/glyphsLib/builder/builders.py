@@ -56,7 +56,8 @@ class UFOBuilder(_LoggerMixin):
                  instance_dir=None,
                  propagate_anchors=True,
                  use_designspace=False,
-                 minimize_glyphs_diffs=False):
+                 minimize_glyphs_diffs=False,
+                 workers=1):
         """Create a builder that goes from Glyphs to UFO + designspace.
 
         Keyword arguments:
@@ -76,6 +77,9 @@ class UFOBuilder(_LoggerMixin):
         minimize_glyphs_diffs -- set to True to store extra info in UFOs
                                  in order to get smaller diffs between .glyphs
                                  .glyphs files when going glyphs->ufo->glyphs.
+        workers -- number of processes used to build the glyphs of the master
+                   UFOs. The default 1 builds them in this process, None uses
+                   one process per CPU.
         """
         self.font = font
         self.ufo_module = ufo_module
@@ -84,6 +88,7 @@ class UFOBuilder(_LoggerMixin):
         self.propagate_anchors = propagate_anchors
         self.use_designspace = use_designspace
         self.minimize_glyphs_diffs = minimize_glyphs_diffs
+        self.workers = workers
 
         # The set of (SourceDescriptor + UFO)s that will be built,
         # indexed by master ID, the same order as masters in the source GSFont.
@@ -96,6 +101,9 @@ class UFOBuilder(_LoggerMixin):
         # document itself is requested by the user.
         self._designspace = self.designspace_module.DesignSpaceDocument()
         self._designspace_is_complete = False
+        # Whether `stream_masters` has already built the sources, whose
+        # UFOs are gone afterwards.
+        self._designspace_sources_are_built = False
 
         # check that source was generated with at least stable version 2.3
         # https://github.com/googlei18n/glyphsLib/pull/65#issuecomment-237158140
@@ -123,21 +131,73 @@ class UFOBuilder(_LoggerMixin):
                 yield source.font
             return
 
+        # See `stream_masters` to create one font at a time and reduce memory
+        # usage.
+        self.to_ufo_font_attributes(self.family_name)
+
+        if self.workers != 1 and len(self._sources) > 1:
+            self.to_ufo_masters_in_pool()
+        else:
+            self.to_ufo_master_glyphs()
+
+        self.to_ufo_features()  # This depends on the glyphOrder key
+        self.to_ufo_groups()
+        self.to_ufo_kerning()
+
+        for source in self._sources.values():
+            yield source.font
+
+    def stream_masters(self):
+        """Get an iterator over the designspace sources of the master UFOs,
+        each with its UFO in `source.font` and its file name in
+        `source.filename`.
+
+        Each UFO is completely built when it is yielded, and the builder
+        forgets it when the next one is requested, so that only one master
+        UFO at a time has to be in memory. The `designspace` can still be
+        built afterwards, but without UFOs in its sources.
+        """
+        if self._sources:
+            for source in self._sources.values():
+                yield source
+            return
+
+        self.to_ufo_font_attributes(self.family_name)
+        # The file names of the sources must be known before their UFOs are
+        # released.
+        self.to_designspace_sources()
+        self._designspace_sources_are_built = True
+
+        for master_id, source in self._sources.items():
+            master_ids = {master_id}
+            self.to_ufo_master_glyphs(master_ids)
+            self.to_ufo_features(master_ids)
+            self.to_ufo_groups(master_ids)
+            self.to_ufo_kerning(master_ids)
+            yield source
+            source.font = None
+
+    def to_ufo_master_glyphs(self, master_ids=None):
+        """Convert the glyphs of the masters whose ids are in `master_ids`
+        (default: all masters) into their UFOs, which must already have been
+        created by `to_ufo_font_attributes`.
+        """
         # Store set of actually existing master (layer) ids. This helps with
         # catching dangling layer data that Glyphs may ignore, e.g. when
         # copying glyphs from other fonts with, naturally, different master
         # ids. Note: Masters have unique ids according to the Glyphs
         # documentation and can therefore be stored in a set.
         master_layer_ids = {m.id for m in self.font.masters}
+        if master_ids is None:
+            master_ids = master_layer_ids
+        # Only warn about dangling layers once when the masters are built in
+        # several calls.
+        warn_dangling = (not self.font.masters or
+                         self.font.masters[0].id in master_ids)
 
         # stores background data from "associated layers"
         supplementary_layer_data = []
 
-        # TODO(jamesgk) maybe create one font at a time to reduce memory usage
-        # TODO: (jany) in the future, return a lazy iterator that builds UFOs
-        #     on demand.
-        self.to_ufo_font_attributes(self.family_name)
-
         for glyph in self.font.glyphs:
             for layer in glyph.layers.values():
                 if layer.associatedMasterId != layer.layerId:
@@ -146,6 +206,9 @@ class UFOBuilder(_LoggerMixin):
                     # them and print a warning below.
                     supplementary_layer_data.append((glyph, layer))
                     continue
+                if (layer.layerId in master_layer_ids and
+                        layer.layerId not in master_ids):
+                    continue
 
                 ufo_layer = self.to_ufo_layer(glyph, layer)
                 ufo_glyph = ufo_layer.newGlyph(glyph.name)
@@ -154,7 +217,7 @@ class UFOBuilder(_LoggerMixin):
         for glyph, layer in supplementary_layer_data:
             if (layer.layerId not in master_layer_ids and
                     layer.associatedMasterId not in master_layer_ids):
-                if self.minimize_glyphs_diffs:
+                if self.minimize_glyphs_diffs and warn_dangling:
                     self.logger.warning(
                         '{}, glyph "{}": Layer "{}" is dangling and will be '
                         'skipped. Did you copy a glyph from a different font?'
@@ -163,6 +226,10 @@ class UFOBuilder(_LoggerMixin):
                             self.font.familyName, glyph.name, layer.layerId))
                 continue
 
+            master_id = layer.associatedMasterId or layer.layerId
+            if master_id in master_layer_ids and master_id not in master_ids:
+                continue
+
             if not layer.name:
                 # Empty layer names are invalid according to the UFO spec.
                 if self.minimize_glyphs_diffs:
@@ -176,20 +243,15 @@ class UFOBuilder(_LoggerMixin):
             ufo_glyph = ufo_layer.newGlyph(glyph.name)
             self.to_ufo_glyph(ufo_glyph, layer, layer.parent)
 
-        for source in self._sources.values():
+        for master_id, source in self._sources.items():
+            if master_id not in master_ids:
+                continue
             ufo = source.font
             if self.propagate_anchors:
                 self.to_ufo_propagate_font_anchors(ufo)
             for layer in ufo.layers:
                 self.to_ufo_layer_lib(layer)
 
-        self.to_ufo_features()  # This depends on the glyphOrder key
-        self.to_ufo_groups()
-        self.to_ufo_kerning()
-
-        for source in self._sources.values():
-            yield source.font
-
     @property
     def designspace(self):
         """Get a designspace Document instance that links the masters together
@@ -200,7 +262,8 @@ class UFOBuilder(_LoggerMixin):
         self._designspace_is_complete = True
         ufos = list(self.masters)  # Make sure that the UFOs are built
         self.to_designspace_axes()
-        self.to_designspace_sources()
+        if not self._designspace_sources_are_built:
+            self.to_designspace_sources()
         self.to_designspace_instances()
         self.to_designspace_family_user_data()
 
@@ -254,6 +317,7 @@ class UFOBuilder(_LoggerMixin):
     from .layers import to_ufo_layer, to_ufo_background_layer
     from .masters import to_ufo_master_attributes
     from .names import to_ufo_names
+    from .parallel import to_ufo_masters_in_pool
     from .paths import to_ufo_paths
     from .sources import to_designspace_sources
     from .user_data import (to_designspace_family_user_data,
@@ -37,8 +37,10 @@ def autostr(automatic):
     return '# automatic\n' if automatic else ''
 
 
-def to_ufo_features(self):
+def to_ufo_features(self, master_ids=None):
     for master_id, source in self._sources.items():
+        if master_ids is not None and master_id not in master_ids:
+            continue
         master = self.font.masters[master_id]
         _to_ufo_features(self, master, source.font)
 
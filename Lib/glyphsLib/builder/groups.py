@@ -27,7 +27,7 @@ UFO_GROUPS_NOT_IN_FEATURE_KEY = GLYPHLIB_PREFIX + 'groupsNotInFeature'
 UFO_KERN_GROUP_PATTERN = re.compile('^public\\.kern([12])\\.(.*)$')
 
 
-def to_ufo_groups(self):
+def to_ufo_groups(self, master_ids=None):
     # Build groups once and then apply to all UFOs.
     groups = defaultdict(list)
 
@@ -81,7 +81,9 @@ def to_ufo_groups(self):
                     groups[group].append(glyph.name)
 
     # Update all UFOs with the same info
-    for source in self._sources.values():
+    for master_id, source in self._sources.items():
+        if master_ids is not None and master_id not in master_ids:
+            continue
         for name, glyphs in groups.items():
             # Shallow copy to prevent unexpected object sharing
             source.font.groups[name] = glyphs[:]
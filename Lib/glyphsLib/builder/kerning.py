@@ -20,8 +20,10 @@ import re
 UFO_KERN_GROUP_PATTERN = re.compile('^public\\.kern([12])\\.(.*)$')
 
 
-def to_ufo_kerning(self):
+def to_ufo_kerning(self, master_ids=None):
     for master_id, kerning in self.font.kerning.items():
+        if master_ids is not None and master_id not in master_ids:
+            continue
         _to_ufo_kerning(self, self._sources[master_id].font, kerning)
 
 
@@ -0,0 +1,117 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import importlib
+import multiprocessing
+
+try:
+    from fontTools.ufoLib import glifLib
+except ImportError:
+    from ufoLib import glifLib
+
+# The font and the UFOBuilder keyword arguments of a worker process, set once
+# per process by `_init_worker`.
+_worker = {}
+
+
+def to_ufo_masters_in_pool(self):
+    """Build the glyphs of the master UFOs in a pool of `self.workers`
+    processes, one master per task.
+
+    Forked workers inherit the font, otherwise it is sent to them as .glyphs
+    text that each of them parses once. The UFOs built by the workers come
+    back as plain data (lib and glif strings) that is copied into the UFOs
+    made by `to_ufo_font_attributes`.
+    """
+    from glyphsLib.util import workers_are_forked
+    from glyphsLib.writer import dumps
+
+    font = self.font
+    if not workers_are_forked():
+        font = dumps(font)
+    master_ids = list(self._sources.keys())
+    options = dict(
+        ufo_module=self.ufo_module.__name__,
+        designspace_module=self.designspace_module.__name__,
+        family_name=self.family_name,
+        propagate_anchors=self.propagate_anchors,
+        use_designspace=self.use_designspace,
+        minimize_glyphs_diffs=self.minimize_glyphs_diffs)
+    processes = min(self.workers or multiprocessing.cpu_count(),
+                    len(master_ids))
+
+    pool = multiprocessing.Pool(processes, _init_worker, (font, options))
+    try:
+        results = pool.map(_build_master, master_ids, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    for master_id, data in zip(master_ids, results):
+        _load_ufo(self._sources[master_id].font, data)
+
+
+def _init_worker(font, options):
+    from glyphsLib.classes import GSFont
+    from glyphsLib.parser import loads
+
+    if not isinstance(font, GSFont):
+        font = loads(font)
+        for master in font.masters:
+            master.font = font
+    options = dict(options)
+    for key in ('ufo_module', 'designspace_module'):
+        options[key] = importlib.import_module(options[key])
+    _worker['font'] = font
+    _worker['options'] = options
+
+
+def _build_master(master_id):
+    from .builders import UFOBuilder
+
+    builder = UFOBuilder(_worker['font'], **_worker['options'])
+    builder.to_ufo_font_attributes(builder.family_name)
+    builder.to_ufo_master_glyphs({master_id})
+    return _dump_ufo(builder._sources[master_id].font)
+
+
+def _dump_ufo(ufo):
+    """Return the lib and the layers of `ufo` as picklable data."""
+    layers = []
+    for layer in ufo.layers:
+        glyphs = [(glyph.name, glifLib.writeGlyphToString(
+                      glyph.name, glyph, glyph.drawPoints, validate=False))
+                  for glyph in layer]
+        layers.append((layer.name, dict(layer.lib), glyphs))
+    return dict(ufo.lib), layers
+
+
+def _load_ufo(ufo, data):
+    """Copy the data returned by `_dump_ufo` into `ufo`."""
+    lib, layers = data
+    ufo.lib.update(lib)
+    for name, layer_lib, glyphs in layers:
+        if name in ufo.layers:
+            layer = ufo.layers[name]
+        else:
+            layer = ufo.newLayer(name)
+        layer.lib.update(layer_lib)
+        for glyph_name, glif in glyphs:
+            glyph = layer.newGlyph(glyph_name)
+            glifLib.readGlyphFromString(glif, glyph, glyph.getPointPen(),
+                                        validate=False)
@@ -0,0 +1,188 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An on-disk cache of parsed .glyphs files.
+
+`GSFont(path, cache_dir=...)` stores a snapshot of the font it parsed in
+`cache_dir`, and loads that snapshot instead of parsing the file again as
+long as neither the file nor glyphsLib have changed.
+"""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import gc
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+import glyphsLib
+
+logger = logging.getLogger(__name__)
+
+# The number of bytes that the snapshots of a cache directory can take
+DEFAULT_MAX_SIZE = 2 ** 30
+
+_SUFFIX = '.glyphscache'
+
+
+class ParseCache(object):
+    """The snapshots of parsed fonts stored in `directory`, one file each.
+
+    A snapshot is found by a key that hashes the size, modification time
+    and content of the .glyphs file, the options it was parsed with and the
+    version of glyphsLib. When the snapshots take more than `max_size`
+    bytes, the least recently used ones are removed.
+
+    Snapshots are read with `pickle`, so anyone who can write to
+    `directory` can run code when a font is loaded from it. Only use a
+    private directory that untrusted users cannot write to.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, path, data, **options):
+        """Return the key of the file at `path`, of which `data` is the
+        content (bytes or a memory map)."""
+        stat = os.stat(path)
+        header = repr((glyphsLib.__version__, sys.version_info[0],
+                       stat.st_size, stat.st_mtime, sorted(options.items())))
+        digest = hashlib.sha256(header.encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def load(self, key, font):
+        """Set up `font` from the snapshot stored under `key`.
+
+        Return False if there is no usable snapshot.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return False
+        # Like for the glyphs of a parse in a pool, see parser.py
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with io.open(path, 'rb') as fp:
+                state = _FontUnpickler(fp, font).load()
+        except Exception as e:
+            logger.warning('Ignoring unreadable parse cache %s: %s', path, e)
+            _remove(path)
+            return False
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        font.__dict__.update(state)
+        try:
+            os.utime(path, None)  # see `evict`
+        except EnvironmentError:
+            pass
+        return True
+
+    def store(self, key, font):
+        """Store a snapshot of `font` under `key`, then `evict`.
+
+        Failing to write the snapshot is logged, not raised.
+        """
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, temp_path = tempfile.mkstemp(suffix='.tmp',
+                                             dir=self.directory)
+            try:
+                with io.open(fd, 'wb') as fp:
+                    _FontPickler(fp, font).dump(font.__getstate__())
+                _replace(temp_path, self._path(key))
+            except BaseException:
+                _remove(temp_path)
+                raise
+        except (EnvironmentError, pickle.PicklingError) as e:
+            logger.warning('Cannot write to parse cache %s: %s',
+                           self.directory, e)
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used snapshots until they take at most
+        `max_size` bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except EnvironmentError:  # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            _remove(path)
+            total -= size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+
+class _FontPickler(pickle.Pickler):
+    """Pickle the attributes of a font. The references to the font itself,
+    like the parent of its glyphs, are pickled as a placeholder."""
+
+    def __init__(self, fp, font):
+        pickle.Pickler.__init__(self, fp, pickle.HIGHEST_PROTOCOL)
+        self.font = font
+
+    def persistent_id(self, obj):
+        if obj is self.font:
+            return 'font'
+        return None
+
+
+class _FontUnpickler(pickle.Unpickler):
+    """Unpickle what `_FontPickler` pickled, with `font` in place of the
+    placeholder."""
+
+    def __init__(self, fp, font):
+        pickle.Unpickler.__init__(self, fp)
+        self.font = font
+
+    def persistent_load(self, pid):
+        if pid != 'font':
+            raise pickle.UnpicklingError('Unknown object: %r' % (pid,))
+        return self.font
+
+
+def _replace(source, destination):
+    replace = getattr(os, 'replace', None)
+    if replace is None:  # Python 2
+        if os.name == 'nt' and os.path.exists(destination):
+            os.remove(destination)
+        replace = os.rename
+    replace(source, destination)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except EnvironmentError:
+        pass
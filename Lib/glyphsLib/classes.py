@@ -20,6 +20,8 @@ from __future__ import print_function, division, unicode_literals
 import re
 import os
 import math
+from array import array
+import copy
 import inspect
 import traceback
 import uuid
@@ -27,8 +29,9 @@ import logging
 import glyphsLib
 from glyphsLib.types import (
     ValueType, Transform, Point, Rect, Size, parse_datetime, parse_color,
-    floatToString, readIntlist, writeIntlist, UnicodesList)
-from glyphsLib.parser import Parser
+    floatToString, floatsToStrings, readIntlist, writeIntlist, UnicodesList)
+from glyphsLib.parser import Parser, LazyValue, _map_file
+from glyphsLib.cache import ParseCache
 from glyphsLib.writer import Writer, escape_string
 from collections import OrderedDict
 from fontTools.misc.py23 import unicode, basestring, UnicodeIO, unichr, open
@@ -249,25 +252,113 @@ class GSApplication(object):
 Glyphs = GSApplication()
 
 
+def _default_factory(cls, key):
+    """Return the function that makes the default value of a key of a
+    GSBase class."""
+    klass = cls._classesForName[key]
+    if inspect.isclass(klass) and issubclass(klass, GSBase):
+        # FIXME: (jany) Why?
+        # For GSLayer::backgroundImage, I was getting [] instead of None when no image
+        return list
+    if key in cls._defaultsForName:
+        default = cls._defaultsForName[key]
+        return lambda: default
+    return klass
+
+
+# The types of the default values that `_LazyDefault` can share between
+# all the objects of a class.
+_IMMUTABLE_TYPES = (type(None), bool, int, float, str, unicode, bytes, tuple)
+
+_UNKNOWN = object()
+
+
+class _LazyDefault(object):
+    """The default value of a key of a GSBase class, made when it is first
+    read on an object that the file or the user did not give a value.
+
+    It is a non-data descriptor: the values that were set are in the
+    `__dict__` of the object and take precedence. A new mutable default,
+    like an empty list, is stored in the object as soon as it is read so
+    that it can be modified in place. Immutable defaults are not stored.
+    """
+    __slots__ = ('name', 'factory', 'value')
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self.value = _UNKNOWN
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self.value
+        if value is not _UNKNOWN:
+            return value
+        value = self.factory()
+        if isinstance(value, _IMMUTABLE_TYPES):
+            self.value = value
+        else:
+            obj.__dict__[self.name] = value
+        return value
+
+
+def _add_lazy_defaults(cls):
+    """Give the keys of `cls` that have no attribute yet a `_LazyDefault`,
+    and return the (key, attribute, factory) of the keys whose attribute is
+    a property: these are set by `GSBase.__init__` as before.
+    """
+    eager = []
+    for key in cls._classesForName:
+        name = cls._wrapperKeysTranslate.get(key, key)
+        existing = _UNKNOWN
+        for base in cls.__mro__:
+            if name in base.__dict__:
+                existing = base.__dict__[name]
+                break
+        if existing is _UNKNOWN or isinstance(existing, _LazyDefault):
+            setattr(cls, name, _LazyDefault(name, _default_factory(cls, key)))
+        elif (hasattr(existing, "__set__") and
+                existing not in _PROXY_PROPERTIES):
+            # A proxy always exists, so it is never set here
+            eager.append((key, name, _default_factory(cls, key)))
+    _EAGER_DEFAULTS[cls] = eager
+    return eager
+
+
+# GSBase subclass -> what `_add_lazy_defaults` returned for it
+_EAGER_DEFAULTS = {}
+
+
 class GSBase(object):
     _classesForName = {}
     _defaultsForName = {}
     _wrapperKeysTranslate = {}
 
     def __init__(self):
-        for key in self._classesForName.keys():
+        # Most keys get their default values when they are first read, see
+        # `_LazyDefault`: most of them are never set in a file.
+        eager = _EAGER_DEFAULTS.get(type(self))
+        if eager is None:
+            eager = _add_lazy_defaults(type(self))
+        for key, name, factory in eager:
             if not hasattr(self, key):
-                klass = self._classesForName[key]
-                if inspect.isclass(klass) and issubclass(klass, GSBase):
-                    # FIXME: (jany) Why?
-                    # For GSLayer::backgroundImage, I was getting [] instead of None when no image
-                    value = []
-                elif key in self._defaultsForName:
-                    value = self._defaultsForName.get(key)
-                else:
-                    value = klass()
-                key = self._wrapperKeysTranslate.get(key, key)
-                setattr(self, key, value)
+                setattr(self, name, factory())
+
+    def __getstate__(self):
+        # The cached proxies and caches are made again on demand; copying
+        # proxies would give lists (see Proxy.__deepcopy__)
+        state = self.__dict__
+        if not _TRANSIENT_NAMES.isdisjoint(state):
+            state = dict((key, value) for key, value in state.items()
+                         if key not in _TRANSIENT_NAMES)
+        return state
+
+    def __setstate__(self, state):
+        # Unpickled objects are not made by __init__
+        if type(self) not in _EAGER_DEFAULTS:
+            _add_lazy_defaults(type(self))
+        self.__dict__.update(state)
 
     def __repr__(self):
         content = ""
@@ -321,6 +412,38 @@ class GSBase(object):
         return True
 
 
+def _cached_proxy(proxy_class, name):
+    """Return a property for the proxy_class of an object. It is made on
+    first access and kept in the `name` attribute of the object, which
+    `GSBase.__getstate__` leaves out. Proxies only hold their owner."""
+    _TRANSIENT_NAMES.add(name)
+
+    def get(self):
+        proxy = self.__dict__.get(name)
+        if proxy is None:
+            proxy = self.__dict__[name] = proxy_class(self)
+        return proxy
+
+    def set(self, value):
+        # Not cached: constructors and the parser set most of them
+        proxy = self.__dict__.get(name)
+        if proxy is None:
+            proxy = proxy_class(self)
+        proxy.setter(value)
+
+    proxy_property = property(get, set)
+    _PROXY_PROPERTIES.add(proxy_property)
+    return proxy_property
+
+
+# The properties made by `_cached_proxy`
+_PROXY_PROPERTIES = set()
+
+# The attributes that `GSBase.__getstate__` leaves out: the proxies of
+# `_cached_proxy` and the caches of segments and bounds.
+_TRANSIENT_NAMES = set(("_segments", "_bounds", "_pathsBounds"))
+
+
 class Proxy(object):
     def __init__(self, owner):
         self._owner = owner
@@ -439,9 +562,7 @@ class FontFontMasterProxy(Proxy):
                 Key = self.__len__() + Key
             return self.values()[Key]
         elif isString(Key):
-            for master in self.values():
-                if master.id == Key:
-                    return master
+            return self._owner.masterForId(Key)
         else:
             raise(KeyError)
 
@@ -460,6 +581,7 @@ class FontFontMasterProxy(Proxy):
             self._owner._masters[Index] = FontMaster
         else:
             raise(KeyError)
+        self._owner._mastersChanged()
 
     def __delitem__(self, Key):
         if type(Key) is int:
@@ -478,6 +600,7 @@ class FontFontMasterProxy(Proxy):
         if not FontMaster.id:
             FontMaster.id = str(uuid.uuid4()).upper()
         self._owner._masters.append(FontMaster)
+        self._owner._mastersChanged()
 
         # Cycle through all glyphs and append layer
         for glyph in self._owner.glyphs:
@@ -495,10 +618,12 @@ class FontFontMasterProxy(Proxy):
                     glyph.layers.remove(layer)
 
         self._owner._masters.remove(FontMaster)
+        self._owner._mastersChanged()
 
     def insert(self, Index, FontMaster):
         FontMaster.font = self._owner
         self._owner._masters.insert(Index, FontMaster)
+        self._owner._mastersChanged()
 
     def extend(self, FontMasters):
         for FontMaster in FontMasters:
@@ -510,6 +635,7 @@ class FontFontMasterProxy(Proxy):
         self._owner._masters = values
         for m in self._owner._masters:
             m.font = self._owner
+        self._owner._mastersChanged()
 
 
 class FontGlyphsProxy(Proxy):
@@ -519,14 +645,18 @@ class FontGlyphsProxy(Proxy):
         Font.glyphs[name]
         for glyph in Font.glyphs:
         ...
+
+    When the font was opened with `GSFont(path, lazy=True)`, the glyphs are
+    only parsed when they are accessed.
     """
     def __getitem__(self, key):
         if type(key) == slice:
-            return self.values().__getitem__(key)
+            return [self._glyph_at(index) for index in
+                    range(*key.indices(len(self._owner._glyphs)))]
 
         # by index
         if isinstance(key, int):
-            return self._owner._glyphs[key]
+            return self._glyph_at(key)
 
         if isinstance(key, basestring):
             return self._get_glyph_by_string(key)
@@ -537,12 +667,14 @@ class FontGlyphsProxy(Proxy):
         if type(key) is int:
             self._owner._setupGlyph(glyph)
             self._owner._glyphs[key] = glyph
+            self._owner._glyphsByName = None
         else:
             raise KeyError  # TODO: add other access methods
 
     def __delitem__(self, key):
         if type(key) is int:
-            del(self._owner._glyph[key])
+            del(self._owner._glyphs[key])
+            self._owner._glyphsByName = None
         else:
             raise KeyError  # TODO: add other access methods
 
@@ -551,31 +683,45 @@ class FontGlyphsProxy(Proxy):
             return self._get_glyph_by_string(item) is not None
         return item in self._owner._glyphs
 
+    def __iter__(self):
+        for index in range(len(self._owner._glyphs)):
+            yield self._glyph_at(index)
+
+    def _glyph_at(self, index):
+        """Return the glyph at index, parsing it if needed."""
+        glyph = self._owner._glyphs[index]
+        if isinstance(glyph, LazyValue):
+            glyph = glyph.parse()
+            self._owner._setupGlyph(glyph)
+            self._owner._glyphs[index] = glyph
+        return glyph
+
     def _get_glyph_by_string(self, key):
-        # FIXME: (jany) looks inefficient
         if isinstance(key, basestring):
+            by_name, by_unicode = self._owner._glyphIndexes()
             # by glyph name
-            for glyph in self._owner._glyphs:
-                if glyph.name == key:
-                    return glyph
+            index = by_name.positions.get(key)
+            if index is not None:
+                return self._glyph_at(index)
             # by string representation as u'ä'
             if len(key) == 1:
-                for glyph in self._owner._glyphs:
-                    if glyph.unicode == "%04X" % (ord(key)):
-                        return glyph
+                index = by_unicode.positions.get("%04X" % (ord(key)))
             # by unicode
             else:
-                for glyph in self._owner._glyphs:
-                    if glyph.unicode == key.upper():
-                        return glyph
+                index = by_unicode.positions.get(key.upper())
+            if index is not None:
+                return self._glyph_at(index)
         return None
 
     def values(self):
-        return self._owner._glyphs
+        glyphs = self._owner._glyphs
+        for index in range(len(glyphs)):
+            self._glyph_at(index)
+        return glyphs
 
     def items(self):
         items = []
-        for value in self._owner._glyphs:
+        for value in self:
             key = value.name
             items.append((key, value))
         return items
@@ -583,20 +729,39 @@ class FontGlyphsProxy(Proxy):
     def append(self, glyph):
         self._owner._setupGlyph(glyph)
         self._owner._glyphs.append(glyph)
+        self._owner._indexGlyph(glyph, len(self._owner._glyphs) - 1)
 
     def extend(self, objects):
+        objects = list(objects)
         for glyph in objects:
             self._owner._setupGlyph(glyph)
-        self._owner._glyphs.extend(list(objects))
+        start = len(self._owner._glyphs)
+        self._owner._glyphs.extend(objects)
+        for index, glyph in enumerate(objects, start):
+            self._owner._indexGlyph(glyph, index)
 
     def __len__(self):
         return len(self._owner._glyphs)
 
+    def plistSourceArray(self):
+        """Return the glyphs for incremental writers, with the glyphs that
+        were not parsed yet as `LazyValue` when their source can be copied.
+        """
+        glyphs = self._owner._glyphs
+        for index, glyph in enumerate(glyphs):
+            if isinstance(glyph, LazyValue) and not glyph.can_copy_source():
+                self._glyph_at(index)
+        return glyphs
+
     def setter(self, values):
         if isinstance(values, Proxy):
             values = list(values)
         self._owner._glyphs = values
+        self._owner._glyphsByName = None
         for g in self._owner._glyphs:
+            if isinstance(g, LazyValue):
+                # Set up when parsed, see `_glyph_at`
+                continue
             g.parent = self._owner
             for layer in g.layers.values():
                 if (not hasattr(layer, "associatedMasterId") or
@@ -605,6 +770,59 @@ class FontGlyphsProxy(Proxy):
                     g._setupLayer(layer, layer.layerId)
 
 
+def _glyph_name(glyph):
+    """Return the name of a glyph, parsed or not."""
+    if isinstance(glyph, LazyValue):
+        return glyph.peeked.get("glyphname")
+    return glyph.name
+
+
+def _glyph_unicode(glyph):
+    """Return the first unicode of a glyph, parsed or not."""
+    if isinstance(glyph, LazyValue):
+        unicodes = glyph.peeked.get("unicode")
+        return unicodes[0] if unicodes else None
+    return glyph.unicode
+
+
+class _GlyphKeyIndex(object):
+    """Map a key of the glyphs of a font, like their name, to the position
+    in `font._glyphs` of the first glyph that has it.
+
+    The keys that several glyphs have are remembered, because removing such
+    a key requires to look for the next glyph that has it.
+    """
+
+    def __init__(self, glyphs, key_func):
+        self.positions = {}
+        self.duplicates = set()
+        for index, glyph in enumerate(glyphs):
+            self.add(key_func(glyph), index)
+
+    def add(self, key, index):
+        if key is None:
+            return
+        current = self.positions.get(key)
+        if current is None:
+            self.positions[key] = index
+        else:
+            self.duplicates.add(key)
+            if index < current:
+                self.positions[key] = index
+
+    def replace(self, old_key, new_key, index):
+        """Move the glyph at index from old_key to new_key. Return False if
+        the index has to be rebuilt instead.
+        """
+        if old_key is not None:
+            if (self.positions.get(old_key) != index or
+                    old_key in self.duplicates):
+                return False
+            del self.positions[old_key]
+        self.add(new_key, index)
+        return True
+
+
 class FontClassesProxy(Proxy):
 
     def __getitem__(self, key):
@@ -756,8 +974,15 @@ class GlyphLayerProxy(Proxy):
 
     def _ensureMasterLayers(self):
         # Ensure existence of master-linked layers (even for iteration, len() etc.) if accidentally deleted
-        if not self._owner.parent:
+        font = self._owner.parent
+        if not font:
             return
+        # Only check again when the masters of the font have changed
+        checked = self._owner._masterLayersChecked
+        if (checked is not None and checked[0] is font and
+                checked[1] == font._mastersGeneration):
+            return
+        self._owner._masterLayersChecked = (font, font._mastersGeneration)
         for master in self._owner.parent.masters:
             # if (master.id not in self._owner._layers or
             #         self._owner._layers[master.id] is None):
@@ -856,12 +1081,14 @@ class IndexedObjectsProxy(Proxy):
         if isinstance(key, int):
             self.values()[key] = value
             value._parent = self._owner
+            self._changed()
         else:
             raise KeyError
 
     def __delitem__(self, key):
         if isinstance(key, int):
             del self.values()[key]
+            self._changed()
         else:
             raise KeyError
 
@@ -871,18 +1098,22 @@ class IndexedObjectsProxy(Proxy):
     def append(self, value):
         self.values().append(value)
         value._parent = self._owner
+        self._changed()
 
     def extend(self, values):
         self.values().extend(values)
         for value in values:
             value._parent = self._owner
+        self._changed()
 
     def remove(self, value):
         self.values().remove(value)
+        self._changed()
 
     def insert(self, index, value):
         self.values().insert(index, value)
         value._parent = self._owner
+        self._changed()
 
     def __len__(self):
         return len(self.values())
@@ -891,6 +1122,10 @@ class IndexedObjectsProxy(Proxy):
         setattr(self._owner, self._objects_name, list(values))
         for value in self.values():
             value._parent = self._owner
+        self._changed()
+
+    def _changed(self):
+        """Called after the objects of the owner changed."""
 
 
 class LayerPathsProxy(IndexedObjectsProxy):
@@ -899,6 +1134,9 @@ class LayerPathsProxy(IndexedObjectsProxy):
     def __init__(self, owner):
         super(LayerPathsProxy, self).__init__(owner)
 
+    def _changed(self):
+        self._owner._pathsChanged()
+
 
 class LayerHintsProxy(IndexedObjectsProxy):
     _objects_name = "_hints"
@@ -934,6 +1172,43 @@ class PathNodesProxy(IndexedObjectsProxy):
     def __init__(self, owner):
         super(PathNodesProxy, self).__init__(owner)
 
+    def pop(self, i):
+        if type(i) == int:
+            node = self.values().pop(i)
+            self._changed()
+            return node
+        else:
+            raise(KeyError)
+
+    def _changed(self):
+        self._owner._nodesChanged()
+
+    def plistValues(self):
+        """Return the `plistValue` of all the nodes, for writers."""
+        nodes = self._owner._nodes
+        if isinstance(nodes, PackedNodes):
+            return nodes.plistValues()
+        coordinates = []
+        for node in nodes:
+            position = node.position
+            coordinates.append(position[0])
+            coordinates.append(position[1])
+        return GSNode._plistValues(
+            coordinates, [node._plistContent() for node in nodes])
+
+    def setter(self, values):
+        # Compact paths stay compact, see `PackedNodes`
+        if (not isinstance(values, PackedNodes) and
+                isinstance(getattr(self._owner, "_nodes", None),
+                           PackedNodes)):
+            values = PackedNodes(values)
+        if isinstance(values, PackedNodes):
+            self._owner._nodes = values
+            values._path = self._owner
+            self._changed()
+        else:
+            super(PathNodesProxy, self).setter(values)
+
 
 class CustomParametersProxy(Proxy):
     def __getitem__(self, key):
@@ -1287,8 +1562,8 @@ class GSFontMaster(GSBase):
 
     def __init__(self):
         super(GSFontMaster, self).__init__()
-        self.id = str(uuid.uuid4())
         self.font = None
+        self.id = str(uuid.uuid4())
         self._name = None
         self._customParameters = []
         self.italicAngle = 0.0
@@ -1301,6 +1576,18 @@ class GSFontMaster(GSBase):
         return '<GSFontMaster "%s" width %s weight %s>' % \
             (self.name, self.widthValue, self.weightValue)
 
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        old_value = getattr(self, "_id", None)
+        self._id = value
+        # Keep the master lookup of the font up to date
+        if old_value != value and getattr(self, "font", None) is not None:
+            self.font._mastersChanged()
+
     def shouldWriteValueForKey(self, key):
         if key in ("weight", "width"):
             return getattr(self, key) != "Regular"
@@ -1385,13 +1672,10 @@ class GSFontMaster(GSBase):
         custom = " ".join(names).strip()
         return (weight, width, custom)
 
-    customParameters = property(
-        lambda self: CustomParametersProxy(self),
-        lambda self, value: CustomParametersProxy(self).setter(value))
+    customParameters = _cached_proxy(
+        CustomParametersProxy, "_customParametersProxy")
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value))
+    userData = _cached_proxy(UserDataProxy, "_userDataProxy")
 
 
 class GSNode(GSBase):
@@ -1408,13 +1692,47 @@ class GSNode(GSBase):
     def __init__(self, position=(0, 0), nodetype=LINE,
                  smooth=False, name=None):
         super(GSNode, self).__init__()
+        self._parent = None
         self.position = Point(position[0], position[1])
         self.type = nodetype
         self.smooth = smooth
-        self._parent = None
         self._userData = None
         self.name = name
 
+    @classmethod
+    def _fromValues(cls, x, y, nodetype, smooth):
+        """Return a node without user data, like `__init__` but faster. Used
+        by the parser to create nodes in bulk."""
+        node = cls.__new__(cls)
+        node._position = _NodePoint(x, y, node)
+        node._type = nodetype
+        node.smooth = smooth
+        node._parent = None
+        node._userData = None
+        return node
+
+    # The position and the type of the nodes shape the segments of their
+    # path, which caches them: see `GSPath._nodesChanged`.
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = _NodePoint(value[0], value[1], self)
+        if self._parent is not None:
+            self._parent._nodesChanged()
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = value
+        if self._parent is not None:
+            self._parent._nodesChanged()
+
     def __repr__(self):
         content = self.type
         if self.smooth:
@@ -1423,15 +1741,19 @@ class GSNode(GSBase):
             (self.__class__.__name__, self.position.x, self.position.y,
              content)
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value))
+    userData = _cached_proxy(UserDataProxy, "_userDataProxy")
 
     @property
     def parent(self):
         return self._parent
 
     def plistValue(self):
+        return '"%s %s %s"' % \
+            (floatToString(self.position[0]), floatToString(self.position[1]),
+             self._plistContent())
+
+    def _plistContent(self):
+        """Return what follows the coordinates in `plistValue`."""
         content = self.type.upper()
         if self.smooth:
             content += " SMOOTH"
@@ -1441,13 +1763,20 @@ class GSNode(GSBase):
             writer.writeDict(self._userData)
             content += ' '
             content += self._encode_dict_as_string(string.getvalue())
-        return '"%s %s %s"' % \
-            (floatToString(self.position[0]), floatToString(self.position[1]),
-             content)
+        return content
+
+    @staticmethod
+    def _plistValues(coordinates, contents):
+        """Return the `plistValue` of nodes from the flat list of their
+        coordinates, which are formatted all at once, and their contents."""
+        coordinates = floatsToStrings(coordinates)
+        return ['"%s %s %s"' % (coordinates[2 * i], coordinates[2 * i + 1],
+                                content)
+                for i, content in enumerate(contents)]
 
     def read(self, line):
         m = self._PLIST_VALUE_RE.match(line).groups()
-        self.position = Point(float(m[0]), float(m[1]))
+        self.position = (float(m[0]), float(m[1]))
         self.type = m[2].lower()
         self.smooth = bool(m[3])
 
@@ -1460,15 +1789,18 @@ class GSNode(GSBase):
 
     @property
     def name(self):
-        if "name" in self.userData:
-            return self.userData["name"]
+        # Without the user data proxy: most nodes have no user data
+        userData = self._userData
+        if userData is not None:
+            return userData.get("name")
         return None
 
     @name.setter
     def name(self, value):
         if value is None:
-            if "name" in self.userData:
-                del(self.userData["name"])
+            userData = self._userData
+            if userData is not None and "name" in userData:
+                del(userData["name"])
         else:
             self.userData["name"] = value
 
@@ -1559,6 +1891,351 @@ class GSNode(GSBase):
         return None
 
 
+class PackedNodes(object):
+    """The nodes of a path, stored in arrays instead of `GSNode` objects.
+
+    Paths use this compact storage when their font is opened with
+    `GSFont(path, compact=True)`, or after `path.nodes = PackedNodes(nodes)`.
+    `path.nodes` behaves the same, except that the nodes it returns are
+    views created on demand: changing their position, type, smoothness or
+    user data changes the path, but they do not follow the nodes that they
+    stand for when nodes are inserted or removed before them. Nodes that are
+    added to the path are copied.
+    """
+
+    # The node types are stored as indexes in this list, other types are
+    # added when needed.
+    _types = [GSNode.LINE, GSNode.CURVE, GSNode.QCURVE, GSNode.OFFCURVE,
+              GSNode.MOVE, "n/a"]
+    _typeCodes = dict((t, code) for code, t in enumerate(_types))
+    _SMOOTH = 0x80
+
+    def __init__(self, nodes=()):
+        self._path = None
+        # x0, y0, x1, y1...
+        self._coordinates = array(str("d"))
+        # type code and smooth flag
+        self._flags = bytearray()
+        # node index -> user data of the few nodes that have some
+        self._userData = {}
+        self.extend(nodes)
+
+    @classmethod
+    def _typeCode(cls, nodetype):
+        code = cls._typeCodes.get(nodetype)
+        if code is None:
+            code = len(cls._types)
+            assert code < cls._SMOOTH
+            cls._types.append(nodetype)
+            cls._typeCodes[nodetype] = code
+        return code
+
+    def read(self, line):
+        """Append the node of the given string, see `GSNode.read`."""
+        m = GSNode._PLIST_VALUE_RE.match(line).groups()
+        self._coordinates.append(float(m[0]))
+        self._coordinates.append(float(m[1]))
+        flags = self._typeCode(m[2].lower())
+        if m[3]:
+            flags |= self._SMOOTH
+        self._flags.append(flags)
+        if m[4] is not None and len(m[4]) > 0:
+            value = GSNode._ESCAPED_CHAR_RE.sub(GSNode._unescape_char, m[4])
+            self._userData[len(self._flags) - 1] = Parser().parse(value)
+
+    # flags -> the `GSNode._plistContent` of nodes without user data
+    _flagContents = {}
+
+    @classmethod
+    def _flagContent(cls, flags):
+        content = cls._flagContents.get(flags)
+        if content is None:
+            content = cls._types[flags & ~cls._SMOOTH].upper()
+            if flags & cls._SMOOTH:
+                content += " SMOOTH"
+            cls._flagContents[flags] = content
+        return content
+
+    def plistValues(self):
+        """Return the `GSNode.plistValue` of all the nodes."""
+        flag_content = self._flagContent
+        contents = [flag_content(flags) for flags in self._flags]
+        for index in self._userData:
+            contents[index] = _PackedNode(self, index)._plistContent()
+        return GSNode._plistValues(self._coordinates, contents)
+
+    def _nodesChanged(self):
+        if self._path is not None:
+            self._path._nodesChanged()
+
+    def _data(self, node):
+        """Return the position, flags and user data of any node."""
+        if isinstance(node, _PackedNode):
+            position, flags = node._packed._get(node._index)
+            return position, flags, node._packed._userData.get(node._index)
+        flags = self._typeCode(node.type)
+        if node.smooth:
+            flags |= self._SMOOTH
+        return node.position, flags, node._userData
+
+    def _set(self, index, data):
+        """Store the data returned by `_data` at index."""
+        position, flags, userData = data
+        self._coordinates[2 * index] = position[0]
+        self._coordinates[2 * index + 1] = position[1]
+        self._flags[index] = flags
+        if userData:
+            self._userData[index] = userData
+        else:
+            self._userData.pop(index, None)
+
+    def _get(self, index):
+        """Return the position and flags of the node at index."""
+        return (self._coordinates[2 * index:2 * index + 2],
+                self._flags[index])
+
+    def _shift(self, start, offset):
+        """Move the user data of the nodes from start on by offset."""
+        if self._userData:
+            self._userData = dict(
+                (i + offset if i >= start else i, data)
+                for i, data in self._userData.items()
+                if not start <= i < start - offset)
+
+    def _index(self, index):
+        if index < 0:
+            index += len(self._flags)
+        if not 0 <= index < len(self._flags):
+            raise IndexError("node index out of range")
+        return index
+
+    def __len__(self):
+        return len(self._flags)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [_PackedNode(self, index)
+                    for index in range(*key.indices(len(self._flags)))]
+        return _PackedNode(self, self._index(key))
+
+    def __iter__(self):
+        for index in range(len(self._flags)):
+            yield _PackedNode(self, index)
+
+    def __setitem__(self, index, node):
+        self._set(self._index(index), self._data(node))
+
+    def __delitem__(self, index):
+        index = self._index(index)
+        del self._coordinates[2 * index:2 * index + 2]
+        del self._flags[index]
+        self._shift(index, -1)
+
+    def insert(self, index, node):
+        data = self._data(node)
+        index = min(max(index + len(self._flags) if index < 0 else index, 0),
+                    len(self._flags))
+        self._coordinates[2 * index:2 * index] = array(str("d"), (0, 0))
+        self._flags[index:index] = b"\0"
+        self._shift(index, 1)
+        self._set(index, data)
+
+    def append(self, node):
+        data = self._data(node)
+        self._coordinates.extend((0, 0))
+        self._flags.append(0)
+        self._set(len(self._flags) - 1, data)
+
+    def extend(self, nodes):
+        for data in [self._data(node) for node in nodes]:
+            self._coordinates.extend((0, 0))
+            self._flags.append(0)
+            self._set(len(self._flags) - 1, data)
+
+    def pop(self, index=-1):
+        """Remove the node at index and return it as a `GSNode`."""
+        node = self[index].copy()
+        del self[index]
+        return node
+
+    def index(self, node):
+        if isinstance(node, _PackedNode) and node._packed is self:
+            return node._index
+        raise ValueError("node is not in the path")
+
+    def remove(self, node):
+        del self[self.index(node)]
+
+    def __contains__(self, node):
+        return isinstance(node, _PackedNode) and node._packed is self
+
+
+class _NodePoint(Point):
+    """The position of a `GSNode`, that tells the path of the node when its
+    coordinates change.
+    """
+    __slots__ = ('_node',)
+
+    def __init__(self, x, y, node):
+        self.value = [x, y]
+        self.rect = None
+        self._node = node
+
+    def _changed(self):
+        path = self._node._parent
+        if path is not None:
+            path._nodesChanged()
+
+    @property
+    def x(self):
+        return self.value[0]
+
+    @x.setter
+    def x(self, value):
+        self.value[0] = value
+        self._changed()
+
+    @property
+    def y(self):
+        return self.value[1]
+
+    @y.setter
+    def y(self, value):
+        self.value[1] = value
+        self._changed()
+
+    def __setitem__(self, key, value):
+        self.value[key] = value
+        self._changed()
+
+
+class _PackedPoint(Point):
+    """The position of a node of `PackedNodes`, that writes the changes of
+    its coordinates back to the path.
+    """
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        x, y = node._packed._get(node._index)[0]
+        super(_PackedPoint, self).__init__(x, y)
+        self._node = node
+
+    def _store(self):
+        self._node.position = self
+
+    @property
+    def x(self):
+        return self.value[0]
+
+    @x.setter
+    def x(self, value):
+        Point.x.fset(self, value)
+        self._store()
+
+    @property
+    def y(self):
+        return self.value[1]
+
+    @y.setter
+    def y(self, value):
+        Point.y.fset(self, value)
+        self._store()
+
+    def __setitem__(self, key, value):
+        super(_PackedPoint, self).__setitem__(key, value)
+        self._store()
+
+
+class _PackedNode(GSNode):
+    """A `GSNode` that stands for a node of `PackedNodes`."""
+
+    def __init__(self, packed, index):
+        # GSNode.__init__ would store the values in the object
+        self._packed = packed
+        self._index = index
+
+    def __eq__(self, other):
+        if isinstance(other, _PackedNode):
+            return self._packed is other._packed and self._index == other._index
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash((id(self._packed), self._index))
+
+    def __repr__(self):
+        # Look like any other node
+        return super(_PackedNode, self).__repr__().replace(
+            "_PackedNode", "GSNode", 1)
+
+    @property
+    def position(self):
+        return _PackedPoint(self)
+
+    @position.setter
+    def position(self, value):
+        coordinates = self._packed._coordinates
+        coordinates[2 * self._index] = value[0]
+        coordinates[2 * self._index + 1] = value[1]
+        self._packed._nodesChanged()
+
+    @property
+    def type(self):
+        flags = self._packed._flags[self._index]
+        return PackedNodes._types[flags & ~PackedNodes._SMOOTH]
+
+    @type.setter
+    def type(self, value):
+        flags = self._packed._flags
+        flags[self._index] = ((flags[self._index] & PackedNodes._SMOOTH) |
+                              PackedNodes._typeCode(value))
+        self._packed._nodesChanged()
+
+    @property
+    def smooth(self):
+        return bool(self._packed._flags[self._index] & PackedNodes._SMOOTH)
+
+    @smooth.setter
+    def smooth(self, value):
+        flags = self._packed._flags
+        if value:
+            flags[self._index] |= PackedNodes._SMOOTH
+        else:
+            flags[self._index] &= ~PackedNodes._SMOOTH
+
+    @property
+    def _userData(self):
+        return self._packed._userData.get(self._index)
+
+    @_userData.setter
+    def _userData(self, value):
+        if value is None:
+            self._packed._userData.pop(self._index, None)
+        else:
+            self._packed._userData[self._index] = value
+
+    @property
+    def parent(self):
+        return self._packed._path
+
+    @property
+    def index(self):
+        return self._index
+
+    def copy(self):
+        """Return a `GSNode` with the same values, not tied to the path."""
+        node = GSNode(tuple(self.position), self.type, self.smooth)
+        if self._userData:
+            node._userData = copy.deepcopy(self._userData)
+        return node
+
+
+GSNode._packedListType = PackedNodes
+
+
 class GSPath(GSBase):
     _classesForName = {
         "nodes": GSNode,
@@ -1568,6 +2245,9 @@ class GSPath(GSBase):
         "closed": True,
     }
     _parent = None
+    # The caches of `segments` and `bounds`, cleared by `_nodesChanged`
+    _segments = None
+    _bounds = None
 
     def __init__(self):
         super(GSPath, self).__init__()
@@ -1582,13 +2262,26 @@ class GSPath(GSBase):
             return True
         return super(GSPath, self).shouldWriteValueForKey(key)
 
-    nodes = property(
-        lambda self: PathNodesProxy(self),
-        lambda self, value: PathNodesProxy(self).setter(value))
+    nodes = _cached_proxy(PathNodesProxy, "_nodesProxy")
+
+    def _nodesChanged(self):
+        """Forget the segments and bounds after nodes were added, removed,
+        moved or given another type."""
+        self._segments = None
+        self._bounds = None
+        if self._parent is not None:
+            self._parent._pathsChanged()
 
     @property
     def segments(self):
-        self._segments = []
+        """The segments of the path. They are made again after the nodes
+        change, and should not be modified in place."""
+        if self._segments is None:
+            self._segments = self._makeSegments()
+        return self._segments
+
+    def _makeSegments(self):
+        segments = []
         self._segmentLength = 0
 
         nodeCount = 0
@@ -1612,12 +2305,11 @@ class GSPath(GSBase):
                 newSegment.appendNode(self.nodes[nodeCount])
                 nodeCount += 1
 
-            self._segments.append(newSegment)
+            segments.append(newSegment)
             self._segmentLength += 1
             segmentCount += 1
 
-        self._segments
-        return self._segments
+        return segments
 
     @segments.setter
     def segments(self, value):
@@ -1636,6 +2328,16 @@ class GSPath(GSBase):
 
     @property
     def bounds(self):
+        left, bottom, width, height = self._boundsValues()
+        return Rect(Point(left, bottom), Point(width, height))
+
+    def _boundsValues(self):
+        """Return the cached left, bottom, width and height of `bounds`."""
+        if self._bounds is None:
+            self._bounds = self._computeBounds()
+        return self._bounds
+
+    def _computeBounds(self):
         left, bottom, right, top = None, None, None, None
         for segment in self.segments:
             newLeft, newBottom, newRight, newTop = segment.bbox()
@@ -1655,7 +2357,7 @@ class GSPath(GSBase):
                 top = newTop
             else:
                 top = max(top, newTop)
-        return Rect(Point(left, bottom), Point(right - left, top - bottom))
+        return left, bottom, right - left, top - bottom
 
     @property
     def direction(self):
@@ -1678,7 +2380,8 @@ class GSPath(GSBase):
         raise OnlyInGlyphsAppError
 
     def reverse(self):
-        segments = list(reversed(self.segments))
+        # Not the cached segments: they change below
+        segments = list(reversed(self._makeSegments()))
         for s, segment in enumerate(segments):
             segment.nodes = list(reversed(segment.nodes))
             if s == len(segments) - 1:
@@ -1697,25 +2400,31 @@ class GSPath(GSBase):
     def addNodesAtExtremes(self):
         raise NotImplementedError
 
-    # TODO
     def applyTransform(self, transformationMatrix):
-        raise NotImplementedError
+        """Transform the nodes by the affine transformation matrix
+        (m11, m12, m21, m22, tX, tY), like a component transform:
+        x' = m11 * x + m21 * y + tX and y' = m12 * x + m22 * y + tY.
 
-        # Using both skew values (>0.0) produces different results than Glyphs.
-        # Skewing just on of the two works.
-        # Needs more attention.
+        See `glyphsLib.geometry.transform_paths` to transform many paths at
+        once.
+        """
         assert len(transformationMatrix) == 6
-        for node in self.nodes:
-            transformation = (
-                Affine.translation(transformationMatrix[4],
-                                   transformationMatrix[5]) *
-                Affine.scale(transformationMatrix[0],
-                             transformationMatrix[3]) *
-                Affine.shear(transformationMatrix[2] * 45.0,
-                             transformationMatrix[1] * 45.0))
-            x, y = (node.position.x, node.position.y) * transformation
-            node.position.x = x
-            node.position.y = y
+        m11, m12, m21, m22, tX, tY = transformationMatrix
+        nodes = self._nodes
+        if isinstance(nodes, PackedNodes):
+            coordinates = nodes._coordinates
+            for i in range(0, len(coordinates), 2):
+                x, y = coordinates[i], coordinates[i + 1]
+                coordinates[i] = m11 * x + m21 * y + tX
+                coordinates[i + 1] = m12 * x + m22 * y + tY
+        else:
+            for node in nodes:
+                # The list of the position, to forget the caches only once
+                position = node.position.value
+                x, y = position
+                position[0] = m11 * x + m21 * y + tX
+                position[1] = m12 * x + m22 * y + tY
+        self._nodesChanged()
 
 
 class segment(list):
@@ -1730,19 +2439,21 @@ class segment(list):
     def nextSegment(self):
         assert self.parent
         index = self.index
-        if index == (len(self.parent._segments) - 1):
-            return self.parent._segments[0]
-        elif index < len(self.parent._segments):
-            return self.parent._segments[index + 1]
+        segments = self.parent.segments
+        if index == (len(segments) - 1):
+            return segments[0]
+        elif index < len(segments):
+            return segments[index + 1]
 
     @property
     def prevSegment(self):
         assert self.parent
         index = self.index
+        segments = self.parent.segments
         if index == 0:
-            return self.parent._segments[-1]
-        elif index < len(self.parent._segments):
-            return self.parent._segments[index - 1]
+            return segments[-1]
+        elif index < len(segments):
+            return segments[index - 1]
 
     def bbox(self):
         if len(self) == 2:
@@ -1791,19 +2502,10 @@ class segment(list):
             if 0 < t2 and t2 < 1:
                 tvalues.append(t2)
 
-        for j in range(len(tvalues) - 1, -1, -1):
-            t = tvalues[j]
+        for t in tvalues:
             mt = 1 - t
-            newxValue = (mt * mt * mt * x0) + (3 * mt * mt * t * x1) + (3 * mt * t * t * x2) + (t * t * t * x3)
-            if len(xvalues) > 0:
-                xvalues[j] = newxValue
-            else:
-                xvalues.append(newxValue)
-            newyValue = (mt * mt * mt * y0) + (3 * mt * mt * t * y1) + (3 * mt * t * t * y2) + (t * t * t * y3)
-            if len(yvalues) > 0:
-                yvalues[j] = newyValue
-            else:
-                yvalues.append(newyValue)
+            xvalues.append((mt * mt * mt * x0) + (3 * mt * mt * t * x1) + (3 * mt * t * t * x2) + (t * t * t * x3))
+            yvalues.append((mt * mt * mt * y0) + (3 * mt * mt * t * y1) + (3 * mt * t * t * y2) + (t * t * t * y3))
 
         xvalues.append(x0)
         xvalues.append(x3)
@@ -2323,9 +3025,8 @@ class GSInstance(GSBase):
         self.isItalic = False
         self._customParameters = []
 
-    customParameters = property(
-        lambda self: CustomParametersProxy(self),
-        lambda self, value: CustomParametersProxy(self).setter(value))
+    customParameters = _cached_proxy(
+        CustomParametersProxy, "_customParametersProxy")
 
     @property
     def exports(self):
@@ -2652,33 +3353,19 @@ class GSLayer(GSBase):
     def name(self, value):
         self._name = value
 
-    anchors = property(
-        lambda self: LayerAnchorsProxy(self),
-        lambda self, value: LayerAnchorsProxy(self).setter(value))
+    anchors = _cached_proxy(LayerAnchorsProxy, "_anchorsProxy")
 
-    hints = property(
-        lambda self: LayerHintsProxy(self),
-        lambda self, value: LayerHintsProxy(self).setter(value))
+    hints = _cached_proxy(LayerHintsProxy, "_hintsProxy")
 
-    paths = property(
-        lambda self: LayerPathsProxy(self),
-        lambda self, value: LayerPathsProxy(self).setter(value))
+    paths = _cached_proxy(LayerPathsProxy, "_pathsProxy")
 
-    components = property(
-        lambda self: LayerComponentsProxy(self),
-        lambda self, value: LayerComponentsProxy(self).setter(value))
+    components = _cached_proxy(LayerComponentsProxy, "_componentsProxy")
 
-    guides = property(
-        lambda self: LayerGuideLinesProxy(self),
-        lambda self, value: LayerGuideLinesProxy(self).setter(value))
+    guides = _cached_proxy(LayerGuideLinesProxy, "_guidesProxy")
 
-    annotations = property(
-        lambda self: LayerAnnotationProxy(self),
-        lambda self, value: LayerAnnotationProxy(self).setter(value))
+    annotations = _cached_proxy(LayerAnnotationProxy, "_annotationsProxy")
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value))
+    userData = _cached_proxy(UserDataProxy, "_userDataProxy")
 
     @property
     def smartComponentPoleMapping(self):
@@ -2692,11 +3379,40 @@ class GSLayer(GSBase):
 
     @property
     def bounds(self):
-        left, bottom, right, top = None, None, None, None
+        # The bounds of the paths are cached, see `_pathsChanged`. Those of
+        # the components depend on other glyphs.
+        if self._pathsBounds is _UNKNOWN:
+            self._pathsBounds = self._unionEdges(
+                path._boundsValues() for path in self._paths)
+        edges = self._unionEdges(
+            (component.bounds for component in self._components),
+            self._pathsBounds)
+        if edges is not None:
+            left, bottom, right, top = edges
+            return Rect(Point(left, bottom), Point(right - left, top - bottom))
+
+    # The left, bottom, right and top of the paths, or None without paths:
+    # see `bounds`.
+    _pathsBounds = _UNKNOWN
+
+    def _pathsChanged(self):
+        self._pathsBounds = _UNKNOWN
+
+    @staticmethod
+    def _unionEdges(boxes, edges=None):
+        """Return the left, bottom, right and top of the union of edges and
+        of the (left, bottom, width, height) boxes, or None if it is empty.
+        """
+        if edges is None:
+            left, bottom, right, top = None, None, None, None
+        else:
+            left, bottom, right, top = edges
 
-        for item in self.paths.values() + self.components.values():
+        for box in boxes:
+            if box is None:
+                continue
 
-            newLeft, newBottom, newWidth, newHeight = item.bounds
+            newLeft, newBottom, newWidth, newHeight = box
             newRight = newLeft + newWidth
             newTop = newBottom + newHeight
 
@@ -2718,7 +3434,7 @@ class GSLayer(GSBase):
                 top = max(top, newTop)
 
         if left is not None and bottom is not None and right is not None and top is not None:
-            return Rect(Point(left, bottom), Point(right - left, top - bottom))
+            return left, bottom, right, top
 
     def _find_node_by_indices(self, point):
         """"Find the GSNode that is refered to by the given indices.
@@ -2858,6 +3574,8 @@ class GSGlyph(GSBase):
     def __init__(self, name=None):
         super(GSGlyph, self).__init__()
         self._layers = OrderedDict()
+        # See `GlyphLayerProxy._ensureMasterLayers`
+        self._masterLayersChecked = None
         self.name = name
         self.parent = None
         self.export = True
@@ -2868,13 +3586,24 @@ class GSGlyph(GSBase):
     def __repr__(self):
         return '<GSGlyph "%s" with %s layers>' % (self.name, len(self.layers))
 
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        old_name = getattr(self, "_name", None)
+        self._name = name
+        # Keep the glyph lookup of the font up to date
+        if old_name != name and getattr(self, "parent", None) is not None:
+            self.parent._glyphChanged(self, old_name, self.unicode)
+
     def shouldWriteValueForKey(self, key):
         if key in ("script", "category", "subCategory"):
             return getattr(self, key) is not None
         return super(GSGlyph, self).shouldWriteValueForKey(key)
 
-    layers = property(lambda self: GlyphLayerProxy(self),
-                      lambda self, value: GlyphLayerProxy(self).setter(value))
+    layers = _cached_proxy(GlyphLayerProxy, "_layersProxy")
 
     def _setupLayer(self, layer, key):
         assert isinstance(key, (str, unicode))
@@ -2902,9 +3631,7 @@ class GSGlyph(GSBase):
         if self.unicode:
             return unichr(int(self.unicode, 16))
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value))
+    userData = _cached_proxy(UserDataProxy, "_userDataProxy")
 
     glyphname = property(
         lambda self: self.name,
@@ -2927,7 +3654,7 @@ class GSGlyph(GSBase):
 
     @unicode.setter
     def unicode(self, unicode):
-        self._unicodes = UnicodesList(unicode)
+        self.unicodes = unicode
 
     @property
     def unicodes(self):
@@ -2935,10 +3662,28 @@ class GSGlyph(GSBase):
 
     @unicodes.setter
     def unicodes(self, unicodes):
+        old_unicode = self.unicode if hasattr(self, "_unicodes") else None
         self._unicodes = UnicodesList(unicodes)
+        # Keep the glyph lookup of the font up to date. Changing the list of
+        # unicodes in place is not noticed.
+        if (old_unicode != self.unicode and
+                getattr(self, "parent", None) is not None):
+            self.parent._glyphChanged(self, self.name, old_unicode)
 
 
 class GSFont(GSBase):
+    """A font, read from the .glyphs file at `path` if one is given.
+
+    With `lazy`, glyphs are only parsed when they are first used. With
+    `compact`, the nodes of paths are stored in arrays. With `masters`, a
+    list of master ids or names, the other masters and their layers are
+    dropped while parsing.
+
+    With `cache_dir`, the parsed font is stored in and loaded from the
+    snapshots of that directory, see glyphsLib.cache. The snapshots are
+    pickles: `cache_dir` must be a private, trusted directory, as anyone
+    who can write to it can run code when a font is opened.
+    """
     _classesForName = {
         ".appVersion": str,
         "DisplayStrings": unicode,
@@ -2987,7 +3732,16 @@ class GSFont(GSBase):
         "keyboardIncrement": 1,
     }
 
-    def __init__(self, path=None):
+    # Keys of the glyphs that are read when a font is opened lazily, to be
+    # able to look glyphs up without parsing them.
+    _lazyGlyphKeys = ("glyphname", "unicode")
+
+    # See `_mastersChanged`
+    _mastersById = None
+    _mastersGeneration = 0
+
+    def __init__(self, path=None, lazy=False, compact=False, cache_dir=None,
+                 masters=None):
         super(GSFont, self).__init__()
 
         self.familyName = "Unnamed font"
@@ -2995,6 +3749,9 @@ class GSFont(GSBase):
         self.versionMajor = 1
         self.appVersion = "895"  # minimum required version
         self._glyphs = []
+        # See `_glyphIndexes`
+        self._glyphsByName = None
+        self._glyphsByUnicode = None
         self._masters = []
         self._instances = []
         self._customParameters = []
@@ -3012,10 +3769,35 @@ class GSFont(GSBase):
                 "Please supply a file path"
             assert path.endswith(".glyphs"), \
                 "Please supply a file path to a .glyphs file"
-            with open(path, 'r', encoding='utf-8') as fp:
-                p = Parser()
-                logger.info('Parsing "%s" file into <GSFont>' % path)
-                p.parse_into_object(self, fp.read())
+            with open(path, 'rb') as fp:
+                # Lazy glyphs keep the text they are parsed from, which
+                # must not change when the font is saved to the same path.
+                data = None if lazy else _map_file(fp)
+                mapped = data is not None
+                if not mapped:
+                    data = fp.read()
+            try:
+                # See glyphsLib.cache
+                cache = key = None
+                if cache_dir is not None:
+                    cache = ParseCache(cache_dir)
+                    key = cache.key(
+                        path, data, compact=compact,
+                        masters=None if masters is None else sorted(masters))
+                if cache is None or not cache.load(key, self):
+                    p = Parser(engine='fast', compact=compact,
+                               masters=masters)
+                    logger.info('Parsing "%s" file into <GSFont>' % path)
+                    lazy_keys = None
+                    if lazy:
+                        lazy_keys = {"glyphs": self._lazyGlyphKeys}
+                    p.parse_into_object(self, data, lazy_keys=lazy_keys)
+                    # The glyphs of lazy fonts are not parsed yet
+                    if cache is not None and not lazy:
+                        cache.store(key, self)
+            finally:
+                if mapped:
+                    data.close()
             self.filepath = path
             for master in self.masters:
                 master.font = self
@@ -3028,14 +3810,20 @@ class GSFont(GSBase):
             return True
         return super(GSFont, self).shouldWriteValueForKey(key)
 
-    def save(self, path=None):
+    def save(self, path=None, incremental=False):
+        """Write the font to path, or to the file it was opened from.
+
+        If `incremental` is True, the glyphs of a font opened with
+        `GSFont(path, lazy=True)` that were not accessed are copied from the
+        file instead of being parsed and written again.
+        """
         if path is None:
             if self.filepath:
                 path = self.filepath
             else:
                 raise ValueError("No path provided and GSFont has no filepath")
         with open(path, 'w', encoding='utf-8') as fp:
-            w = Writer(fp)
+            w = Writer(fp, engine='fast', incremental=incremental)
             logger.info('Writing %r to .glyphs file', self)
             w.write(self)
 
@@ -3049,8 +3837,41 @@ class GSFont(GSBase):
 
     versionMinor = property(getVersionMinor, setVersionMinor)
 
-    glyphs = property(lambda self: FontGlyphsProxy(self),
-                      lambda self, value: FontGlyphsProxy(self).setter(value))
+    glyphs = _cached_proxy(FontGlyphsProxy, "_glyphsProxy")
+
+    def _glyphIndexes(self):
+        """Return the indexes of the names and of the (first) unicodes of
+        the glyphs, built when first needed.
+
+        The indexes are kept up to date by `FontGlyphsProxy` and when glyphs
+        are renamed or get new unicodes. Changes that move glyphs around
+        just drop them, so that they are built again by the next lookup.
+        """
+        if self._glyphsByName is None:
+            self._glyphsByName = _GlyphKeyIndex(self._glyphs, _glyph_name)
+            self._glyphsByUnicode = _GlyphKeyIndex(
+                self._glyphs, _glyph_unicode)
+        return self._glyphsByName, self._glyphsByUnicode
+
+    def _indexGlyph(self, glyph, index):
+        """Add the glyph that was just added at index to the indexes."""
+        if self._glyphsByName is not None:
+            self._glyphsByName.add(_glyph_name(glyph), index)
+            self._glyphsByUnicode.add(_glyph_unicode(glyph), index)
+
+    def _glyphChanged(self, glyph, old_name, old_unicode):
+        """Update the indexes after the name or the unicode of glyph
+        changed from old_name and old_unicode.
+        """
+        if self._glyphsByName is None:
+            return
+        index = self._glyphsByName.positions.get(old_name)
+        if (index is None or index >= len(self._glyphs) or
+                self._glyphs[index] is not glyph or
+                not self._glyphsByName.replace(old_name, glyph.name, index) or
+                not self._glyphsByUnicode.replace(
+                    old_unicode, glyph.unicode, index)):
+            self._glyphsByName = None
 
     def _setupGlyph(self, glyph):
         glyph.parent = self
@@ -3072,14 +3893,22 @@ class GSFont(GSBase):
         for g in self._features:
             g._parent = self
 
-    masters = property(lambda self: FontFontMasterProxy(self),
-                       lambda self, value: FontFontMasterProxy(self).setter(value))
+    masters = _cached_proxy(FontFontMasterProxy, "_mastersProxy")
 
     def masterForId(self, key):
-        for master in self._masters:
-            if master.id == key:
-                return master
-        return None
+        if self._mastersById is None:
+            self._mastersById = {}
+            for master in self._masters:
+                self._mastersById.setdefault(master.id, master)
+        return self._mastersById.get(key)
+
+    def _mastersChanged(self):
+        """Drop the index of the masters by id after the list of masters or
+        the id of a master changed, and let the glyphs know that they have to
+        check their master layers again.
+        """
+        self._mastersById = None
+        self._mastersGeneration += 1
 
     # FIXME: (jany) Why is this not a FontInstanceProxy?
     @property
@@ -3092,17 +3921,12 @@ class GSFont(GSBase):
         for i in self._instances:
             i.parent = self
 
-    classes = property(
-        lambda self: FontClassesProxy(self),
-        lambda self, value: FontClassesProxy(self).setter(value))
+    classes = _cached_proxy(FontClassesProxy, "_classesProxy")
 
-    customParameters = property(
-        lambda self: CustomParametersProxy(self),
-        lambda self, value: CustomParametersProxy(self).setter(value))
+    customParameters = _cached_proxy(
+        CustomParametersProxy, "_customParametersProxy")
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value))
+    userData = _cached_proxy(UserDataProxy, "_userDataProxy")
 
     @property
     def kerning(self):
@@ -0,0 +1,267 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The geometry of many paths at once.
+
+`paths_bounds`, `layers_bounds` and `font_bounds` give the same values as
+`GSPath.bounds` and `GSLayer.bounds`, and `transform_paths` moves the nodes
+like `GSPath.applyTransform`, but they work on all the paths of layers or of
+a whole font together. When NumPy is installed, the "numpy" engine does it
+with a few operations on arrays of all the node coordinates; otherwise, or
+with `engine='python'`, the paths are handled one by one.
+"""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+from array import array
+from collections import OrderedDict
+
+from glyphsLib.classes import GSNode, PackedNodes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = ['ENGINES', 'paths_bounds', 'layers_bounds', 'font_bounds',
+           'transform_paths']
+
+ENGINES = ('python', 'numpy')
+
+
+def _engine(engine):
+    """Return the engine to use for the `engine` argument."""
+    if engine is None:
+        return 'python' if numpy is None else 'numpy'
+    if engine not in ENGINES:
+        raise ValueError('Unknown geometry engine: %r' % (engine,))
+    if engine == 'numpy' and numpy is None:
+        raise ImportError('The "numpy" geometry engine requires NumPy')
+    return engine
+
+
+def paths_bounds(paths, engine=None):
+    """Return the (left, bottom, width, height) of each path, the values of
+    its `bounds`. They stay cached in the paths until their nodes change.
+    """
+    paths = list(paths)
+    if _engine(engine) == 'numpy':
+        _cache_bounds([path for path in paths if path._bounds is None])
+    return [path._boundsValues() for path in paths]
+
+
+def layers_bounds(layers, engine=None):
+    """Return the `bounds` of each layer, after computing those of all their
+    paths at once.
+    """
+    layers = list(layers)
+    paths_bounds((path for layer in layers for path in layer._paths), engine)
+    return [layer.bounds for layer in layers]
+
+
+def font_bounds(font, engine=None):
+    """Return a dictionary from the name of each glyph of the font to the
+    `bounds` of its layers, in the order of `glyph.layers`.
+    """
+    glyphs = [(glyph.name, list(glyph.layers)) for glyph in font.glyphs]
+    # Components need the bounds of other glyphs: compute all the paths first
+    bounds = iter(layers_bounds(
+        (layer for _, layers in glyphs for layer in layers), engine))
+    return OrderedDict(
+        (name, [next(bounds) for _ in layers]) for name, layers in glyphs)
+
+
+def transform_paths(paths, transformationMatrix, engine=None):
+    """Transform the nodes of the paths by the affine transformation matrix
+    (m11, m12, m21, m22, tX, tY), see `GSPath.applyTransform`.
+
+    The "numpy" engine transforms the coordinates of all the paths stored in
+    `PackedNodes` at once. Reading and writing `GSNode` objects costs more
+    than the arithmetic, so the other paths are transformed one by one.
+    """
+    packed = []
+    numpy_engine = _engine(engine) == 'numpy'
+    for path in paths:
+        if numpy_engine and isinstance(path._nodes, PackedNodes):
+            packed.append(path)
+        else:
+            path.applyTransform(transformationMatrix)
+    if not packed:
+        return
+
+    assert len(transformationMatrix) == 6
+    m11, m12, m21, m22, tX, tY = transformationMatrix
+    coordinates = _coordinates(packed)
+    x, y = coordinates[0::2].copy(), coordinates[1::2].copy()
+    coordinates[0::2] = m11 * x + m21 * y + tX
+    coordinates[1::2] = m12 * x + m22 * y + tY
+
+    start = 0
+    for path in packed:
+        values = path._nodes._coordinates
+        stop = start + len(values)
+        if values:
+            view = numpy.frombuffer(values, dtype=numpy.float64)
+            view[:] = coordinates[start:stop]
+            # Release the buffer of the array, so that it can grow again
+            del view
+        start = stop
+        path._nodesChanged()
+
+
+def _coordinates(paths):
+    """Return a NumPy array of x0, y0, x1, y1... of all the nodes of the
+    paths.
+    """
+    values = array(str('d'))
+    for path in paths:
+        nodes = path._nodes
+        if isinstance(nodes, PackedNodes):
+            values.extend(nodes._coordinates)
+        else:
+            for node in nodes:
+                values.extend(node.position.value)
+    if not values:
+        return numpy.empty(0)
+    return numpy.frombuffer(values, dtype=numpy.float64)
+
+
+def _node_types(nodes):
+    """Return the list of the types of the nodes."""
+    if isinstance(nodes, PackedNodes):
+        types = PackedNodes._types
+        return [types[flags & ~PackedNodes._SMOOTH]
+                for flags in nodes._flags]
+    return [node.type for node in nodes]
+
+
+def _segments(types):
+    """Return the indexes of the nodes of the lines and of the curves of a
+    path with nodes of the given types, walked like `GSPath.segments`, or
+    None if `GSPath.segments` cannot be used for bounds.
+    """
+    lines, curves = [], []
+    count = len(types)
+    i = 0
+    while i < count:
+        previous = i - 1 if i > 0 else count - 1
+        nodetype = types[i]
+        if nodetype == GSNode.OFFCURVE:
+            if i + 2 >= count:
+                return None
+            curves.extend((previous, i, i + 1, i + 2))
+            i += 3
+        elif nodetype == GSNode.LINE:
+            lines.extend((previous, i))
+            i += 1
+        else:
+            return None
+    if not lines and not curves:
+        return None
+    return lines, curves
+
+
+def _cache_bounds(paths):
+    """Compute the bounds of the paths together and store them in the caches
+    of `GSPath.bounds`. Paths that `GSPath.segments` does not split into
+    lines and curves are left to `GSPath.bounds`.
+    """
+    lines, curves = [], []
+    line_paths, curve_paths = [], []
+    bounded = []
+    offset = 0
+    for path in paths:
+        nodes = path._nodes
+        segments = _segments(_node_types(nodes))
+        if segments is not None:
+            index = len(bounded)
+            for indexes, all_indexes, owners, size in (
+                    (segments[0], lines, line_paths, 2),
+                    (segments[1], curves, curve_paths, 4)):
+                all_indexes.extend(offset + i for i in indexes)
+                owners.extend([index] * (len(indexes) // size))
+            bounded.append(path)
+        offset += len(nodes)
+    if not bounded:
+        return
+
+    coordinates = _coordinates(paths)
+    x, y = coordinates[0::2], coordinates[1::2]
+
+    lines = numpy.array(lines, dtype=numpy.intp).reshape(-1, 2)
+    curves = numpy.array(curves, dtype=numpy.intp).reshape(-1, 4)
+    curve_x, curve_y = _curve_extrema(x[curves], y[curves])
+    owners = numpy.array(line_paths + curve_paths, dtype=numpy.intp)
+    count = len(bounded)
+    left = _edges(numpy.fmin, x[lines], curve_x, owners, count)
+    bottom = _edges(numpy.fmin, y[lines], curve_y, owners, count)
+    right = _edges(numpy.fmax, x[lines], curve_x, owners, count)
+    top = _edges(numpy.fmax, y[lines], curve_y, owners, count)
+
+    for path, values in zip(bounded, zip(left.tolist(), bottom.tolist(),
+                                         (right - left).tolist(),
+                                         (top - bottom).tolist())):
+        path._bounds = values
+
+
+def _edges(ufunc, line_values, curve_values, owners, count):
+    """Return the minimum or maximum, for ufunc numpy.fmin or numpy.fmax,
+    of the values of the segments of each of count paths. fmin and fmax skip
+    the NaN of the missing extrema.
+    """
+    values = numpy.concatenate((ufunc.reduce(line_values, axis=1),
+                                ufunc.reduce(curve_values, axis=1)))
+    start = numpy.inf if ufunc is numpy.fmin else -numpy.inf
+    edges = numpy.full(count, start)
+    ufunc.at(edges, owners, values)
+    return edges
+
+
+def _curve_extrema(x, y):
+    """Return the x and y of the ends and of the extrema of the curves with
+    the given (n, 4) coordinates of their nodes, as (n, 6) arrays where the
+    missing extrema are NaN. This is `segment.bezierMinMax` for all the
+    curves at once, with the same arithmetic.
+    """
+    t = numpy.concatenate((_extrema_parameters(x), _extrema_parameters(y)),
+                          axis=1)
+    mt = 1 - t
+
+    def point(p):
+        p0, p1, p2, p3 = (p[:, i, None] for i in range(4))
+        values = ((mt * mt * mt * p0) + (3 * mt * mt * t * p1) +
+                  (3 * mt * t * t * p2) + (t * t * t * p3))
+        return numpy.concatenate((p[:, 0::3], values), axis=1)
+
+    return point(x), point(y)
+
+
+def _extrema_parameters(p):
+    """Return the parameters in ]0, 1[ where the derivative of one coordinate
+    of the curves is zero, as an (n, 2) array where the missing ones are NaN.
+    """
+    p0, p1, p2, p3 = (p[:, i] for i in range(4))
+    b = 6 * p0 - 12 * p1 + 6 * p2
+    a = -3 * p0 + 9 * p1 - 9 * p2 + 3 * p3
+    c = 3 * p1 - 3 * p0
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        linear = numpy.abs(a) < 1e-12
+        sqrtb2ac = numpy.sqrt(b * b - 4 * c * a)
+        t1 = numpy.where(linear, -c / b, (-b + sqrtb2ac) / (2 * a))
+        t2 = numpy.where(linear, numpy.nan, (-b - sqrtb2ac) / (2 * a))
+        t1[linear & (numpy.abs(b) < 1e-12)] = numpy.nan
+        t = numpy.stack((t1, t2), axis=1)
+        t[~((0 < t) & (t < 1))] = numpy.nan
+    return t
@@ -18,15 +18,370 @@ from fontTools.misc.py23 import tounicode, unichr, unicode
 
 from collections import OrderedDict
 from io import open
+import binascii
+import codecs
+import gc
+import io
+import mmap
+import multiprocessing
 import re
 import logging
 import sys
 
 import glyphsLib
+from glyphsLib.types import BinaryData
+from glyphsLib.util import workers_are_forked
 
 logger = logging.getLogger(__name__)
 
 
+# Single pattern used by the "fast" engine to read the next token: the index
+# of the group that matched (`match.lastindex`) is the kind of the token.
+_TOKEN_RE = re.compile(
+    r'\s*(?:'
+    r'(\{)|(\()|'                 # start of dictionary, start of list
+    r'(".*?(?<!\\)")|'            # quoted string
+    r'([-_./$A-Za-z0-9]+)|'       # bare string or number
+    r'(<[A-Fa-f0-9]+>)|'          # hexadecimal data
+    r'(\})|(\))|(;)|(,)|(=)'      # closing brackets and delimiters
+    r')', re.DOTALL)
+(_START_DICT, _START_LIST, _STRING, _BARE, _HEX,
+ _END_DICT, _END_LIST, _DICT_DELIM, _LIST_DELIM, _ASSIGN) = range(1, 11)
+
+
+def _py_next_token(text, i, _match=_TOKEN_RE.match):
+    """Read the token that follows position i in text.
+
+    Return a (kind, value, start, end) tuple, where `value` is the text of
+    the token, already decoded for quoted strings (see `Parser._trim_value`)
+    and hexadecimal data, and `text[start:end]` is the token as written.
+    Return None if there is no valid token at that position.
+    """
+    m = _match(text, i)
+    if m is None:
+        return None
+    kind = m.lastindex
+    start, end = m.span(kind)
+    if kind == _STRING:
+        value = text[start + 1:end - 1]
+        if '\\' in value:
+            value = Parser._trim_value(text[start:end])
+    elif kind == _HEX:
+        value = binascii.unhexlify(text[start + 1:end - 1])
+    else:
+        value = text[start:end]
+    return kind, value, start, end
+
+
+# The compiled tokenizer is optional, see setup.py. It returns the same
+# tokens as `_py_next_token`.
+try:
+    from glyphsLib._tokenizer import next_token as _c_next_token
+    from glyphsLib._tokenizer import next_bytes_token as _c_next_bytes_token
+except ImportError:
+    _c_next_token = _c_next_bytes_token = None
+_next_token = _c_next_token or _py_next_token
+
+
+_BYTES_TOKEN_RE = re.compile(_TOKEN_RE.pattern.encode('ascii'), re.DOTALL)
+# The value of the tokens that are always the same character.
+_TOKEN_TEXT = {
+    _START_DICT: '{', _START_LIST: '(', _END_DICT: '}', _END_LIST: ')',
+    _DICT_DELIM: ';', _LIST_DELIM: ',', _ASSIGN: '='}
+
+
+def _py_next_bytes_token(data, i, _match=_BYTES_TOKEN_RE.match):
+    """Like `_py_next_token`, but read UTF-8 encoded data: bytes or an
+    object that supports the buffer protocol, like a memory map.
+
+    The values are the same as for the decoded text: only quoted and bare
+    strings are decoded, and positions are byte offsets in data.
+    """
+    m = _match(data, i)
+    if m is None:
+        return None
+    kind = m.lastindex
+    start, end = m.span(kind)
+    if kind == _STRING:
+        value = data[start + 1:end - 1].decode('utf-8')
+        if '\\' in value:
+            value = Parser._trim_value('"%s"' % value)
+    elif kind == _BARE:
+        value = data[start:end].decode('ascii')
+    elif kind == _HEX:
+        value = binascii.unhexlify(data[start + 1:end - 1])
+    else:
+        value = _TOKEN_TEXT[kind]
+    return kind, value, start, end
+
+
+_next_bytes_token = _c_next_bytes_token or _py_next_bytes_token
+
+
+def _tokenizer_for(text):
+    """Return the function that reads the tokens of text, which is either
+    unicode or UTF-8 encoded data."""
+    if isinstance(text, unicode):
+        return _next_token
+    return _next_bytes_token
+
+
+def _text(data, errors='strict'):
+    """Return a slice of the source text as unicode."""
+    if isinstance(data, unicode):
+        return data
+    return data.decode('utf-8', errors)
+
+
+# Used by `_skip_value`: a quoted string (read like `_TOKEN_RE` does), the
+# opening quote of a string that is not terminated yet, or a character that
+# changes the nesting depth or ends a value. Inside of brackets, the
+# delimiters do not matter. The index of the group that matched is the kind
+# of what was found.
+_SKIP_RE = re.compile(r'(".*?(?<!\\)")|(")|([{(])|([})])|([;,])', re.DOTALL)
+_SKIP_NESTED_RE = re.compile(r'(".*?(?<!\\)")|(")|([{(])|([})])', re.DOTALL)
+_BYTES_SKIP_RE = re.compile(_SKIP_RE.pattern.encode('ascii'), re.DOTALL)
+_BYTES_SKIP_NESTED_RE = re.compile(
+    _SKIP_NESTED_RE.pattern.encode('ascii'), re.DOTALL)
+_SKIP_UNTERMINATED, _SKIP_OPEN, _SKIP_CLOSE, _SKIP_DELIM = range(2, 6)
+
+
+def _skip_value(text, i):
+    """Find the end of the value that starts at i, without parsing it.
+
+    Return the index of the delimiter (`;`, `,` or a closing bracket) that
+    follows the value, or -1 if text ends before the value is complete.
+    """
+    if isinstance(text, unicode):
+        top_search, nested_search = _SKIP_RE.search, _SKIP_NESTED_RE.search
+    else:
+        top_search = _BYTES_SKIP_RE.search
+        nested_search = _BYTES_SKIP_NESTED_RE.search
+    depth = 0
+    search = top_search
+    while True:
+        m = search(text, i)
+        if m is None:
+            return -1
+        kind = m.lastindex
+        i = m.end()
+        if kind == _SKIP_OPEN:
+            depth += 1
+            search = nested_search
+        elif kind == _SKIP_CLOSE:
+            if depth == 0:
+                return m.start()
+            depth -= 1
+            if depth == 0:
+                search = top_search
+        elif kind == _SKIP_DELIM:
+            return m.start()
+        elif kind == _SKIP_UNTERMINATED:
+            return -1
+
+
+# A node of a path without user data, followed by the delimiter of the list
+# (group 5 is None at the end of the list), see `_fast_parse_node_list`.
+_NODE_RE = re.compile(
+    r'\s*"([-.e\d]+) ([-.e\d]+) (LINE|CURVE|QCURVE|OFFCURVE|n/a)'
+    r'(?: (SMOOTH))?"\s*(?:(,)|\))')
+_BYTES_NODE_RE = re.compile(_NODE_RE.pattern.encode('ascii'))
+_NODE_TYPES = dict(
+    (key, nodetype.lower()) for nodetype in
+    ('LINE', 'CURVE', 'QCURVE', 'OFFCURVE', 'n/a')
+    for key in (nodetype, nodetype.encode('ascii')))
+
+
+# The untyped bare strings that `float` accepts, except for "infinity",
+# "inf" and "nan" that are glyph names (see `_guess_value`). Python 3.6
+# also accepts underscores between digits.
+if sys.version_info >= (3, 6):
+    _DIGITS = r'[0-9](?:_?[0-9])*'
+else:
+    _DIGITS = r'[0-9]+'
+_NUMBER_RE = re.compile(
+    r'(?:-(?:inf|infinity|nan)|'
+    r'-?(?:{0}(?:\.(?:{0})?)?|\.{0})(?:e-?{0})?)\Z'.format(_DIGITS),
+    re.IGNORECASE)
+
+
+def _guess_value(kind, value, text, start, end):
+    """Convert an untyped value like `Parser._guess_current_type` would,
+    without trying to convert it to a float."""
+    if kind == _STRING or _NUMBER_RE.match(value) is None:
+        return value
+    v = float(value)
+    return v if not v.is_integer() else int(v)
+
+
+def _make_value_reader(current_type):
+    """Return the function that converts the value of a quoted or bare
+    string to current_type, like `Parser._parse`. It is called with the
+    kind of token, its value, the source text and the position of the token.
+    """
+    if hasattr(current_type, "read"):
+        def read(kind, value, text, start, end):
+            # Give the escaped value to `read` to be symetrical with
+            # `plistValue` which handles the escaping itself.
+            return current_type().read(_text(text[start:end]))
+    elif current_type is None or current_type in (dict, OrderedDict):
+        read = _guess_value
+    elif current_type == bool:
+        def read(kind, value, text, start, end):
+            return bool(int(value))  # bool(u'0') returns True
+    else:
+        def read(kind, value, text, start, end):
+            return current_type(value)
+    return read
+
+
+# type -> function returned by `_make_value_reader`
+_VALUE_READERS = {}
+
+
+def _value_reader(current_type):
+    """Return the cached `_make_value_reader(current_type)`."""
+    if type(current_type) == list:  # cannot be a key
+        return _make_value_reader(current_type)
+    reader = _VALUE_READERS.get(current_type)
+    if reader is None:
+        reader = _VALUE_READERS[current_type] = \
+            _make_value_reader(current_type)
+    return reader
+
+
+class _Schema(dict):
+    """How to parse the values of the dictionary of a `GSBase` subclass:
+    key -> (type, value reader) for `Parser._fast_parse`.
+
+    This is `classForName` compiled once for each class, with the same
+    default type for the keys that the class does not know.
+    """
+
+    def __init__(self, cls):
+        super(_Schema, self).__init__(
+            (name, (value_type, _value_reader(value_type)))
+            for name, value_type in cls._classesForName.items())
+        self.default = (str, _value_reader(str))
+
+    def __missing__(self, name):
+        return self.default
+
+
+# The keys of the values that `Parser._fast_parse_master_value` filters
+_MASTER_KEYS = frozenset(("fontMaster", "kerning", "layers"))
+
+
+# GSBase subclass -> _Schema
+_SCHEMAS = {}
+
+
+def _schema(obj):
+    """Return the `_Schema` of the class of obj, or None if it is not a
+    `GSBase`."""
+    cls = type(obj)
+    schema = _SCHEMAS.get(cls)
+    if schema is None:
+        if not hasattr(cls, "classForName"):
+            return None
+        schema = _SCHEMAS[cls] = _Schema(cls)
+    return schema
+
+
+class LazyValue(object):
+    """A dictionary of the source text that is only parsed when needed.
+
+    `text[start:end]` is the dictionary as written in the source text.
+    `peeked` holds the values of a few keys of the dictionary that are read
+    ahead of the rest, like the name of a glyph. `parser` is the parser
+    that found the dictionary, it is used to parse it with the same options.
+    """
+
+    __slots__ = ('parser', 'text', 'start', 'end', 'current_type', 'peeked')
+
+    def __init__(self, parser, text, start, end, current_type, peeked):
+        self.parser = parser
+        self.text = text
+        self.start = start
+        self.end = end
+        self.current_type = current_type
+        self.peeked = peeked
+
+    def parse(self):
+        """Parse the dictionary into an object of the current type."""
+        value, _ = self.parser._fast_parse(
+            self.text, self.start, self.current_type)
+        return value
+
+    def can_copy_source(self):
+        """Return whether the source text is what writing the parsed
+        dictionary would produce, as far as the parser can tell: it is not
+        when parsing drops some content, like the layers of filtered masters.
+        """
+        return self.parser.masters is None
+
+    def source(self):
+        """Return the source text of the dictionary."""
+        return _text(self.text[self.start:self.end])
+
+
+class _TextStream(object):
+    """Text read from a file object in chunks, of which only the part that
+    has not been parsed yet is kept in memory.
+
+    `text[pos:]` is the unparsed text. The file object can return either
+    unicode or UTF-8 encoded bytes.
+    """
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = ''
+        self.pos = 0
+        self._decoder = None
+
+    def read(self, size=None):
+        """Append a chunk of the file to the text, dropping the text before
+        pos. Return False at the end of the file.
+        """
+        data = self.fp.read(size or self.chunk_size)
+        if isinstance(data, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder('utf-8')()
+            data = self._decoder.decode(data, final=not data)
+        if not data:
+            return False
+        self.text = self.text[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def match(self, regex):
+        """Match regex at pos, reading more of the file as long as the
+        unparsed text does not match.
+        """
+        m = regex.match(self.text, self.pos)
+        while m is None and self.read():
+            m = regex.match(self.text, self.pos)
+        return m
+
+    def read_value(self):
+        """Make sure the value at pos and its delimiter have been read.
+
+        Return the index of the delimiter, or the length of the text if the
+        file ends before the value is complete.
+        """
+        size = self.chunk_size
+        end = _skip_value(self.text, self.pos)
+        while end < 0:
+            if not self.read(size):
+                return len(self.text)
+            # Read bigger chunks for big values, like the kerning, so that
+            # they are not scanned over and over again.
+            size *= 2
+            end = _skip_value(self.text, self.pos)
+        return end
+
+
 class Parser(object):
     """Parses Python dictionaries from Glyphs source files."""
 
@@ -43,32 +398,202 @@ class Parser(object):
     hex_re = re.compile(r'\s*<([A-Fa-f0-9]+)>', re.DOTALL)
     bytes_re = re.compile(r'\s*<([A-Za-z0-9+/=]+)>', re.DOTALL)
 
-    def __init__(self, current_type=OrderedDict):
+    # The "regex" engine tries one regular expression per construct at each
+    # position. The "fast" engine reads each token exactly once with a single
+    # pattern and dispatches on the kind of token that was found.
+    ENGINES = ('regex', 'fast')
+
+    def __init__(self, current_type=OrderedDict, engine='regex',
+                 compact=False, masters=None):
+        if engine not in self.ENGINES:
+            raise ValueError('Unknown parser engine: %r' % (engine,))
+        if compact and engine != 'fast':
+            raise ValueError('Compact parsing requires the "fast" engine')
+        if masters is not None and engine != 'fast':
+            raise ValueError('Filtering masters requires the "fast" engine')
         self.current_type = current_type
+        self.engine = engine
+        # Parse lists of the types that have a `_packedListType`, like
+        # the nodes of paths, into that type instead of a list of objects.
+        self.compact = compact
+        # Ids or names of the masters to keep: the other masters and their
+        # layers are dropped while parsing, see `_fast_parse_master_value`.
+        self.masters = None if masters is None else frozenset(masters)
+        # Ids of the masters that were kept, None if all of them were
+        self._master_ids = None
+        self._masters_parsed = False
 
     def parse(self, text):
-        """Do the parsing."""
+        """Do the parsing.
+
+        The fast engine reads UTF-8 encoded text (bytes, or any object that
+        supports the buffer protocol like a memory map) without decoding it
+        first.
+        """
 
-        text = tounicode(text, encoding='utf-8')
-        result, i = self._parse(text, 0)
+        text = self._source_text(text)
+        if self.engine == 'fast':
+            result, i = self._fast_parse(text, 0, self.current_type)
+        else:
+            result, i = self._parse(text, 0)
         if text[i:].strip():
             self._fail('Unexpected trailing content', text, i)
         return result
 
-    def parse_into_object(self, res, text):
-        """Parse data into an existing GSFont instance."""
+    def parse_into_object(self, res, text, lazy_keys=None, only_keys=None,
+                          skip_keys=None):
+        """Parse data into an existing GSFont instance.
 
-        text = tounicode(text, encoding='utf-8')
+        `lazy_keys` maps the keys of lists of dictionaries that should not be
+        parsed yet to the keys of the dictionaries that should be read ahead:
+        the lists are stored as lists of `LazyValue` instead.
 
-        m = self.start_dict_re.match(text, 0)
-        if m:
-            i = self._parse_dict_into_object(res, text, 1)
+        The values of the keys that are not in `only_keys` (if given), or
+        that are in `skip_keys`, are skipped over without being parsed, and
+        are not set on res.
+
+        These options require the "fast" engine.
+        """
+
+        text = self._source_text(text)
+
+        if ((lazy_keys or only_keys is not None or skip_keys) and
+                self.engine != 'fast'):
+            raise ValueError('Lazy or selective parsing requires the "fast" '
+                             'engine')
+        if self.engine == 'fast':
+            token = _tokenizer_for(text)(text, 0)
+            if token is None or token[0] != _START_DICT:
+                self._fail('not correct file format', text, 0)
+            i = self._fast_parse_dict_into_object(
+                res, text, token[3], lazy_keys=lazy_keys,
+                only_keys=only_keys, skip_keys=skip_keys)
         else:
-            self._fail('not correct file format', text, i)
+            m = self.start_dict_re.match(text, 0)
+            if m:
+                i = self._parse_dict_into_object(res, text, 1)
+            else:
+                self._fail('not correct file format', text, 0)
         if text[i:].strip():
             self._fail('Unexpected trailing content', text, i)
         return i
 
+    def _source_text(self, text):
+        """Return text the way the engine reads it: unicode for the regex
+        engine, unicode or UTF-8 encoded data for the fast engine.
+        """
+        if self.engine == 'fast' or isinstance(text, unicode):
+            return text
+        if not isinstance(text, bytes):
+            text = text[:]
+        return tounicode(text, encoding='utf-8')
+
+    # Used by `iterparse_into_object` to know when a key has been read.
+    _stream_start_re = re.compile(r'\s*\{')
+    _stream_key_re = re.compile(
+        r'\s*(?:".*?(?<!\\)"|[-_./$A-Za-z0-9]+)\s*=|\s*\}', re.DOTALL)
+
+    def iterparse_into_object(self, res, fp, stream_key,
+                              chunk_size=2 ** 16):
+        """Parse data from a file object into an existing object, reading
+        the file in chunks.
+
+        The items of the list stored under `stream_key` are not stored in
+        `res`: they are yielded as ("item", item) events as soon as they are
+        parsed. A ("start", res) event is yielded before the first item,
+        and an ("end", res) event when the file has been parsed.
+        """
+
+        if self.engine != 'fast':
+            raise ValueError('Streaming requires the "fast" engine')
+        stream = _TextStream(fp, chunk_size)
+        if not stream.match(self._stream_start_re):
+            self._fail('not correct file format', stream.text, stream.pos)
+        stream.pos = stream.text.index('{', stream.pos) + 1
+        schema = _schema(res)
+        started = False
+        while True:
+            stream.match(self._stream_key_re)
+            token = _next_token(stream.text, stream.pos)
+            if token is None:
+                self._fail('Unexpected dictionary content',
+                           stream.text, stream.pos)
+            kind, name, _, stream.pos = token
+            if kind == _END_DICT:
+                break
+            if kind != _BARE and kind != _STRING:
+                self._fail('Unexpected dictionary content',
+                           stream.text, stream.pos)
+            token = _next_token(stream.text, stream.pos)
+            if token is None or token[0] != _ASSIGN:
+                self._fail('Unexpected dictionary content',
+                           stream.text, stream.pos)
+            stream.pos = token[3]
+            value_type, reader = None, None
+            if schema is not None:
+                value_type, reader = schema[name]
+
+            if name == stream_key:
+                if not started:
+                    started = True
+                    yield "start", res
+                for item in self._iterparse_list(stream, value_type):
+                    yield "item", item
+            else:
+                stream.read_value()
+                value, stream.pos = self._fast_parse(
+                    stream.text, stream.pos, value_type, name == "unicode",
+                    reader)
+                res[name] = value
+
+            stream.read_value()
+            token = _next_token(stream.text, stream.pos)
+            if token is None or token[0] != _DICT_DELIM:
+                self._fail('Missing delimiter in dictionary before content',
+                           stream.text, stream.pos)
+            stream.pos = token[3]
+
+        while not stream.text[stream.pos:].strip():
+            stream.pos = len(stream.text)
+            if not stream.read():
+                break
+        if stream.text[stream.pos:].strip():
+            self._fail('Unexpected trailing content', stream.text, stream.pos)
+        if not started:
+            yield "start", res
+        yield "end", res
+
+    def _iterparse_list(self, stream, current_type):
+        """Parse a list from a stream, yielding its items one at a time."""
+
+        if type(current_type) == list:
+            current_type = current_type[0]
+        stream.match(self.start_list_re)
+        token = _next_token(stream.text, stream.pos)
+        if token is None or token[0] != _START_LIST:
+            self._fail('Unexpected content', stream.text, stream.pos)
+        stream.pos = token[3]
+        stream.read_value()
+        token = _next_token(stream.text, stream.pos)
+        if token is not None and token[0] == _END_LIST:
+            stream.pos = token[3]
+            return
+        while True:
+            stream.read_value()
+            item, stream.pos = self._fast_parse(
+                stream.text, stream.pos, current_type)
+            yield item
+            token = _next_token(stream.text, stream.pos)
+            if token is None:
+                self._fail('Missing delimiter in list before content',
+                           stream.text, stream.pos)
+            kind, _, _, stream.pos = token
+            if kind == _END_LIST:
+                return
+            if kind != _LIST_DELIM:
+                self._fail('Missing delimiter in list before content',
+                           stream.text, token[2])
+
     def _guess_current_type(self, parsed, value):
         if value.lower() in ('infinity', 'inf', 'nan'):
             # Those values would be accepted by `float()`
@@ -132,7 +657,6 @@ class Parser(object):
 
         m = self.hex_re.match(text, i)
         if m:
-            from glyphsLib.types import BinaryData
             parsed, value = m.group(0), m.group(1)
             decoded = BinaryData.fromHex(value)
             i += len(parsed)
@@ -215,6 +739,364 @@ class Parser(object):
         i += len(parsed)
         return res, i
 
+    def _fast_parse(self, text, i, current_type, _parsing_unicodes=False,
+                    reader=None):
+        """Parse a single dictionary, list, or value with the fast engine.
+
+        This mirrors `_parse`, except that the current type is passed along
+        instead of being stored on the parser, with the `_value_reader` of
+        current_type if the caller already has it.
+        """
+
+        next_token = _tokenizer_for(text)
+        token = next_token(text, i)
+        if token is None:
+            self._fail('Unexpected content', text, i)
+        kind, value, start, i = token
+
+        if kind == _START_DICT:
+            return self._fast_parse_dict(text, i, current_type)
+        if kind == _START_LIST:
+            return self._fast_parse_list(text, i, current_type)
+        if kind == _HEX:
+            return BinaryData(value), i
+        if kind != _STRING and kind != _BARE:
+            self._fail('Unexpected content', text, start)
+
+        if _parsing_unicodes and kind == _BARE:
+            token = next_token(text, i)
+            if token is not None and token[0] == _LIST_DELIM:
+                return self._fast_parse_unicodes(text, value, token[3])
+
+        if reader is None:
+            reader = _value_reader(current_type)
+        return reader(kind, value, text, start, i), i
+
+    def _fast_parse_unicodes(self, text, first, i):
+        """Parse the rest of a comma-separated list of unicodes."""
+        unicode_list = [first]
+        next_token = _tokenizer_for(text)
+        while True:
+            token = next_token(text, i)
+            if token is None or token[0] != _BARE:
+                self._fail('Unexpected content', text, i)
+            unicode_list.append(token[1])
+            i = token[3]
+            token = next_token(text, i)
+            if token is None or token[0] != _LIST_DELIM:
+                return unicode_list, i
+            i = token[3]
+
+    def _fast_parse_dict(self, text, i, current_type):
+        """Parse a dictionary from source text starting at i."""
+        new_type = current_type
+        if new_type is None:
+            # customparameter.value needs to be set from the found value
+            new_type = dict
+        elif type(new_type) == list:
+            new_type = new_type[0]
+        res = new_type()
+        i = self._fast_parse_dict_into_object(res, text, i, current_type)
+        return res, i
+
+    def _fast_parse_dict_into_object(self, res, text, i, current_type=None,
+                                     lazy_keys=None, only_keys=None,
+                                     skip_keys=None):
+        schema = _schema(res)
+        if schema is None:
+            value_type, reader = current_type, _value_reader(current_type)
+        master_keys = ()
+        if self.masters is not None and schema is not None:
+            master_keys = _MASTER_KEYS
+        next_token = _tokenizer_for(text)
+        while True:
+            token = next_token(text, i)
+            if token is None:
+                self._fail('Unexpected dictionary content', text, i)
+            kind, name, _, end = token
+            if kind == _END_DICT:
+                return end
+            if kind != _BARE and kind != _STRING:
+                self._fail('Unexpected dictionary content', text, i)
+            token = next_token(text, end)
+            if token is None or token[0] != _ASSIGN:
+                self._fail('Unexpected dictionary content', text, i)
+            i = token[3]
+
+            if ((only_keys is not None and name not in only_keys) or
+                    (skip_keys and name in skip_keys)):
+                i = _skip_value(text, i)
+                if i < 0:
+                    self._fail('Unexpected dictionary content', text,
+                               token[3])
+            else:
+                if schema is not None:
+                    value_type, reader = schema[name]
+                if lazy_keys and name in lazy_keys:
+                    value, i = self._fast_parse_lazy_list(
+                        text, i, value_type, lazy_keys[name])
+                elif master_keys and name in master_keys:
+                    value, i = self._fast_parse_master_value(
+                        text, i, name, value_type)
+                else:
+                    value, i = self._fast_parse(
+                        text, i, value_type, name == "unicode", reader)
+                try:
+                    res[name] = value
+                except:
+                    # ugly, this fixes nested dicts in customparameters
+                    res = {}
+                    schema = None
+                    value_type = current_type
+                    reader = _value_reader(current_type)
+                    res[name] = value
+
+            token = next_token(text, i)
+            if token is None or token[0] != _DICT_DELIM:
+                self._fail('Missing delimiter in dictionary before content',
+                           text, i)
+            i = token[3]
+
+    def _fast_parse_list(self, text, i, current_type):
+        """Parse a list from source text starting at i."""
+
+        if current_type is glyphsLib.classes.GSNode:
+            return self._fast_parse_node_list(text, i, current_type)
+        if self.compact and hasattr(current_type, "_packedListType"):
+            return self._fast_parse_packed_list(text, i, current_type)
+        res = []
+        reader = _value_reader(current_type)
+        next_token = _tokenizer_for(text)
+        token = next_token(text, i)
+        if token is not None and token[0] == _END_LIST:
+            return res, token[3]
+        while True:
+            list_item, i = self._fast_parse(
+                text, i, current_type, reader=reader)
+            res.append(list_item)
+            token = next_token(text, i)
+            if token is None:
+                self._fail('Missing delimiter in list before content',
+                           text, i)
+            kind = token[0]
+            if kind == _END_LIST:
+                return res, token[3]
+            if kind != _LIST_DELIM:
+                self._fail('Missing delimiter in list before content',
+                           text, i)
+            i = token[3]
+
+    def _fast_parse_packed_list(self, text, i, current_type):
+        """Parse a list of strings that would be given to the `read` method
+        of current_type into its `_packedListType` instead.
+        """
+
+        res = current_type._packedListType()
+        read = res.read
+        next_token = _tokenizer_for(text)
+        token = next_token(text, i)
+        if token is not None and token[0] == _END_LIST:
+            return res, token[3]
+        while True:
+            token = next_token(text, i)
+            if token is None or token[0] != _STRING:
+                self._fail('Unexpected content', text, i)
+            start, i = token[2], token[3]
+            # Give the escaped value, like to `read`
+            read(_text(text[start:i]))
+            token = next_token(text, i)
+            if token is None:
+                self._fail('Missing delimiter in list before content',
+                           text, i)
+            kind = token[0]
+            if kind == _END_LIST:
+                return res, token[3]
+            if kind != _LIST_DELIM:
+                self._fail('Missing delimiter in list before content',
+                           text, i)
+            i = token[3]
+
+    def _fast_parse_node_list(self, text, i, current_type):
+        """Parse a list of nodes, into the `_packedListType` of current_type
+        if the parser is compact.
+
+        Most nodes and the delimiter after them are read with a single match
+        of `_NODE_RE`, without creating a token for them. The others, like
+        the nodes with user data, are given to `read`.
+        """
+
+        packed = self.compact
+        if packed:
+            res = current_type._packedListType()
+            read = res.read
+            type_code = res._typeCode
+            append_coordinate = res._coordinates.append
+            append_flags = res._flags.append
+            smooth_flag = res._SMOOTH
+        else:
+            res = []
+            append = res.append
+            new_node = current_type._fromValues
+        next_token = _tokenizer_for(text)
+        token = next_token(text, i)
+        if token is not None and token[0] == _END_LIST:
+            return res, token[3]
+        if isinstance(text, unicode):
+            match = _NODE_RE.match
+        else:
+            match = _BYTES_NODE_RE.match
+        node_types = _NODE_TYPES
+        while True:
+            m = match(text, i)
+            if m is not None:
+                x, y, nodetype, smooth, more = m.groups()
+                nodetype = node_types[nodetype]
+                if packed:
+                    append_coordinate(float(x))
+                    append_coordinate(float(y))
+                    flags = type_code(nodetype)
+                    if smooth:
+                        flags |= smooth_flag
+                    append_flags(flags)
+                else:
+                    append(new_node(float(x), float(y), nodetype,
+                                    bool(smooth)))
+                i = m.end()
+                if more is None:
+                    return res, i
+                continue
+
+            token = next_token(text, i)
+            if token is None or token[0] != _STRING:
+                self._fail('Unexpected content', text, i)
+            start, i = token[2], token[3]
+            # Give the escaped value, like to `read`
+            line = _text(text[start:i])
+            if packed:
+                read(line)
+            else:
+                append(current_type().read(line))
+            token = next_token(text, i)
+            if token is None:
+                self._fail('Missing delimiter in list before content',
+                           text, i)
+            kind = token[0]
+            if kind == _END_LIST:
+                return res, token[3]
+            if kind != _LIST_DELIM:
+                self._fail('Missing delimiter in list before content',
+                           text, i)
+            i = token[3]
+
+    def _fast_parse_master_value(self, text, i, name, current_type):
+        """Parse the masters or the kerning of a font, or the layers of a
+        glyph, only keeping the masters of `self.masters` and their data.
+
+        The layers are first skipped over to read the ids that tell which
+        master they belong to, and only the layers that are kept are parsed.
+        The kerning of the other masters is skipped over.
+        """
+
+        if name == "fontMaster":
+            masters, i = self._fast_parse(text, i, current_type)
+            kept = [master for master in masters
+                    if master.id in self.masters or
+                    master.name in self.masters]
+            unknown = self.masters.difference(
+                *[(master.id, master.name) for master in masters])
+            if unknown:
+                raise ValueError('Unknown masters: %s' % ', '.join(
+                    sorted(unknown)))
+            self._masters_parsed = True
+            if len(kept) < len(masters):
+                self._master_ids = frozenset(master.id for master in kept)
+            return kept, i
+
+        if not self._masters_parsed:
+            self._fail('The masters must be defined before their data to '
+                       'filter it', text, i)
+        if self._master_ids is None:
+            return self._fast_parse(text, i, current_type)
+        if name == "kerning":
+            token = _tokenizer_for(text)(text, i)
+            if token is None or token[0] != _START_DICT:
+                self._fail('Unexpected content', text, i)
+            kerning = current_type()
+            i = self._fast_parse_dict_into_object(
+                kerning, text, token[3], current_type,
+                only_keys=self._master_ids)
+            return kerning, i
+        layers, i = self._fast_parse_lazy_list(
+            text, i, current_type, ('associatedMasterId', 'layerId'))
+        return [layer.parse() for layer in layers
+                if (layer.peeked.get('associatedMasterId') or
+                    layer.peeked.get('layerId')) in self._master_ids], i
+
+    def _fast_parse_lazy_list(self, text, i, current_type, peek_keys):
+        """Parse a list of dictionaries into a list of `LazyValue`, only
+        reading the values of `peek_keys` in each dictionary.
+        """
+
+        if type(current_type) == list:
+            current_type = current_type[0]
+        schema = _schema(current_type())
+        next_token = _tokenizer_for(text)
+        token = next_token(text, i)
+        if token is None or token[0] != _START_LIST:
+            self._fail('Unexpected content', text, i)
+        res = []
+        i = token[3]
+        token = next_token(text, i)
+        if token is not None and token[0] == _END_LIST:
+            return res, token[3]
+        while True:
+            token = next_token(text, i)
+            if token is None or token[0] != _START_DICT:
+                self._fail('Unexpected content', text, i)
+            start, i = token[2], token[3]
+            peeked = {}
+            while True:
+                token = next_token(text, i)
+                if token is None:
+                    self._fail('Unexpected dictionary content', text, i)
+                kind, name, _, i = token
+                if kind == _END_DICT:
+                    break
+                token = next_token(text, i)
+                if ((kind != _BARE and kind != _STRING) or
+                        token is None or token[0] != _ASSIGN):
+                    self._fail('Unexpected dictionary content', text, i)
+                i = token[3]
+                if name in peek_keys:
+                    value_type, reader = None, None
+                    if schema is not None:
+                        value_type, reader = schema[name]
+                    peeked[name], i = self._fast_parse(
+                        text, i, value_type, name == "unicode", reader)
+                else:
+                    i = _skip_value(text, i)
+                    if i < 0:
+                        self._fail('Unexpected dictionary content', text,
+                                   start)
+                token = next_token(text, i)
+                if token is None or token[0] != _DICT_DELIM:
+                    self._fail(
+                        'Missing delimiter in dictionary before content',
+                        text, i)
+                i = token[3]
+            res.append(
+                LazyValue(self, text, start, i, current_type, peeked))
+            token = next_token(text, i)
+            if token is None:
+                self._fail('Missing delimiter in list before content',
+                           text, i)
+            kind, i = token[0], token[3]
+            if kind == _END_LIST:
+                return res, i
+            if kind != _LIST_DELIM:
+                self._fail('Missing delimiter in list before content',
+                           text, token[2])
+
     # glyphs only supports octal escapes between \000 and \077 and hexadecimal
     # escapes between \U0000 and \UFFFF
     _unescape_re = re.compile(r'(\\0[0-7]{2})|(\\U[0-9a-fA-F]{4})')
@@ -225,7 +1107,8 @@ class Parser(object):
             return unichr(int(m.group(1)[1:], 8))
         return unichr(int(m.group(2)[2:], 16))
 
-    def _trim_value(self, value):
+    @staticmethod
+    def _trim_value(value):
         """Trim double quotes off the ends of a value, un-escaping inner
         double quotes.
         Also convert escapes to unicode.
@@ -239,25 +1122,179 @@ class Parser(object):
     def _fail(self, message, text, i):
         """Raise an exception with given message and text at i."""
 
-        raise ValueError('%s:\n%s' % (message, text[i:i + 79]))
+        raise ValueError('%s:\n%s' % (
+            message, _text(text[i:i + 79], errors='replace')))
+
+
+def _map_file(fp):
+    """Return a read-only memory map of the UTF-8 encoded .glyphs file
+    that fp reads from the start, or None if it cannot be mapped: fp is
+    not a real file, is not at its start, uses another encoding or is empty.
+
+    The map reflects later changes to the file, so it should only be used
+    while the file is not written to.
+    """
+    encoding = getattr(fp, 'encoding', None)
+    try:
+        if encoding is not None and codecs.lookup(encoding).name != 'utf-8':
+            return None
+        if fp.tell() != 0:
+            return None
+        fileno = fp.fileno()
+    except (AttributeError, LookupError, EnvironmentError, ValueError,
+            io.UnsupportedOperation):
+        return None
+    try:
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (EnvironmentError, ValueError):  # e.g. an empty file
+        return None
 
 
-def load(fp):
+def load(fp, workers=1, only=None, skip=None, masters=None):
     """Read a .glyphs file. 'fp' should be (readable) file object.
     Return a GSFont object.
+
+    Files on disk are memory-mapped and parsed as UTF-8 bytes, without
+    reading and decoding them first. See `loads` for the other arguments.
     """
-    return loads(fp.read())
+    data = _map_file(fp)
+    if data is None:
+        return loads(fp.read(), workers=workers, only=only, skip=skip,
+                     masters=masters)
+    try:
+        return loads(data, workers=workers, only=only, skip=skip,
+                     masters=masters)
+    finally:
+        data.close()
+        fp.seek(0, io.SEEK_END)
 
 
-def loads(s):
+def loads(s, workers=1, only=None, skip=None, masters=None):
     """Read a .glyphs file from a (unicode) str object, or from
     a UTF-8 encoded bytes object.
     Return a GSFont object.
+
+    If `workers` is not 1, the glyphs are parsed in a pool of that many
+    processes (one per CPU if it is None).
+
+    `only` or `skip` select the top-level keys of the file to read, like
+    `only=("fontMaster", "kerning")` or `skip=("glyphs",)`: the values of
+    the other keys are skipped over without being parsed, and are left
+    empty or to their defaults in the font.
+
+    If `masters` (ids or names of masters) is given, the other masters and
+    their layers are dropped while parsing. The masters must be defined
+    before the glyphs in the file, as in files saved by Glyphs.
     """
-    p = Parser(current_type=glyphsLib.classes.GSFont)
+    if only is not None and skip is not None:
+        raise ValueError('Only one of "only" and "skip" can be given')
+    if only is not None:
+        only = frozenset(only)
+    if skip is not None:
+        skip = frozenset(skip)
+    p = Parser(current_type=glyphsLib.classes.GSFont, engine='fast',
+               masters=masters)
     logger.info('Parsing .glyphs file')
-    data = p.parse(s)
-    return data
+    if workers != 1 and not _skips(only, skip, "glyphs"):
+        return _parse_in_pool(p, s, workers, only, skip)
+    if only is None and skip is None:
+        return p.parse(s)
+    font = glyphsLib.classes.GSFont()
+    p.parse_into_object(font, s, only_keys=only, skip_keys=skip)
+    return font
+
+
+def _skips(only_keys, skip_keys, key):
+    """Return whether key is not read with these `loads` options."""
+    return ((only_keys is not None and key not in only_keys) or
+            (skip_keys is not None and key in skip_keys))
+
+
+# The source text of a worker process of `_parse_in_pool` and the parser
+# that parsed the font (for its options), set once per process by
+# `_init_parse_worker`.
+_worker = {}
+
+
+def _parse_in_pool(parser, text, workers, only_keys=None, skip_keys=None):
+    """Parse a font with its glyphs in a pool of `workers` processes.
+
+    The font is parsed first with its glyphs left as `LazyValue`, which
+    only skips over them to find where each of them starts. The workers
+    then parse chunks of consecutive glyphs from these positions and the
+    glyphs are set on the font in order.
+    """
+    text = parser._source_text(text)
+    font = parser.current_type()
+    parser.parse_into_object(font, text, lazy_keys={"glyphs": ()},
+                             only_keys=only_keys, skip_keys=skip_keys)
+    starts = [glyph.start for glyph in font._glyphs]
+    processes = min(workers or multiprocessing.cpu_count(), len(starts))
+    if processes < 2:
+        font.glyphs = [glyph.parse() for glyph in font._glyphs]
+        return font
+
+    # A few chunks per process, to even out their sizes
+    size = -(-len(starts) // (processes * 4))
+    chunks = [starts[i:i + size] for i in range(0, len(starts), size)]
+    if not workers_are_forked() and not isinstance(text, (unicode, bytes)):
+        text = text[:]  # memory maps cannot be pickled
+    pool = multiprocessing.Pool(processes, _init_parse_worker,
+                                (text, parser))
+    # Unpickling the glyphs creates many objects at once, which makes the
+    # garbage collector run over and over for nothing.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        results = pool.map(_parse_glyphs_at, chunks, chunksize=1)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        pool.terminate()
+        pool.join()
+    font.glyphs = [glyph for glyphs in results for glyph in glyphs]
+    return font
+
+
+def _init_parse_worker(text, parser):
+    _worker['text'] = text
+    _worker['parser'] = parser
+
+
+def _parse_glyphs_at(starts):
+    parser = _worker['parser']
+    text = _worker['text']
+    glyph_type = glyphsLib.classes.GSGlyph
+    return [parser._fast_parse(text, start, glyph_type)[0]
+            for start in starts]
+
+
+def iterparse(fp, chunk_size=2 ** 16):
+    """Read a .glyphs file incrementally. 'fp' should be (readable) file
+    object, opened in text mode or in binary mode.
+
+    Return an iterator of (event, object) pairs:
+    - ("font", font) once the font-level data that precedes the glyphs in
+      the file has been read, like the masters. The data stored after the
+      glyphs, like the instances and the kerning, is not set yet;
+    - ("glyph", glyph) for every glyph, in the order of the file. The glyphs
+      know their font (`glyph.parent`) but they are not added to
+      `font.glyphs`, so that only one glyph at a time needs to be kept in
+      memory;
+    - ("end", font) once the whole file has been read.
+    """
+    font = glyphsLib.classes.GSFont()
+    p = Parser(engine='fast')
+    logger.info('Parsing .glyphs file incrementally')
+    events = p.iterparse_into_object(font, fp, "glyphs", chunk_size)
+    for event, obj in events:
+        if event == "item":
+            font._setupGlyph(obj)
+            yield "glyph", obj
+            continue
+        for master in font.masters:
+            master.font = font
+        yield "font" if event == "start" else "end", font
 
 
 def main(args=None):
@@ -33,6 +33,7 @@ class ValueType(object):
     """A base class for value types that are comparable in the Python sense
     and readable/writable using the glyphsLib parser/writer.
     """
+    __slots__ = ('value',)
     default = None
 
     def __init__(self, value=None):
@@ -74,31 +75,40 @@ class ValueType(object):
 # class Vector<dimension>
 def Vector(dim):
     class Vector(ValueType):
-        """Base type for number vectors (points, rects, transform matrices)."""
+        """Base type for number vectors (points, rects, transform matrices).
+
+        The numbers are a list in `value`, and the vectors have no
+        `__dict__`: there is one for each node, anchor and component.
+        """
+        __slots__ = ()
         dimension = dim
         default = [0.0] * dimension
-        regex = re.compile('{%s}' % ', '.join(['([-.e\\d]+)'] * dimension))
+
+        def __init__(self, value=None):
+            if value:
+                self.value = self.fromString(value)
+            else:
+                self.value = [0.0] * self.dimension
 
         def fromString(self, src):
-            if isinstance(src, list):
+            if isinstance(src, (list, tuple)):
                 assert len(src) == self.dimension
-                return src
-            src = src.replace('"', '')
-            return [float(i) for i in self.regex.match(src).groups()]
+                return list(src)
+            values = [float(v) for v in src.strip('"{}').split(',')]
+            if len(values) != self.dimension:
+                raise ValueError("Expected %d numbers in %r" % (
+                    self.dimension, src))
+            return values
 
         def plistValue(self):
             assert (isinstance(self.value, list)
                     and len(self.value) == self.dimension)
-            return '"{%s}"' % (', '.join(floatToString(v, 3) for v in self.value))
+            return '"{%s}"' % (', '.join(floatsToStrings(self.value, 3)))
 
         def __getitem__(self, key):
-            assert (isinstance(self.value, list) and
-                    len(self.value) == self.dimension)
             return self.value[key]
 
         def __setitem__(self, key, value):
-            assert (isinstance(self.value, list) and
-                    len(self.value) == self.dimension)
             self.value[key] = value
 
         def __len__(self):
@@ -109,20 +119,27 @@ def Vector(dim):
 
 class Point(Vector(2)):
     """Read/write a vector in curly braces."""
+    __slots__ = ('rect',)
 
     def __init__(self, value=None, value2=None, rect=None):
         if value is not None and value2 is not None:
-            value = [value, value2]
-        assert (value is None or
-                isinstance(value, (str, unicode)) or
-                isinstance(value, (list, tuple)))
-        super(Point, self).__init__(value)
-
+            self.value = [value, value2]
+        elif value:
+            assert isinstance(value, (str, unicode, list, tuple))
+            self.value = self.fromString(value)
+        else:
+            self.value = [0.0, 0.0]
         self.rect = rect
 
     def __repr__(self):
         return '<point x=%s y=%s>' % (self.value[0], self.value[1])
 
+    def plistValue(self):
+        value = self.value
+        assert isinstance(value, list) and len(value) == 2
+        return '"{%s, %s}"' % (floatToString(value[0], 3),
+                               floatToString(value[1], 3))
+
     @property
     def x(self):
         return self.value[0]
@@ -147,6 +164,8 @@ class Point(Vector(2)):
 
 
 class Size(Point):
+    __slots__ = ()
+
     def __repr__(self):
         return '<size width=%s height=%s>' % (self.value[0], self.value[1])
 
@@ -175,25 +194,33 @@ class Size(Point):
 
 class Rect(Vector(4)):
     """Read/write a rect of two points in curly braces."""
-    regex = re.compile('{{([-.e\d]+), ([-.e\d]+)}, {([-.e\d]+), ([-.e\d]+)}}')
+    __slots__ = ()
 
     def __init__(self, value=None, value2=None):
         if value is not None and value2 is not None:
-            value = [value[0], value[1], value2[0], value2[1]]
-        super(Rect, self).__init__(value)
+            self.value = [value[0], value[1], value2[0], value2[1]]
+        else:
+            super(Rect, self).__init__(value)
+
+    def fromString(self, src):
+        if not isinstance(src, (list, tuple)):
+            # "{{x, y}, {width, height}}"
+            src = src.replace('{', '').replace('}', '')
+        return super(Rect, self).fromString(src)
 
     def plistValue(self):
         assert (isinstance(self.value, list)
                 and len(self.value) == self.dimension)
         return '"{{%s, %s}, {%s, %s}}"' % tuple(
-            floatToString(v, 3) for v in self.value)
+            floatsToStrings(self.value, 3))
 
     def __repr__(self):
         return '<rect origin=%s size=%s>' % (str(self.origin), str(self.size))
 
     @property
     def origin(self):
-        return Point(self.value[0], self.value[1], rect=self)
+        value = self.value
+        return Point(value[0], value[1], rect=self)
 
     @origin.setter
     def origin(self, value):
@@ -202,7 +229,8 @@ class Rect(Vector(4)):
 
     @property
     def size(self):
-        return Size(self.value[2], self.value[3], rect=self)
+        value = self.value
+        return Size(value[2], value[3], rect=self)
 
     @size.setter
     def size(self, value):
@@ -212,6 +240,8 @@ class Rect(Vector(4)):
 
 class Transform(Vector(6)):
     """Read/write a six-element vector."""
+    __slots__ = ()
+
     def __init__(self,
                  value=None,
                  value2=None,
@@ -219,9 +249,12 @@ class Transform(Vector(6)):
                  value4=None,
                  value5=None,
                  value6=None):
-        if all(v is not None for v in (value, value2, value3, value4, value5, value6)):
-            value = [value, value2, value3, value4, value5, value6]
-        super(Transform, self).__init__(value)
+        if value6 is not None and all(
+                v is not None for v in (value, value2, value3, value4,
+                                        value5)):
+            self.value = [value, value2, value3, value4, value5, value6]
+        else:
+            super(Transform, self).__init__(value)
 
     def __repr__(self):
         return '<affine transformation %s>' % (' '.join(map(str, self.value)))
@@ -229,7 +262,7 @@ class Transform(Vector(6)):
     def plistValue(self):
         assert (isinstance(self.value, list) and
                 len(self.value) == self.dimension)
-        return '"{%s}"' % (', '.join(floatToString(v, 5) for v in self.value))
+        return '"{%s}"' % (', '.join(floatsToStrings(self.value, 5)))
 
 
 UTC_OFFSET_RE = re.compile(
@@ -353,29 +386,90 @@ def actualPrecition(Float):
     return ActualPrecition
 
 
+# Below this magnitude, the precision of a float or an int is found with
+# exact integer arithmetic (`_fastPrecision`).
+_FAST_FLOAT_LIMIT = 1e9
+
+# precision -> {float: string} of the non-integral floats formatted by
+# `floatToString`: the same coordinates come up again and again in a font.
+_FLOAT_STRINGS = {}
+_FLOAT_STRINGS_SIZE = 2 ** 16
+
+
 def floatToString(Float, precision=3):
+    """Format a number with at most `precision` decimals, and only the
+    decimals that it needs when rounded to 5 decimals.
+
+    Integral numbers are formatted directly, and the strings of the other
+    floats are cached. Other values go through `_floatToString`.
+    """
+    kind = type(Float)
+    if kind is float:
+        if -_FAST_FLOAT_LIMIT < Float < _FAST_FLOAT_LIMIT:
+            if Float.is_integer():
+                return "%.0f" % Float  # keeps the sign of -0.0
+            strings = _FLOAT_STRINGS.get(precision)
+            if strings is None:
+                strings = _FLOAT_STRINGS[precision] = {}
+            string = strings.get(Float)
+            if string is None:
+                if len(strings) >= _FLOAT_STRINGS_SIZE:
+                    strings.clear()
+                string = strings[Float] = _formatFloat(
+                    Float, min(precision, _fastPrecision(Float)))
+            return string
+    elif kind is int:
+        if -_FAST_FLOAT_LIMIT < Float < _FAST_FLOAT_LIMIT:
+            return "%d" % Float
+    return _floatToString(Float, precision)
+
+
+def floatsToStrings(values, precision=3):
+    """Return the list of `floatToString(value, precision)` of values, like
+    the coordinates of all the nodes of a path."""
+    return [floatToString(value, precision) for value in values]
+
+
+def _fastPrecision(Float):
+    """Return `actualPrecition(Float)` for floats that are smaller than
+    `_FAST_FLOAT_LIMIT`, for which `Float * 100000.0` is a small enough
+    integer to count its trailing zeros exactly."""
+    Integer = round(Float * 100000.0)
+    ActualPrecition = 5
+    while ActualPrecition > 0 and Integer % 10 == 0:
+        Integer //= 10
+        ActualPrecition -= 1
+    return ActualPrecition
+
+
+def _formatFloat(Float, precision):
+    fractional = math.modf(math.fabs(Float))[0]
+    if precision >= 5 and fractional >= 0.000005 and fractional <= 0.999995:
+        return "%.5f" % Float
+    elif precision >= 4 and fractional >= 0.00005 and fractional <= 0.99995:
+        return "%.4f" % Float
+    elif precision >= 3 and fractional >= 0.0005 and fractional <= 0.9995:
+        return "%.3f" % Float
+    elif precision >= 2 and fractional >= 0.005 and fractional <= 0.995:
+        return "%.2f" % Float
+    elif precision >= 1 and fractional >= 0.05 and fractional <= 0.95:
+        return "%.1f" % Float
+    else:
+        return "%.0f" % Float
+
+
+def _floatToString(Float, precision=3):
+    """`floatToString` for any number, without shortcuts."""
     try:
-        ActualPrecition = actualPrecition(Float)
-        precision = min(precision, ActualPrecition)
-        fractional = math.modf(math.fabs(Float))[0]
-        if precision >= 5 and fractional >= 0.000005 and fractional <= 0.999995:
-            return "%.5f" % Float
-        elif precision >= 4 and fractional >= 0.00005 and fractional <= 0.99995:
-            return "%.4f" % Float
-        elif precision >= 3 and fractional >= 0.0005 and fractional <= 0.9995:
-            return "%.3f" % Float
-        elif precision >= 2 and fractional >= 0.005 and fractional <= 0.995:
-            return "%.2f" % Float
-        elif precision >= 1 and fractional >= 0.05 and fractional <= 0.95:
-            return "%.1f" % Float
-        else:
-            return "%.0f" % Float
+        return _formatFloat(Float, min(precision, actualPrecition(Float)))
     except:
         print(traceback.format_exc())
 
 
 class UnicodesList(list):
     """Represent a PLIST-able list of unicode codepoints as strings."""
+    __slots__ = ()
+
     def __init__(self, value=None):
         if value is None:
             unicodes = []
@@ -15,6 +15,7 @@
 # TODO: (jany) merge with builder/common.py
 
 import logging
+import multiprocessing
 import os
 import shutil
 from fontTools.misc.textTools import num2binary
@@ -49,6 +50,16 @@ def clean_ufo(path):
         shutil.rmtree(path)
 
 
+def workers_are_forked():
+    """Return whether the worker processes of a multiprocessing pool are
+    forked, and so inherit the objects of the parent process."""
+
+    get_start_method = getattr(multiprocessing, 'get_start_method', None)
+    if get_start_method is None:  # Python 2
+        return os.name != 'nt'
+    return get_start_method() == 'fork'
+
+
 def cast_to_number_or_bool(inputstr):
     """Cast a string to int, float or bool. Return original string if it can't be
     converted.
@@ -17,11 +17,17 @@
 # limitations under the License.
 
 from __future__ import unicode_literals
+import re
 import sys
 import glyphsLib.classes
-from glyphsLib.types import floatToString
+from glyphsLib.cache import _FontPickler, _FontUnpickler
+from glyphsLib.parser import LazyValue
+from glyphsLib.types import floatToString, ValueType
+from glyphsLib.util import workers_are_forked
+import io
 import logging
 import datetime
+import multiprocessing
 from collections import OrderedDict
 from fontTools.misc.py23 import unicode, open, BytesIO, UnicodeIO
 
@@ -39,7 +45,30 @@ logger = logging.getLogger(__name__)
 
 class Writer(object):
 
-    def __init__(self, fp):
+    # The "stream" engine inspects every value and writes each fragment to the
+    # file as soon as it is produced. The "fast" engine looks up how to write
+    # each type and each GS class in tables that are built once, and writes
+    # the fragments to the file in large chunks. Both produce the same output.
+    ENGINES = ('stream', 'fast')
+
+    def __init__(self, fp, engine='stream', incremental=False, workers=1):
+        if engine not in self.ENGINES:
+            raise ValueError('Unknown writer engine: %r' % (engine,))
+        if incremental and engine != 'fast':
+            raise ValueError('Incremental writing requires the "fast" engine')
+        if workers != 1 and engine != 'fast':
+            raise ValueError('Parallel writing requires the "fast" engine')
+        self.engine = engine
+        # Copy the glyphs of lazy fonts that were not parsed from their
+        # source text, instead of parsing them to write them again. The
+        # glyphs that were parsed are written in full, as they may have
+        # changed. The output is the same as a full write when the glyphs
+        # are written in the source the way they are written here, like in
+        # the files that were saved by glyphsLib.
+        self.incremental = incremental
+        # Write the glyphs of fonts in a pool of that many processes (one per
+        # CPU if None), see `_write_glyphs_in_pool`.
+        self.workers = workers
         # figure out whether file object expects bytes or unicodes
         try:
             fp.write(b'')
@@ -53,6 +82,10 @@ class Writer(object):
             self.file = codecs.getwriter('utf-8')(fp)
 
     def write(self, rootObject):
+        if self.engine == 'fast':
+            _FastWriter(self.file, self.incremental,
+                        self.workers).write(rootObject)
+            return
         self.writeDict(rootObject)
         self.file.write("\n")
 
@@ -153,11 +186,301 @@ class Writer(object):
         self.file.write("%s = " % key)
 
 
-def dump(obj, fp):
+class _FastWriter(object):
+    """The "fast" engine of `Writer`, see `Writer.write`."""
+
+    # Number of buffered fragments above which they are written to the file.
+    _FLUSH_SIZE = 2 ** 14
+
+    def __init__(self, file, incremental=False, workers=1):
+        self.file = file
+        self.incremental = incremental
+        self.workers = workers
+        self._chunks = []
+
+    def write(self, rootObject):
+        self._write_dict(rootObject)
+        self._chunks.append("\n")
+        self._flush()
+
+    def _flush(self):
+        self.file.write("".join(self._chunks))
+        del self._chunks[:]
+
+    def _write_value(self, value, forKey=None):
+        write = _VALUE_WRITERS.get(type(value))
+        if write is None:
+            write = _VALUE_WRITERS[type(value)] = _value_writer(type(value))
+        if (forKey == "color" and write is not _FastWriter._write_plist_value
+                and hasattr(value, "__iter__")):
+            # See Writer.writeValue
+            self._chunks.append(unicode(tuple(value)))
+        else:
+            write(self, value, forKey)
+
+    def _write_dict(self, dictValue, forKey=None):
+        chunks = self._chunks
+        chunks.append("{\n")
+        if hasattr(dictValue, "_classesForName"):
+            self._write_object_items(dictValue)
+        else:
+            keys = dictValue.keys()
+            if not isinstance(dictValue, OrderedDict):
+                keys = sorted(keys)
+            for key in keys:
+                value = dictValue[key]
+                if value is None:
+                    continue
+                chunks.append("%s = " % escape_string(key))
+                self._write_value(value, key)
+                chunks.append(";\n")
+        chunks.append("}")
+        if len(chunks) > self._FLUSH_SIZE:
+            self._flush()
+
+    def _write_object_items(self, obj):
+        chunks = self._chunks
+        plan = _OBJECT_PLANS.get(type(obj))
+        if plan is None:
+            plan = _OBJECT_PLANS[type(obj)] = _ObjectPlan(type(obj))
+        default_check = plan.default_check
+        for key, attribute, key_text, klass, default in plan.keys:
+            try:
+                value = getattr(obj, attribute)
+            except AttributeError:
+                continue
+            if value is None:
+                continue
+            if default_check:
+                if not _default_should_write(value, klass, default):
+                    continue
+            elif not obj.shouldWriteValueForKey(key):
+                continue
+            chunks.append(key_text)
+            self._write_value(value, key)
+            chunks.append(";\n")
+
+    def _write_array(self, arrayValue, forKey=None):
+        chunks = self._chunks
+        chunks.append("(\n")
+        last = len(arrayValue) - 1
+        if self.workers != 1 and isinstance(
+                arrayValue, glyphsLib.classes.FontGlyphsProxy):
+            self._write_glyphs_in_pool(arrayValue)
+            chunks.append(")")
+            return
+        if hasattr(arrayValue, "plistValues"):
+            values = arrayValue.plistValues()  # e.g. all the nodes at once
+            if values:
+                chunks.append(",\n".join(values))
+                chunks.append("\n")
+            chunks.append(")")
+            return
+        if self.incremental and hasattr(arrayValue, "plistSourceArray"):
+            arrayValue = arrayValue.plistSourceArray()
+        elif hasattr(arrayValue, "plistArray"):
+            arrayValue = arrayValue.plistArray()
+        self._write_items(arrayValue, 0, len(arrayValue), last)
+        chunks.append(")")
+
+    def _write_items(self, values, start, stop, last):
+        """Write values[start:stop] as the items of a list that ends with
+        values[last]."""
+        chunks = self._chunks
+        for idx in range(start, stop):
+            self._write_value(values[idx])
+            chunks.append(",\n" if idx < last else "\n")
+
+    def _write_glyphs_in_pool(self, glyphsProxy):
+        """Write the glyphs of a font in a pool of `self.workers` processes.
+
+        Each process writes chunks of consecutive glyphs to text that is
+        written in order, so the output is the same as when the glyphs are
+        written one after the other. Forked workers inherit the font,
+        otherwise it is pickled once for each of them.
+        """
+        if self.incremental:
+            glyphs = glyphsProxy.plistSourceArray()
+        else:
+            glyphs = glyphsProxy.values()  # parse the glyphs of lazy fonts
+        last = len(glyphs) - 1
+        processes = min(self.workers or multiprocessing.cpu_count(),
+                        len(glyphs))
+        if processes < 2:
+            self._write_items(glyphs, 0, len(glyphs), last)
+            return
+
+        # A few chunks per process, to even out their sizes
+        size = -(-len(glyphs) // (processes * 4))
+        ranges = [(start, min(start + size, len(glyphs)))
+                  for start in range(0, len(glyphs), size)]
+        font = glyphsProxy._owner
+        if not workers_are_forked():
+            fp = io.BytesIO()
+            _FontPickler(fp, font).dump(font.__getstate__())
+            font = fp.getvalue()
+        pool = multiprocessing.Pool(processes, _init_write_worker,
+                                    (font, self.incremental))
+        try:
+            texts = pool.map(_write_glyphs_at, ranges, chunksize=1)
+        finally:
+            pool.terminate()
+            pool.join()
+        self._flush()
+        for text in texts:
+            self.file.write(text)
+
+    def _write_user_data(self, userDataValue, forKey=None):
+        chunks = self._chunks
+        chunks.append("{\n")
+        for key in sorted(userDataValue.keys()):
+            chunks.append("%s = " % escape_string(key))
+            self._write_value(userDataValue[key], key)
+            chunks.append(";\n")
+        chunks.append("}")
+
+    def _write_plist_value(self, value, forKey=None):
+        value = value.plistValue()
+        if value is not None:
+            self._chunks.append(value)
+
+    def _write_lazy_value(self, value, forKey=None):
+        # Only found by incremental writers, see `Writer`
+        self._chunks.append(value.source())
+
+    def _write_float(self, value, forKey=None):
+        self._chunks.append(floatToString(value, 5))
+
+    def _write_int(self, value, forKey=None):
+        self._chunks.append(unicode(value))
+
+    def _write_bool(self, value, forKey=None):
+        self._chunks.append("1" if value else "0")
+
+    def _write_datetime(self, value, forKey=None):
+        self._chunks.append("\"%s +0000\"" % str(value))
+
+    def _write_string(self, value, forKey=None):
+        value = unicode(value)
+        if forKey != "unicode":
+            value = escape_string(value)
+        self._chunks.append(value)
+
+
+# The glyphs that a worker process of `_FastWriter._write_glyphs_in_pool`
+# writes and whether it writes incrementally, set once per process by
+# `_init_write_worker`.
+_worker = {}
+
+
+def _init_write_worker(font, incremental):
+    if not isinstance(font, glyphsLib.classes.GSFont):
+        data, font = font, glyphsLib.classes.GSFont()
+        font.__dict__.update(_FontUnpickler(io.BytesIO(data), font).load())
+    if incremental:
+        glyphs = font.glyphs.plistSourceArray()
+    else:
+        glyphs = font.glyphs.values()
+    _worker['glyphs'] = glyphs
+    _worker['incremental'] = incremental
+
+
+def _write_glyphs_at(glyph_range):
+    """Return the text of the glyphs in range, with their delimiters."""
+    glyphs = _worker['glyphs']
+    fp = UnicodeIO()
+    writer = _FastWriter(fp, _worker['incremental'])
+    writer._write_items(glyphs, glyph_range[0], glyph_range[1],
+                        len(glyphs) - 1)
+    writer._flush()
+    return fp.getvalue()
+
+
+def _value_writer(cls):
+    """Return the method of _FastWriter that writes the values of type `cls`,
+    following the same rules as Writer.writeValue."""
+    if hasattr(cls, "plistValue"):
+        return _FastWriter._write_plist_value
+    if cls is LazyValue:
+        return _FastWriter._write_lazy_value
+    if issubclass(cls, (list, glyphsLib.classes.Proxy)):
+        if issubclass(cls, glyphsLib.classes.UserDataProxy):
+            return _FastWriter._write_user_data
+        return _FastWriter._write_array
+    if issubclass(cls, (dict, OrderedDict, glyphsLib.classes.GSBase)):
+        return _FastWriter._write_dict
+    if cls is float:
+        return _FastWriter._write_float
+    if cls is int:
+        return _FastWriter._write_int
+    if cls is bool:
+        return _FastWriter._write_bool
+    if cls is datetime.datetime:
+        return _FastWriter._write_datetime
+    return _FastWriter._write_string
+
+
+# How _FastWriter writes each type of value, filled on demand.
+_VALUE_WRITERS = {}
+
+
+class _ObjectPlan(object):
+    """How _FastWriter writes the objects of a GS class: the keys to write,
+    in order, with the attribute that holds their value and the text that
+    introduces them, as in Writer.writeDict."""
+
+    def __init__(self, cls):
+        if hasattr(cls, "_keyOrder"):
+            keys = cls._keyOrder
+        else:
+            keys = sorted(cls._classesForName.keys())
+        translate = getattr(cls, "_wrapperKeysTranslate", {})
+        self.keys = [
+            (key, translate.get(key, key), "%s = " % escape_string(key),
+             cls._classesForName[key],
+             getattr(cls, "_defaultsForName", {}).get(key, None))
+            for key in keys]
+        # Classes that do not override shouldWriteValueForKey are checked
+        # without calling it, see `_default_should_write`.
+        should_write = getattr(cls, "shouldWriteValueForKey", None)
+        self.default_check = (
+            getattr(should_write, "__func__", should_write) is
+            getattr(glyphsLib.classes.GSBase.shouldWriteValueForKey,
+                    "__func__",
+                    glyphsLib.classes.GSBase.shouldWriteValueForKey))
+
+
+# The plan of each GS class, filled on demand.
+_OBJECT_PLANS = {}
+
+
+def _default_should_write(value, klass, default):
+    """GSBase.shouldWriteValueForKey for a value that was already read."""
+    if (isinstance(value, (list, glyphsLib.classes.Proxy, str, unicode)) and
+            len(value) == 0):
+        return False
+    if default is not None:
+        return default != value
+    if klass in (int, float, bool) and value == 0:
+        return False
+    if isinstance(value, ValueType) and value.value is None:
+        return False
+    return True
+
+
+def dump(obj, fp, incremental=False, workers=1):
     """Write a GSFont object to a .glyphs file.
     'fp' should be a (writable) file object.
+
+    If `incremental` is True, the glyphs of a font opened with
+    `GSFont(path, lazy=True)` that were not accessed are copied from the
+    file instead of being parsed and written again, see `Writer`.
+
+    If `workers` is not 1, the glyphs are written in a pool of that many
+    processes (one per CPU if it is None). The output is the same.
     """
-    writer = Writer(fp)
+    writer = Writer(fp, engine='fast', incremental=incremental,
+                    workers=workers)
     logger.info('Writing .glyphs file')
     writer.write(obj)
 
@@ -199,16 +522,17 @@ NSPropertyListNameSet = (
     )
 
 
+# Matches the non-empty strings made only of characters of
+# NSPropertyListNameSet.
+_NAME_SET_RE = re.compile(r'[$.0-9A-Z_a-z]+\Z')
+
+
 def _needs_quotes(string):
-    if len(string) == 0:
+    # Does it need quotes because it is empty or because of special
+    # characters?
+    if not _NAME_SET_RE.match(string):
         return True
 
-    # Does it need quotes because of special characters?
-    for c in string:
-        d = ord(c)
-        if d >= 128 or not NSPropertyListNameSet[d]:
-            return True
-
     # Does it need quotes because it could be confused with a number?
     try:
         int(string)
@@ -12,8 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
-from setuptools import setup, find_packages, Command
+from setuptools import setup, find_packages, Command, Extension
 from distutils import log
 
 
@@ -155,6 +156,18 @@ wheel = ['wheel'] if needs_wheel else []
 needs_bump2version = {'release', 'bump_version'}.intersection(sys.argv)
 bump2version = ['bump2version >= 0.5.7'] if needs_bump2version else []
 
+# The C tokenizer used by glyphsLib.parser is optional and only built on
+# request, e.g. `GLYPHSLIB_WITH_C_TOKENIZER=1 pip install .`; glyphsLib falls
+# back to the pure-Python tokenizer when it is not available.
+ext_modules = []
+if os.environ.get('GLYPHSLIB_WITH_C_TOKENIZER') == '1':
+    if sys.version_info[0] < 3:
+        log.warn("The C tokenizer requires Python 3, skipping it")
+    else:
+        ext_modules.append(Extension(
+            'glyphsLib._tokenizer',
+            sources=['Lib/glyphsLib/_tokenizer.c']))
+
 with open('README.rst', 'r') as f:
     long_description = f.read()
 
@@ -176,6 +189,7 @@ setup(
     license="Apache Software License 2.0",
     package_dir={"": "Lib"},
     packages=find_packages("Lib"),
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "glyphs2ufo = glyphsLib.__main__:main"
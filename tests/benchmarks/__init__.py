@@ -0,0 +1,91 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers shared by the benchmark scripts.
+
+The benchmarks are not part of the test suite. Run them from the root of the
+repository, for example:
+
+    python -m tests.benchmarks.parser_benchmark --scale 50
+"""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import os
+import time
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+import glyphsLib
+
+TESTFILE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    'data', 'GlyphsUnitTestSans.glyphs')
+
+
+def scaled_font(scale, path=TESTFILE_PATH):
+    """Return the font at `path` with its glyphs repeated `scale` times.
+
+    The copies are renamed and lose their unicodes so that the resulting font
+    is still valid.
+    """
+    font = glyphsLib.GSFont(path)
+    for copy_index in range(1, scale):
+        for glyph in list(glyphsLib.GSFont(path).glyphs):
+            glyph.name = '%s.copy%d' % (glyph.name, copy_index)
+            glyph.unicodes = []
+            font.glyphs.append(glyph)
+    return font
+
+
+def scaled_font_text(scale, path=TESTFILE_PATH):
+    """Return the .glyphs source text of `scaled_font(scale, path)`."""
+    return glyphsLib.dumps(scaled_font(scale, path))
+
+
+def best_time(func, repeat=3, number=1):
+    """Return the best wall time in seconds of `number` calls to `func`."""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def measure(func):
+    """Return the wall time of func(), the peak of memory it allocated and
+    the memory still used by what it returned.
+
+    The memory is only traced on Python 3, it is reported as 0 otherwise.
+    """
+    if tracemalloc is not None:
+        tracemalloc.start()
+    start = time.time()
+    result = func()
+    seconds = time.time() - start
+    peak = retained = 0
+    if tracemalloc is not None:
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    del result
+    return seconds, peak, retained
+
+
+def report(title, rows):
+    """Print a table of (label, seconds) rows, relative to the first one."""
+    print(title)
+    reference = rows[0][1]
+    for label, seconds in rows:
+        print('  %-24s %9.4fs  x%.2f' % (label, seconds, reference / seconds))
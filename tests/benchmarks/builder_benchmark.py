@@ -0,0 +1,104 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time the conversion of a many-master font to UFOs."""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import argparse
+import io
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from glyphsLib import build_masters, to_designspace
+from glyphsLib.parser import Parser
+from glyphsLib.writer import dump, dumps
+
+from . import best_time, measure, report, scaled_font
+
+
+def clone(obj):
+    return Parser(type(obj), engine='fast').parse(dumps(obj))
+
+
+def many_masters_font(master_count, scale):
+    """Return `scaled_font(scale)` with its masters (and their layers) copied
+    until it has `master_count` masters.
+    """
+    font = scaled_font(scale)
+    originals = list(font.masters)
+    for index in range(len(originals), master_count):
+        original = originals[index % len(originals)]
+        master = clone(original)
+        master.id = 'master-copy-%d' % index
+        master.customParameters['Master Name'] = 'Copy %d' % index
+        font.masters.append(master)
+        for glyph in font.glyphs:
+            layer = clone(glyph.layers[original.id])
+            layer.layerId = layer.associatedMasterId = master.id
+            glyph.layers.append(layer)
+    return font
+
+
+def bench_workers(font, workers, repeat):
+    rows = []
+    for count in [1] + workers:
+        rows.append(('workers=%d' % count, best_time(
+            lambda: to_designspace(font, workers=count), repeat)))
+    report('to_designspace, %d masters, %d glyphs' % (
+        len(font.masters), len(font.glyphs)), rows)
+
+
+def bench_stream(font):
+    """Compare the memory used by build_masters with and without stream."""
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, 'Font.glyphs')
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            dump(font, fp)
+        print('build_masters, %d masters, %d glyphs' % (
+            len(font.masters), len(font.glyphs)))
+        for stream in (False, True):
+            master_dir = os.path.join(tempdir, 'masters')
+            seconds, peak, _ = measure(
+                lambda: build_masters(path, master_dir, stream=stream))
+            print('  stream=%-5s %9.4fs  peak %6.1f MB' % (
+                stream, seconds, peak / 2 ** 20))
+            shutil.rmtree(master_dir)
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--masters', type=int, default=12)
+    parser.add_argument('--scale', type=int, default=10,
+                        help='how many times to repeat the glyphs')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[multiprocessing.cpu_count()])
+    parser.add_argument('--repeat', type=int, default=3)
+    options = parser.parse_args(args)
+    logging.disable(logging.WARNING)
+
+    font = many_masters_font(options.masters, options.scale)
+    bench_workers(font, options.workers, options.repeat)
+    bench_stream(font)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time the GSFont API on a scaled-up GlyphsUnitTestSans.glyphs, and the
+value types that its objects are made of."""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import glyphsLib
+from glyphsLib import classes, types
+
+from . import best_time, measure, report, scaled_font_text
+
+
+def metadata_workload(path, lazy):
+    """Open a font and only look at its font-level data and one glyph."""
+    font = classes.GSFont(path, lazy=lazy)
+    for master in font.masters:
+        master.name
+    font.kerning
+    list(font.classes)
+    list(font.features)
+    font.glyphs['a'].layers[0].width
+    return font
+
+
+def rss_growth(path, lazy):
+    """Return how much the resident set size in MB of a new process grows
+    while running the metadata workload, or None if it cannot be measured
+    on this system.
+
+    The peak RSS is not used: importing glyphsLib costs more than opening
+    a font.
+    """
+    code = (
+        'import os, sys\n'
+        'from tests.benchmarks.classes_benchmark import metadata_workload\n'
+        'def rss():\n'
+        '    with open("/proc/self/statm") as fp:\n'
+        '        pages = int(fp.read().split()[1])\n'
+        '    return pages * os.sysconf("SC_PAGE_SIZE")\n'
+        'before = rss()\n'
+        'font = metadata_workload(sys.argv[1], sys.argv[2] == "lazy")\n'
+        'print(rss() - before)\n')
+    try:
+        output = subprocess.check_output(
+            [sys.executable, '-c', code, path, 'lazy' if lazy else 'eager'],
+            stderr=subprocess.STDOUT)
+        return int(output.split()[-1]) / 1e6
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_lazy(text):
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, 'font.glyphs')
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        print('Metadata-only workload (%d characters)' % len(text))
+        for lazy in (False, True):
+            seconds, peak, _ = measure(
+                lambda: metadata_workload(path, lazy))
+            rss = rss_growth(path, lazy)
+            print('  %-24s %9.4fs  peak %.1fMB  RSS %s' % (
+                'GSFont(lazy=%s)' % lazy, seconds, peak / 1e6,
+                '+%.1fMB' % rss if rss is not None else 'n/a'))
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def count_nodes(path):
+    font = classes.GSFont(path)
+    return sum(len(p.nodes) for g in font.glyphs
+               for l in g.layers for p in l.paths)
+
+
+def bench_compact(text):
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, 'font.glyphs')
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        print('Memory used by the nodes (%d nodes)' % count_nodes(path))
+        for compact in (False, True):
+            seconds, peak, retained = measure(
+                lambda: classes.GSFont(path, compact=compact))
+            print('  %-24s %9.4fs  peak %.1fMB  font %.1fMB' % (
+                'GSFont(compact=%s)' % compact, seconds, peak / 1e6,
+                retained / 1e6))
+
+        def walk(font):
+            for glyph in font.glyphs:
+                for layer in glyph.layers:
+                    for path in layer.paths:
+                        for node in path.nodes:
+                            node.position.x, node.type, node.smooth
+
+        rows = []
+        for compact in (False, True):
+            font = classes.GSFont(path, compact=compact)
+            rows.append(('walk, compact=%s' % compact,
+                         best_time(lambda: walk(font))))
+        report('Read every node', rows)
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def synthetic_font(count):
+    """Return a font with `count` empty glyphs that have a unicode."""
+    font = classes.GSFont()
+    for index in range(count):
+        glyph = classes.GSGlyph('glyph%05d' % index)
+        glyph.unicode = '%04X' % (0xE000 + index)
+        font.glyphs.append(glyph)
+    return font
+
+
+def linear_lookup(font, key):
+    """Look a glyph up by name like FontGlyphsProxy did without indexes."""
+    for glyph in font._glyphs:
+        if glyph.name == key:
+            return glyph
+
+
+def bench_glyph_lookup(sizes, repeat):
+    for count in sizes:
+        font = synthetic_font(count)
+        names = [glyph.name for glyph in font.glyphs]
+        unicodes = [glyph.unicode for glyph in font.glyphs]
+
+        def by_name():
+            for name in names:
+                font.glyphs[name]
+
+        def by_unicode():
+            for unicode in unicodes:
+                font.glyphs[unicode]
+
+        def rename():
+            for glyph in font.glyphs:
+                glyph.name = glyph.name + '.alt'
+                font.glyphs[glyph.name]
+            for glyph in font.glyphs:
+                glyph.name = glyph.name[:-4]
+
+        rows = []
+        if count <= 10000:
+            rows.append(('linear scan by name', best_time(
+                lambda: [linear_lookup(font, name) for name in names],
+                repeat)))
+        rows += [('indexed by name', best_time(by_name, repeat)),
+                 ('indexed by unicode', best_time(by_unicode, repeat)),
+                 ('rename and look up', best_time(rename, repeat))]
+        report('Look up each of %d glyphs' % count, rows)
+
+
+def multi_master_font(master_count, glyph_count):
+    """Return a font with empty layers for `master_count` masters in each of
+    its `glyph_count` glyphs.
+    """
+    font = classes.GSFont()
+    for index in range(master_count):
+        master = classes.GSFontMaster()
+        master.weightValue = index
+        font.masters.append(master)
+    for index in range(glyph_count):
+        glyph = classes.GSGlyph('glyph%05d' % index)
+        font.glyphs.append(glyph)
+        for master in font.masters:
+            layer = classes.GSLayer()
+            layer.layerId = layer.associatedMasterId = master.id
+            glyph.layers.append(layer)
+    return font
+
+
+def bench_layer_iteration(master_counts, glyph_count, repeat):
+    rows = []
+    for master_count in master_counts:
+        font = multi_master_font(master_count, glyph_count)
+
+        def iterate():
+            for glyph in font.glyphs:
+                for layer in glyph.layers:
+                    layer.master
+
+        rows.append(('%d masters' % master_count, best_time(iterate, repeat)))
+    report('Iterate over the layers of %d glyphs' % glyph_count, rows)
+
+
+def builder_walk(font):
+    """Read the font like UFOBuilder does for its glyphs and masters."""
+    for master in font.masters:
+        master.customParameters['Master Name']
+        master.userData
+    for glyph in font.glyphs:
+        glyph.userData
+        for layer in glyph.layers:
+            layer.userData
+            layer.anchors
+            layer.components
+            layer.guides
+            layer.hints
+            for path in layer.paths:
+                for node in path.nodes:
+                    node.name
+
+
+# Access -> function of the font, its first layer and path
+PROXY_ACCESSES = [
+    ('font.glyphs', lambda font, layer, path: font.glyphs),
+    ('glyph.layers', lambda font, layer, path: layer.parent.layers),
+    ('layer.paths', lambda font, layer, path: layer.paths),
+    ('path.nodes', lambda font, layer, path: path.nodes),
+    ('node.name', lambda font, layer, path: path._nodes[0].name),
+]
+
+
+def bench_proxies(text, count, repeat):
+    data = text.encode('utf-8')
+    font = glyphsLib.loads(data)
+    layer = font.glyphs['A'].layers[0]
+    path = layer.paths[0]
+    print('Proxy accesses (%d per access)' % count)
+    for label, func in PROXY_ACCESSES:
+        seconds = best_time(
+            lambda: [func(font, layer, path) for _ in range(count)], repeat)
+        print('  %-24s %9.4fs  %.2fus/access' % (
+            label, seconds, seconds / count * 1e6))
+    seconds = best_time(lambda: builder_walk(font), repeat)
+    print('  %-24s %9.4fs' % ('UFOBuilder-like walk', seconds))
+
+
+def query_bounds(font, passes):
+    """Read the bounds of every layer of the font `passes` times, like a
+    metrics check that looks at each glyph in each master."""
+    for _ in range(passes):
+        for glyph in font.glyphs:
+            for layer in glyph.layers:
+                layer.bounds
+
+
+def edit_and_query_bounds(font):
+    """Move a node of each glyph, then read the bounds of its layers."""
+    for glyph in font.glyphs:
+        for layer in glyph.layers:
+            if layer.paths:
+                layer.paths[0].nodes[0].position.x += 1
+            layer.bounds
+
+
+def bench_bounds(text, repeat):
+    font = glyphsLib.loads(text.encode('utf-8'))
+    layer_count = sum(len(glyph.layers) for glyph in font.glyphs)
+    # Once, on a font whose bounds were never read
+    rows = [('first pass', best_time(lambda: query_bounds(font, 1), 1))]
+    rows += [('%d passes' % passes, best_time(
+        lambda: query_bounds(font, passes), repeat)) for passes in (1, 5)]
+    rows.append(('edit, then query', best_time(
+        lambda: edit_and_query_bounds(font), repeat)))
+    report('Bounds of %d layers' % layer_count, rows)
+
+
+CONSTRUCTED_CLASSES = [
+    classes.GSNode, classes.GSPath, classes.GSAnchor, classes.GSComponent,
+    classes.GSLayer, classes.GSGlyph, classes.GSFontMaster,
+]
+
+
+def bench_construction(text, count, repeat):
+    print('Object construction (%d per class)' % count)
+    for cls in CONSTRUCTED_CLASSES:
+        seconds = best_time(lambda: [cls() for _ in range(count)], repeat)
+        _, _, retained = measure(lambda: [cls() for _ in range(count)])
+        print('  %-24s %9.4fs  %.2fus/object  %d bytes/object' % (
+            cls.__name__, seconds, seconds / count * 1e6, retained / count))
+    data = text.encode('utf-8')
+    seconds, _, retained = measure(lambda: glyphsLib.loads(data))
+    print('  %-24s %9.4fs  font %.1fMB' % ('parse font', seconds,
+                                          retained / 1e6))
+
+
+# Operation on the value types -> function of one value
+VALUE_TYPE_OPERATIONS = [
+    ('Point from string', lambda rect: types.Point('{123.5, -20}')),
+    ('Point()', lambda rect: types.Point()),
+    ('Point(x, y)', lambda rect: types.Point(123.5, -20)),
+    ('Transform from string',
+     lambda rect: types.Transform('{1, 0, 0, 1, 120, -5.5}')),
+    ('Rect origin and size', lambda rect: (rect.origin, rect.size)),
+    ('Point plistValue', lambda rect: rect.origin.plistValue()),
+    ('UnicodesList from string', lambda rect: types.UnicodesList('0041,0061')),
+]
+
+
+def bench_value_types(text, count, repeat):
+    print('Value types (%d per operation)' % count)
+    rect = types.Rect(types.Point(10, 20), types.Point(300, 400))
+    for label, func in VALUE_TYPE_OPERATIONS:
+        seconds = best_time(lambda: [func(rect) for _ in range(count)],
+                            repeat)
+        print('  %-24s %9.4fs  %.2fus/value' % (
+            label, seconds, seconds / count * 1e6))
+    data = text.encode('utf-8')
+    seconds = best_time(lambda: glyphsLib.dumps(glyphsLib.loads(data)),
+                        repeat)
+    print('  %-24s %9.4fs' % ('parse and write font', seconds))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=20,
+                        help='number of copies of the test glyphs')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 10000, 60000],
+                        help='numbers of glyphs for the glyph lookups')
+    parser.add_argument('--repeat', type=int, default=3)
+    options = parser.parse_args(args)
+
+    text = scaled_font_text(options.scale)
+    bench_lazy(text)
+    bench_compact(text)
+    bench_glyph_lookup(options.sizes, options.repeat)
+    bench_layer_iteration([2, 16, 32], 1000, options.repeat)
+    bench_construction(text, 20000, options.repeat)
+    bench_value_types(text, 100000, options.repeat)
+    bench_proxies(text, 100000, options.repeat)
+    bench_bounds(text, options.repeat)
+
+
+if __name__ == '__main__':
+    main()
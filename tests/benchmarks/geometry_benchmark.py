@@ -0,0 +1,102 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the geometry engines on the bounds and transforms of all the paths
+of a scaled-up GlyphsUnitTestSans.glyphs."""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import argparse
+
+from glyphsLib import classes, geometry
+from glyphsLib.parser import Parser
+
+from . import best_time, report, scaled_font_text
+
+
+def engines():
+    """Yield the available geometry engines."""
+    for engine in geometry.ENGINES:
+        if engine != 'numpy' or geometry.numpy is not None:
+            yield engine
+
+
+def parse(text, compact):
+    return Parser(classes.GSFont, engine='fast', compact=compact).parse(text)
+
+
+def font_paths(font):
+    return [path for glyph in font.glyphs for layer in glyph.layers
+            for path in layer.paths]
+
+
+def forget_bounds(paths):
+    for path in paths:
+        path._nodesChanged()
+
+
+def bench_bounds(text, repeat):
+    for compact in (False, True):
+        font = parse(text, compact)
+        paths = font_paths(font)
+        # The bounds are cached: forget them before each run
+        path_rows, layer_rows = [], []
+        for engine in engines():
+            def all_paths_bounds():
+                forget_bounds(paths)
+                geometry.paths_bounds(paths, engine)
+
+            def font_bounds():
+                forget_bounds(paths)
+                geometry.font_bounds(font, engine)
+
+            path_rows.append(('%s engine' % engine,
+                              best_time(all_paths_bounds, repeat)))
+            layer_rows.append(('%s engine' % engine,
+                               best_time(font_bounds, repeat)))
+        label = ', compact' if compact else ''
+        report('Bounds of the paths (%d paths%s)' % (len(paths), label),
+               path_rows)
+        # The layers add the bounds of their components
+        report('Bounds of the layers (%d paths%s)' % (len(paths), label),
+               layer_rows)
+
+
+def bench_transform(text, repeat):
+    matrix = (0.9, 0.1, -0.2, 1.1, 10.5, -3)
+    for compact in (False, True):
+        font = parse(text, compact)
+        paths = font_paths(font)
+        rows = [('%s engine' % engine, best_time(
+            lambda: geometry.transform_paths(paths, matrix, engine), repeat))
+            for engine in engines()]
+        report('Transform of the font (%d paths%s)' % (
+            len(paths), ', compact' if compact else ''), rows)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=20,
+                        help='number of copies of the test glyphs')
+    parser.add_argument('--repeat', type=int, default=3)
+    options = parser.parse_args(args)
+
+    text = scaled_font_text(options.scale)
+    bench_bounds(text, options.repeat)
+    bench_transform(text, options.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the parser engines on a scaled-up GlyphsUnitTestSans.glyphs."""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import argparse
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import glyphsLib
+from glyphsLib import classes
+from glyphsLib import parser as parser_module
+from glyphsLib.parser import Parser
+
+from . import best_time, measure, report, scaled_font_text
+
+
+def tokenizers():
+    """Yield the available (name, next_token function) pairs."""
+    yield 'python tokenizer', parser_module._py_next_token
+    if parser_module._c_next_token is not None:
+        yield 'C tokenizer', parser_module._c_next_token
+
+
+def tokenize(next_token, text):
+    i = 0
+    token = next_token(text, i)
+    while token is not None:
+        i = token[3]
+        token = next_token(text, i)
+
+
+def bench_tokenizers(text, repeat):
+    rows = []
+    for name, next_token in tokenizers():
+        seconds = best_time(lambda: tokenize(next_token, text), repeat)
+        rows.append(('%s %.1fMB/s' % (name, len(text) / seconds / 1e6),
+                     seconds))
+    report('Tokenizers (%d characters)' % len(text), rows)
+
+
+def bench_engines(text, repeat):
+    rows = []
+    default_next_token = parser_module._next_token
+    try:
+        for engine in Parser.ENGINES:
+            parser = Parser(current_type=classes.GSFont, engine=engine)
+            if engine != 'fast':
+                rows.append(
+                    (engine, best_time(lambda: parser.parse(text), repeat)))
+                continue
+            for name, next_token in tokenizers():
+                parser_module._next_token = next_token
+                rows.append(('%s, %s' % (engine, name),
+                             best_time(lambda: parser.parse(text), repeat)))
+    finally:
+        parser_module._next_token = default_next_token
+    report('Parser engines (%d characters)' % len(text), rows)
+
+
+def nodes_text(count):
+    """Return the source of a path with `count` nodes."""
+    nodes = ',\n'.join(
+        '"%d %d %s"' % (i, 2 * i, ('LINE', 'OFFCURVE', 'CURVE SMOOTH')[i % 3])
+        for i in range(count))
+    return '({\nclosed = 1;\nnodes = (\n%s\n);\n})' % nodes
+
+
+def bench_nodes(count, repeat):
+    text = nodes_text(count)
+    rows = []
+    for engine, compact in (('regex', False), ('fast', False),
+                            ('fast', True)):
+        parser = Parser(classes.GSPath, engine=engine, compact=compact)
+        label = engine + (', compact' if compact else '')
+        rows.append((label, best_time(lambda: parser.parse(text), repeat)))
+    report('Node lists (%d nodes)' % count, rows)
+
+
+# Kind of value -> type of the dictionary that has it, key = value
+VALUE_KINDS = [
+    ('bool', classes.GSGuideLine, 'locked = 1'),
+    ('int', classes.GSFont, 'versionMajor = 2'),
+    ('float', classes.GSFontMaster, 'ascender = 700.5'),
+    ('string', classes.GSGlyph, 'leftKerningGroup = "A.alt"'),
+    ('value type', classes.GSAnchor, 'position = "{1, 2}"'),
+    ('list of class', classes.GSLayer,
+     'anchors = ({name = top; position = "{1, 2}";})'),
+    ('untyped number', dict, 'value = 12.5'),
+    ('untyped string', dict, 'value = A.alt'),
+]
+
+
+def bench_value_kinds(count, repeat):
+    print('Values by kind (%d per dictionary)' % count)
+    for label, current_type, item in VALUE_KINDS:
+        text = '{\n%s}' % ('%s;\n' % item * count)
+        parser = Parser(current_type, engine='fast')
+        seconds = best_time(lambda: parser.parse(text), repeat)
+        print('  %-24s %9.4fs  %.2fus/value' % (
+            label, seconds, seconds / count * 1e6))
+
+
+def load_file(path):
+    with io.open(path, encoding='utf-8') as fp:
+        glyphsLib.load(fp)
+
+
+def iterparse_file(path):
+    with io.open(path, encoding='utf-8') as fp:
+        for event, obj in glyphsLib.iterparse(fp):
+            pass
+
+
+def bench_iterparse(text):
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, 'font.glyphs')
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        print('Whole file vs streaming (%d characters)' % len(text))
+        for label, func in (('load', load_file),
+                            ('iterparse', iterparse_file)):
+            seconds, peak, _ = measure(lambda: func(path))
+            print('  %-24s %9.4fs  peak %.1fMB' % (label, seconds,
+                                                   peak / 1e6))
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def read_and_parse(path):
+    """Parse the decoded text of the file, like `GSFont(path)` used to."""
+    font = classes.GSFont()
+    with io.open(path, encoding='utf-8') as fp:
+        Parser(engine='fast').parse_into_object(font, fp.read())
+    return font
+
+
+def map_and_parse(path):
+    """Parse the memory-mapped UTF-8 bytes of the file."""
+    return classes.GSFont(path)
+
+
+# Run in a fresh interpreter by `peak_rss`, so that each function starts
+# from the same resident memory.
+_PEAK_RSS_SCRIPT = """
+import resource, sys
+from tests.benchmarks.parser_benchmark import {name}
+{name}(sys.argv[1])
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def peak_rss(func, path):
+    """Return the peak resident memory in MB of a process that only calls
+    func(path), or None if it cannot be measured on this platform.
+    """
+    try:
+        output = subprocess.check_output(
+            [sys.executable, '-c',
+             _PEAK_RSS_SCRIPT.format(name=func.__name__), path])
+    except subprocess.CalledProcessError:
+        return None
+    kilobytes = int(output.split()[-1])
+    if sys.platform == 'darwin':  # reported in bytes
+        kilobytes //= 1024
+    return kilobytes / 1024
+
+
+def bench_mmap(text, repeat):
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, 'font.glyphs')
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        rows = []
+        for label, func in (('read and decode', read_and_parse),
+                            ('memory map', map_and_parse)):
+            rows.append((label, best_time(lambda: func(path), repeat)))
+        report('File input (%d characters)' % len(text), rows)
+        for label, func in (('read and decode', read_and_parse),
+                            ('memory map', map_and_parse)):
+            rss = peak_rss(func, path)
+            if rss is not None:
+                print('  %-24s peak RSS %.1fMB' % (label, rss))
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def bench_cache(text, repeat):
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, 'font.glyphs')
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        cache_dir = os.path.join(tempdir, 'cache')
+
+        def cold():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            classes.GSFont(path, cache_dir=cache_dir)
+
+        rows = [('no cache', best_time(lambda: classes.GSFont(path), repeat)),
+                ('cold cache', best_time(cold, repeat)),
+                ('warm cache', best_time(
+                    lambda: classes.GSFont(path, cache_dir=cache_dir),
+                    repeat))]
+        report('Parse cache (%d characters)' % len(text), rows)
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def bench_workers(text, workers, repeat):
+    data = text.encode('utf-8')
+    rows = []
+    for count in [1] + workers:
+        rows.append(('workers=%d' % count, best_time(
+            lambda: glyphsLib.loads(data, workers=count), repeat)))
+    report('Parallel parsing (%d characters)' % len(text), rows)
+
+
+def bench_selective(text, repeat):
+    data = text.encode('utf-8')
+    rows = [('whole font', best_time(lambda: glyphsLib.loads(data), repeat))]
+    for label, options in (('skip glyphs', dict(skip=('glyphs',))),
+                           ('only masters, kerning',
+                            dict(only=('fontMaster', 'kerning')))):
+        rows.append((label, best_time(
+            lambda: glyphsLib.loads(data, **options), repeat)))
+    report('Selective parsing (%d characters)' % len(text), rows)
+
+
+def bench_masters(text, repeat):
+    data = text.encode('utf-8')
+    masters = glyphsLib.loads(data, only=('fontMaster',)).masters
+    rows = [('all masters', best_time(lambda: glyphsLib.loads(data), repeat))]
+    for master in masters:
+        rows.append(('master %s' % master.name, best_time(
+            lambda: glyphsLib.loads(data, masters=[master.id]), repeat)))
+    report('Master-filtered parsing (%d characters)' % len(text), rows)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=20,
+                        help='number of copies of the test glyphs')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[multiprocessing.cpu_count()])
+    options = parser.parse_args(args)
+
+    text = scaled_font_text(options.scale)
+    bench_tokenizers(text, options.repeat)
+    bench_engines(text, options.repeat)
+    bench_nodes(50000, options.repeat)
+    bench_value_kinds(20000, options.repeat)
+    bench_iterparse(text)
+    bench_mmap(text, options.repeat)
+    bench_cache(text, options.repeat)
+    bench_workers(text, options.workers, options.repeat)
+    bench_selective(text, options.repeat)
+    bench_masters(text, options.repeat)
+
+
+if __name__ == '__main__':
+    main()
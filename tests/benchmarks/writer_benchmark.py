@@ -0,0 +1,113 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the writer engines on a scaled-up GlyphsUnitTestSans.glyphs,
+full saves with incremental saves of a font opened lazily, the ways to
+format floats, and writing the glyphs with several numbers of worker
+processes."""
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import argparse
+import io
+import os
+import shutil
+import tempfile
+
+from glyphsLib.classes import GSFont
+from glyphsLib.types import floatToString, floatsToStrings, _floatToString
+from glyphsLib.writer import Writer
+
+from . import best_time, report, scaled_font, scaled_font_text
+
+
+def write(font, engine, stream_type):
+    Writer(stream_type(), engine=engine).write(font)
+
+
+def bench_engines(font, repeat):
+    for stream_type in (io.StringIO, io.BytesIO):
+        rows = []
+        for engine in Writer.ENGINES:
+            rows.append((engine, best_time(
+                lambda: write(font, engine, stream_type), repeat)))
+        report('Writer engines, %s (%d glyphs)' % (
+            stream_type.__name__, len(font.glyphs)), rows)
+
+
+def bench_incremental(text, repeat):
+    tempdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tempdir, 'font.glyphs')
+        with io.open(path, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        rows = []
+        for label, incremental in (('full', False), ('incremental', True)):
+            font = GSFont(path, lazy=True)
+            # A scripted edit of a few glyphs
+            for glyph in font.glyphs[:3]:
+                glyph.layers[0].width += 1
+            # Full saves parse all the glyphs the first time
+            Writer(io.StringIO(), engine='fast',
+                   incremental=incremental).write(font)
+            rows.append((label, best_time(lambda: Writer(
+                io.StringIO(), engine='fast',
+                incremental=incremental).write(font), repeat)))
+        report('Saving 3 changed glyphs (%d characters)' % len(text), rows)
+    finally:
+        shutil.rmtree(tempdir)
+
+
+def bench_floats(font, repeat):
+    values = [coordinate
+              for glyph in font.glyphs for layer in glyph.layers
+              for path in layer.paths for node in path.nodes
+              for coordinate in (node.position[0], node.position[1])]
+    rows = []
+    for label, func in (
+            ('no shortcuts', lambda: [_floatToString(v) for v in values]),
+            ('floatToString', lambda: [floatToString(v) for v in values]),
+            ('floatsToStrings', lambda: floatsToStrings(values))):
+        rows.append((label, best_time(func, repeat)))
+    report('Float formatting (%d coordinates)' % len(values), rows)
+
+
+def bench_workers(font, workers, repeat):
+    rows = []
+    for count in workers:
+        rows.append(('workers=%d' % count, best_time(
+            lambda: Writer(io.StringIO(), engine='fast',
+                           workers=count).write(font), repeat)))
+    report('Parallel writing (%d glyphs)' % len(font.glyphs), rows)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=50,
+                        help='how many times to repeat the glyphs')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, 8, 16])
+    options = parser.parse_args(args)
+
+    font = scaled_font(options.scale)
+    bench_engines(font, options.repeat)
+    bench_incremental(scaled_font_text(options.scale), options.repeat)
+    bench_floats(font, options.repeat)
+    bench_workers(font, options.workers, options.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -29,17 +29,19 @@ import shutil
 
 from defcon import Font
 from fontTools.misc.loggingTools import CapturingLogHandler
+from fontTools.pens.recordingPen import RecordingPen
 from glyphsLib import builder
 from glyphsLib.classes import (
     GSFont, GSFontMaster, GSInstance, GSCustomParameter, GSGlyph, GSLayer,
     GSPath, GSNode, GSAnchor, GSComponent, GSAlignmentZone, GSGuideLine)
 from glyphsLib.types import Point
 
-from glyphsLib.builder import to_ufos, to_glyphs
+from glyphsLib.builder import to_ufos, to_glyphs, to_designspace
 from glyphsLib.builder.builders import UFOBuilder, GlyphsBuilder
 from glyphsLib.builder.paths import to_ufo_paths
 from glyphsLib.builder.names import build_stylemap_names
 from glyphsLib.builder.filters import parse_glyphs_filter
+from glyphsLib.builder.parallel import _dump_ufo
 from glyphsLib.builder.constants import (
     GLYPHS_PREFIX, PUBLIC_PREFIX, GLYPHLIB_PREFIX,
     UFO2FT_USE_PROD_NAMES_KEY, FONT_CUSTOM_PARAM_PREFIX,
@@ -1128,6 +1130,142 @@ class SkipDanglingAndNamelessLayers(unittest.TestCase):
         captor.assertRegex("is dangling and will be skipped")
 
 
+class _SameUfosMixin(object):
+
+    def load_font(self):
+        filename = os.path.join(
+            os.path.dirname(__file__), '..', 'data',
+            'GlyphsUnitTestSans.glyphs')
+        return GSFont(filename)
+
+    def assertSameUfos(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for expected_ufo, actual_ufo in zip(expected, actual):
+            self.assertEqual(expected_ufo.info.styleName,
+                             actual_ufo.info.styleName)
+            self.assertEqual(sorted(expected_ufo.kerning.items()),
+                             sorted(actual_ufo.kerning.items()))
+            self.assertEqual(expected_ufo.features.text,
+                             actual_ufo.features.text)
+            expected_lib, expected_layers = _dump_ufo(expected_ufo)
+            actual_lib, actual_layers = _dump_ufo(actual_ufo)
+            self.assertEqual(expected_lib, actual_lib)
+            self.assertEqual(
+                [(name, lib, sorted(glyphs))
+                 for name, lib, glyphs in expected_layers],
+                [(name, lib, sorted(glyphs))
+                 for name, lib, glyphs in actual_layers])
+
+
+class ParallelBuildTest(_SameUfosMixin, unittest.TestCase):
+
+    def test_to_ufos(self):
+        expected = to_ufos(self.load_font(), minimize_glyphs_diffs=True)
+        actual = to_ufos(self.load_font(), minimize_glyphs_diffs=True,
+                         workers=2)
+        self.assertSameUfos(expected, actual)
+
+    def test_to_designspace(self):
+        expected = to_designspace(self.load_font())
+        actual = to_designspace(self.load_font(), workers=None)
+        self.assertEqual(
+            [source.filename for source in expected.sources],
+            [source.filename for source in actual.sources])
+        self.assertSameUfos([source.font for source in expected.sources],
+                            [source.font for source in actual.sources])
+
+    def test_dangling_layer_warning(self):
+        font = self.load_font()
+        layer = GSLayer()
+        layer.name = "dangling"
+        layer.layerId = "yyy"
+        layer.associatedMasterId = "xxx"
+        font.glyphs[0].layers.append(layer)
+        logger = logging.getLogger("glyphsLib.builder.builders.UFOBuilder")
+        with CapturingLogHandler(logger, level="WARNING") as captor:
+            builder = UFOBuilder(font, minimize_glyphs_diffs=True)
+            builder.to_ufo_font_attributes(builder.family_name)
+            for master in font.masters[1:]:
+                builder.to_ufo_master_glyphs({master.id})
+        self.assertRaises(
+            AssertionError,
+            captor.assertRegex, "is dangling and will be skipped")
+        with CapturingLogHandler(logger, level="WARNING") as captor:
+            builder.to_ufo_master_glyphs({font.masters[0].id})
+        captor.assertRegex("is dangling and will be skipped")
+
+
+class StreamMastersTest(_SameUfosMixin, unittest.TestCase):
+
+    def test_stream_masters(self):
+        expected = to_ufos(self.load_font())
+        builder = UFOBuilder(self.load_font())
+        actual, sources = [], []
+        for source in builder.stream_masters():
+            self.assertIsNotNone(source.font)
+            self.assertTrue(source.filename.endswith('.ufo'))
+            if sources:
+                self.assertIsNone(sources[-1].font)
+            sources.append(source)
+            actual.append(source.font)
+        self.assertIsNone(sources[-1].font)
+        self.assertSameUfos(expected, actual)
+
+        designspace = builder.designspace
+        self.assertEqual(designspace.sources, sources)
+        self.assertEqual(
+            [source.filename for source in designspace.sources],
+            [source.filename
+             for source in to_designspace(self.load_font()).sources])
+
+    def test_sources_are_built_once(self):
+        font = self.load_font()
+        font.masters[2].weight = 'Light'
+        builder = UFOBuilder(font)
+        logger = logging.getLogger("glyphsLib.builder.sources")
+        with CapturingLogHandler(logger, level="WARNING") as captor:
+            filenames = [source.filename
+                         for source in builder.stream_masters()]
+            designspace = builder.designspace
+        self.assertEqual(
+            len([r for r in captor.records
+                 if "has the same style name" in r.getMessage()]), 1)
+        self.assertEqual(
+            [source.filename for source in designspace.sources], filenames)
+
+
+class MasterFilteredBuildTest(_SameUfosMixin, unittest.TestCase):
+
+    def test_to_ufos(self):
+        logger = logging.getLogger("glyphsLib.builder.builders.UFOBuilder")
+        with CapturingLogHandler(logger, level="WARNING") as captor:
+            expected = to_ufos(self.load_font(), minimize_glyphs_diffs=True)
+        expected_warnings = {r.getMessage() for r in captor.records}
+        filename = os.path.join(
+            os.path.dirname(__file__), '..', 'data',
+            'GlyphsUnitTestSans.glyphs')
+        font = GSFont(filename, masters=['Bold'])
+        with CapturingLogHandler(logger, level="WARNING") as captor:
+            actual = to_ufos(font, minimize_glyphs_diffs=True)
+        # No warnings about the layers of the masters that were dropped
+        self.assertLessEqual({r.getMessage() for r in captor.records},
+                             expected_warnings)
+        self.assertEqual(len(actual), 1)
+        self.assertEqual(_dump_outlines(actual[0]),
+                         _dump_outlines(expected[2]))
+
+
+def _dump_outlines(ufo):
+    """Return the widths and the outlines of the glyphs of each layer."""
+    result = {}
+    for layer in ufo.layers:
+        for glyph in layer:
+            pen = RecordingPen()
+            glyph.draw(pen)
+            result[layer.name, glyph.name] = (glyph.width, pen.value)
+    return result
+
+
 class GlyphOrderTest(unittest.TestCase):
     """Check that the glyphOrder data is persisted correctly in all directions.
 
@@ -0,0 +1,119 @@
+# coding=UTF-8
+#
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import (print_function, division, absolute_import,
+                        unicode_literals)
+
+import os
+import shutil
+import tempfile
+import unittest
+# unittest.mock is only available for python 3.3+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from glyphsLib import cache
+from glyphsLib.cache import ParseCache
+from glyphsLib.classes import GSFont
+from glyphsLib.writer import dumps
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class ParseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tempdir, 'cache')
+        self.path = os.path.join(self.tempdir, 'font.glyphs')
+        shutil.copy(os.path.join(DATA, 'GlyphsUnitTestSans.glyphs'),
+                    self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def snapshots(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_warm_load(self):
+        expected = dumps(GSFont(self.path))
+        font = GSFont(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(dumps(font), expected)
+        self.assertEqual(len(self.snapshots()), 1)
+
+        font = GSFont(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(dumps(font), expected)
+        self.assertEqual(font.filepath, self.path)
+        self.assertIs(font.glyphs[0].parent, font)
+        self.assertIs(font.masters[0].font, font)
+        self.assertIs(font.glyphs['A'], font.glyphs[0])
+
+    def test_changed_file(self):
+        GSFont(self.path, cache_dir=self.cache_dir)
+        font = GSFont(self.path)
+        font.familyName = 'Changed'
+        font.save()
+        font = GSFont(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(font.familyName, 'Changed')
+        self.assertEqual(len(self.snapshots()), 2)
+
+    def test_options_are_part_of_the_key(self):
+        GSFont(self.path, cache_dir=self.cache_dir)
+        font = GSFont(self.path, compact=True, cache_dir=self.cache_dir)
+        self.assertEqual(len(self.snapshots()), 2)
+        self.assertEqual(dumps(font), dumps(GSFont(self.path)))
+
+    def test_lazy_fonts_are_not_stored(self):
+        GSFont(self.path, lazy=True, cache_dir=self.cache_dir)
+        self.assertEqual(self.snapshots(), [])
+
+    def test_unreadable_snapshot(self):
+        GSFont(self.path, cache_dir=self.cache_dir)
+        snapshot, = self.snapshots()
+        with open(os.path.join(self.cache_dir, snapshot), 'wb') as fp:
+            fp.write(b'garbage')
+        with mock.patch.object(cache.logger, 'warning') as warning:
+            font = GSFont(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(warning.call_count, 1)
+        self.assertEqual(dumps(font), dumps(GSFont(self.path)))
+        # Replaced by a new snapshot
+        self.assertEqual(self.snapshots(), [snapshot])
+        with open(os.path.join(self.cache_dir, snapshot), 'rb') as fp:
+            self.assertNotEqual(fp.read(), b'garbage')
+
+    def test_evict(self):
+        cache = ParseCache(self.cache_dir)
+        GSFont(self.path, cache_dir=self.cache_dir)
+        GSFont(self.path, compact=True, cache_dir=self.cache_dir)
+        first, second = self.snapshots()
+        first_path = os.path.join(self.cache_dir, first)
+        second_path = os.path.join(self.cache_dir, second)
+        os.utime(first_path, (1, 1))
+        cache.max_size = os.path.getsize(second_path)
+        cache.evict()
+        self.assertEqual(self.snapshots(), [second])
+        cache.max_size = 0
+        cache.evict()
+        self.assertEqual(self.snapshots(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
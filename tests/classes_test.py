@@ -22,6 +22,7 @@ import os
 import sys
 import datetime
 import copy
+import pickle
 import unittest
 import pytest
 from fontTools.misc.py23 import unicode
@@ -30,10 +31,13 @@ from glyphsLib.classes import (
     GSFont, GSFontMaster, GSInstance, GSCustomParameter, GSGlyph, GSLayer,
     GSAnchor, GSComponent, GSAlignmentZone, GSClass, GSFeature, GSAnnotation,
     GSFeaturePrefix, GSGuideLine, GSHint, GSNode, GSSmartComponentAxis,
-    GSBackgroundImage, LayerComponentsProxy, LayerGuideLinesProxy,
+    GSBackgroundImage, GSPath, LayerComponentsProxy, LayerGuideLinesProxy,
     STEM, TEXT, ARROW, CIRCLE, PLUS, MINUS
 )
 from glyphsLib.types import Point, Transform, Rect, Size
+from glyphsLib.classes import PackedNodes
+from glyphsLib.parser import LazyValue
+from glyphsLib.writer import dumps
 
 TESTFILE_PATH = os.path.join(
     os.path.dirname(__file__),
@@ -248,6 +252,37 @@ class GSFontFromFileTest(GSObjectsTestCase):
         font.masters.remove(font.masters[0])
         self.assertEqual(amount, len(font.masters))
 
+    def test_master_lookup_after_changes(self):
+        font = self.font
+        master = font.masters[1]
+        self.assertIs(font.masters[master.id], master)
+        self.assertIs(font.masterForId(master.id), master)
+        old_id = master.id
+        master.id = 'NEW-ID'
+        self.assertIsNone(font.masters[old_id])
+        self.assertIs(font.masterForId('NEW-ID'), master)
+
+        new_master = GSFontMaster()
+        font.masters.insert(0, new_master)
+        self.assertIs(font.masters[new_master.id], new_master)
+        font.masters.remove(new_master)
+        self.assertIsNone(font.masterForId(new_master.id))
+        font.masters = [master]
+        self.assertIsNone(font.masterForId(font.glyphs[0].layers[0].layerId))
+        self.assertIs(font.masters['NEW-ID'], master)
+
+    def test_master_layers_checked_once(self):
+        font = self.font
+        glyph = font.glyphs['a']
+        list(glyph.layers)
+        generation = font._mastersGeneration
+        self.assertEqual(glyph._masterLayersChecked, (font, generation))
+        font.masters.append(GSFontMaster())
+        self.assertGreater(font._mastersGeneration, generation)
+        self.assertEqual(len(glyph.layers), 5)
+        self.assertEqual(glyph._masterLayersChecked,
+                         (font, font._mastersGeneration))
+
     def test_instances(self):
         font = self.font
         amount = len(font.instances)
@@ -282,6 +317,42 @@ class GSFontFromFileTest(GSObjectsTestCase):
         self.assertEqual(by_unicode_value, by_name)
         self.assertEqual(by_unicode_value_lowercased, by_name)
 
+    def test_glyphs_lookup_after_changes(self):
+        font = self.font
+        glyph = font.glyphs['adieresis']
+        glyph.name = 'adieresis.alt'
+        self.assertIsNone(font.glyphs['adieresis'])
+        self.assertIs(font.glyphs['adieresis.alt'], glyph)
+        glyph.unicode = '00E5'
+        self.assertIsNone(font.glyphs['00E4'])
+        self.assertIs(font.glyphs['å'], glyph)
+
+        new_glyph = GSGlyph('adieresis')
+        new_glyph.unicodes = ['00E4', 'E000']
+        font.glyphs.append(new_glyph)
+        self.assertIs(font.glyphs['adieresis'], new_glyph)
+        self.assertIs(font.glyphs['ä'], new_glyph)
+        self.assertNotIn('E000', font.glyphs)
+        self.assertIn('adieresis', font.glyphs)
+
+        # The first glyph with a name wins
+        duplicate = GSGlyph('a')
+        font.glyphs.extend([duplicate])
+        self.assertIsNot(font.glyphs['a'], duplicate)
+        font.glyphs['a'].name = 'a.old'
+        self.assertIs(font.glyphs['a'], duplicate)
+
+        del font.glyphs[0]
+        self.assertIsNone(font.glyphs['A'])
+        self.assertIs(font.glyphs['adieresis'], new_glyph)
+        font.glyphs[0] = GSGlyph('B')
+        self.assertIsNone(font.glyphs['Adieresis'])
+        self.assertIs(font.glyphs['B'], font.glyphs[0])
+
+        font.glyphs = [GSGlyph('C')]
+        self.assertIsNone(font.glyphs['B'])
+        self.assertIs(font.glyphs['C'], font.glyphs[0])
+
     def test_classes(self):
         font = self.font
         font.classes = []
@@ -461,6 +532,43 @@ class GSFontFromFileTest(GSObjectsTestCase):
     # TODO: copy(font)
 
 
+class LazyGSFontFromFileTest(GSFontFromFileTest):
+    def setUp(self):
+        self.font = GSFont(TESTFILE_PATH, lazy=True)
+
+    def assertParsed(self, count):
+        parsed = [g for g in self.font._glyphs
+                  if not isinstance(g, LazyValue)]
+        self.assertEqual(len(parsed), count)
+
+    def test_glyphs_parsed_on_access(self):
+        font = self.font
+        self.assertParsed(0)
+        self.assertEqual(len(font.glyphs), 11)
+        self.assertParsed(0)
+        glyph = font.glyphs['a']
+        self.assertIsInstance(glyph, GSGlyph)
+        self.assertEqual(glyph.name, 'a')
+        self.assertEqual(glyph.parent, font)
+        self.assertEqual(glyph.layers[0].associatedMasterId,
+                         glyph.layers[0].layerId)
+        self.assertParsed(1)
+        self.assertIs(font.glyphs['a'], glyph)
+        self.assertIs(font.glyphs['0061'], glyph)
+        self.assertIs(font.glyphs['a'], glyph)
+        self.assertParsed(1)
+        self.assertEqual(font.glyphs[0].name, 'A')
+        self.assertParsed(2)
+        self.assertIsNone(font.glyphs['missing'])
+        self.assertEqual(len(font.glyphs[4:6]), 2)
+        self.assertParsed(4)
+        self.assertEqual(len(list(font.glyphs)), 11)
+        self.assertParsed(11)
+
+    def test_same_font_as_eager(self):
+        self.assertEqual(dumps(self.font), dumps(GSFont(TESTFILE_PATH)))
+
+
 class GSFontMasterFromFileTest(GSObjectsTestCase):
 
     def setUp(self):
@@ -1376,6 +1484,81 @@ class GSComponentFromFileTest(GSObjectsTestCase):
     # componentLayer()
 
 
+class SubclassedAnchor(GSAnchor):
+    """A GS class that no test creates with its constructor."""
+
+
+class GSBaseDefaultsTest(unittest.TestCase):
+
+    def test_unset_keys_are_not_stored(self):
+        master = GSFontMaster()
+        self.assertEqual(master.ascender, 800)
+        self.assertEqual(master.weight, 'Regular')
+        self.assertNotIn('ascender', vars(master))
+        self.assertNotIn('weight', vars(master))
+        master.ascender = 750
+        self.assertEqual(master.ascender, 750)
+        self.assertEqual(GSFontMaster().ascender, 800)
+
+    def test_mutable_defaults_belong_to_each_object(self):
+        first, second = GSHint(), GSHint()
+        first.settings['depth'] = 1
+        self.assertEqual(first.settings, {'depth': 1})
+        self.assertEqual(second.settings, {})
+
+    def test_defaults_of_properties(self):
+        self.assertEqual(GSGlyph().unicodes, [])
+        self.assertIsNone(GSHint().origin)
+        self.assertEqual(GSLayer().name, '')
+
+    def test_copy_without_constructor(self):
+        anchor = SubclassedAnchor.__new__(SubclassedAnchor)
+        anchor.__dict__['name'] = 'top'
+        anchor = copy.copy(anchor)
+        self.assertEqual(anchor.name, 'top')
+        self.assertEqual(anchor.position, Point(0, 0))
+
+
+class CachedProxyTest(unittest.TestCase):
+
+    def test_one_proxy_per_object(self):
+        font = GSFont(TESTFILE_PATH)
+        self.assertIs(font.glyphs, font.glyphs)
+        self.assertIs(font.masters, font.masters)
+        glyph = font.glyphs['A']
+        self.assertIs(glyph.layers, glyph.layers)
+        layer = glyph.layers[0]
+        self.assertIs(layer.paths, layer.paths)
+        self.assertIs(layer.paths[0].nodes, layer.paths[0].nodes)
+        self.assertIs(layer.userData, layer.userData)
+
+    def test_setter(self):
+        layer = GSLayer()
+        paths = layer.paths
+        layer.paths = [GSPath()]
+        self.assertEqual(len(paths), 1)
+        self.assertIs(layer.paths, paths)
+
+    def test_node_name_without_user_data(self):
+        node = GSNode()
+        self.assertIsNone(node.name)
+        self.assertNotIn('_userDataProxy', vars(node))
+        node.name = 'corner'
+        self.assertEqual(node.name, 'corner')
+        node.name = None
+        self.assertIsNone(node.name)
+
+    def test_copies_have_their_own_proxies(self):
+        layer = GSLayer()
+        layer.paths.append(GSPath())
+        layer.userData['key'] = 'value'
+        for copied in (copy.deepcopy(layer),
+                       pickle.loads(pickle.dumps(layer))):
+            self.assertIs(copied.paths._owner, copied)
+            self.assertEqual(len(copied.paths), 1)
+            self.assertEqual(copied.userData['key'], 'value')
+
+
 class GSGuideLineTest(unittest.TestCase):
 
     def test_repr(self):
@@ -1484,6 +1667,67 @@ class GSPathFromFileTest(GSObjectsTestCase):
         self.assertEqual(bounds.size.width, 289)
         self.assertEqual(bounds.size.height, 490)
 
+    def test_bounds_follow_the_nodes(self):
+        path, layer = self.path, self.layer
+        self.assertIs(path.segments, path.segments)
+        self.assertEqual(layer.bounds.origin.x, 80)
+        node = [n for n in path.nodes if n.type != GSNode.OFFCURVE][0]
+        node.position.x = -500
+        self.assertEqual(path.bounds.origin.x, -500)
+        self.assertEqual(layer.bounds.origin.x, -500)
+        node.position = Point(80, 1000)
+        bounds = layer.bounds
+        self.assertEqual(bounds.origin.x, 80)
+        self.assertEqual(bounds.origin.y + bounds.size.height, 1000)
+
+    def test_segments_follow_the_nodes(self):
+        path = self.path
+        segments = path.segments
+        path.nodes[0].type = GSNode.LINE
+        self.assertIsNot(path.segments, segments)
+        segments = path.segments
+        path.nodes.append(GSNode((0, 0)))
+        self.assertIsNot(path.segments, segments)
+        segments = path.segments
+        del path.nodes[-1]
+        self.assertIsNot(path.segments, segments)
+
+    def test_layer_bounds_follow_the_paths(self):
+        layer = self.layer
+        self.assertEqual(layer.bounds.origin.y, -10)
+        path = GSPath()
+        path.nodes = [GSNode((100, -300)), GSNode((200, -300)),
+                      GSNode((200, -200))]
+        layer.paths.append(path)
+        self.assertEqual(layer.bounds.origin.y, -300)
+        del layer.paths[-1]
+        self.assertEqual(layer.bounds.origin.y, -10)
+
+    def test_applyTransform(self):
+        path = self.path
+        path.applyTransform((2, 0, 0, 0.5, 10, -20))
+        bounds = path.bounds
+        self.assertEqual(bounds.origin.x, 170)
+        self.assertEqual(bounds.origin.y, -25)
+        self.assertEqual(bounds.size.width, 578)
+        self.assertEqual(bounds.size.height, 245)
+        self.assertEqual(self.layer.bounds.origin.y, -25)
+
+    def test_applyTransform_skews(self):
+        path = self.path
+        x, y = path.nodes[0].position
+        path.applyTransform(Transform(1, 0, 0.5, 1, 0, 0))
+        self.assertEqual(tuple(path.nodes[0].position), (x + 0.5 * y, y))
+
+    def test_bounds_of_curves_with_two_extrema(self):
+        path = GSPath()
+        path.nodes = [GSNode((100, 0), 'offcurve'),
+                      GSNode((-100, 100), 'offcurve'),
+                      GSNode((0, 100), 'curve')]
+        bounds = path.bounds
+        self.assertAlmostEqual(bounds.origin.x, -50 / 3 ** 0.5)
+        self.assertAlmostEqual(bounds.size.width, 100 / 3 ** 0.5)
+
 class GSNodeFromFileTest(GSObjectsTestCase):
 
     def setUp(self):
@@ -1538,6 +1782,96 @@ class GSNodeFromFileTest(GSObjectsTestCase):
         self.assertEqual(oldConnection, not self.node.smooth)
 
 
+class CompactGSPathFromFileTest(GSPathFromFileTest):
+
+    def setUp(self):
+        self.font = GSFont(TESTFILE_PATH, compact=True)
+        self.glyph = self.font.glyphs["a"]
+        self.layer = self.glyph.layers[0]
+        self.path = self.layer.paths[0]
+
+    def test_compact(self):
+        self.assertIsInstance(self.path._nodes, PackedNodes)
+        self.path.nodes = list(self.path.nodes)
+        self.assertIsInstance(self.path._nodes, PackedNodes)
+        self.path.reverse()
+        self.assertIsInstance(self.path._nodes, PackedNodes)
+
+    def test_same_font(self):
+        self.assertEqual(dumps(self.font), dumps(GSFont(TESTFILE_PATH)))
+
+    def test_nodes(self):
+        # Nodes that are added are copied
+        path = self.path
+        self.assertEqual(len(path.nodes), 44)
+        for node in path.nodes:
+            self.assertEqual(node.parent, path)
+        newNode = GSNode(Point("{100, 100}"), GSNode.CURVE, smooth=True)
+        newNode.name = 'new'
+        path.nodes.append(newNode)
+        self.assertEqual(repr(newNode), repr(path.nodes[-1]))
+        self.assertEqual(path.nodes[-1].name, 'new')
+        path.nodes.insert(0, path.nodes[-1])
+        self.assertEqual(repr(newNode), repr(path.nodes[0]))
+        self.assertEqual(path.nodes[0].name, 'new')
+        self.assertEqual(path.nodes[-1].name, 'new')
+        path.nodes.remove(path.nodes[0])
+        self.assertEqual(path.nodes[0].name, 'Hello')
+        popped = path.nodes.pop(-1)
+        self.assertEqual(type(popped), GSNode)
+        self.assertEqual(repr(popped), repr(newNode))
+        self.assertEqual(popped.name, 'new')
+        self.assertEqual(len(path.nodes), 44)
+
+    def test_segments(self):
+        oldSegments = self.path.segments
+        self.assertEqual(len(self.path.segments), 20)
+        self.path.reverse()
+        self.assertEqual(len(self.path.segments), 20)
+        self.assertEqual(repr(oldSegments[0].nodes[0]),
+                         repr(self.path.segments[0].nodes[0]))
+
+
+class CompactGSNodeFromFileTest(GSNodeFromFileTest):
+
+    def setUp(self):
+        self.font = GSFont(TESTFILE_PATH, compact=True)
+        self.glyph = self.font.glyphs["a"]
+        self.layer = self.glyph.layers[0]
+        self.path = self.layer.paths[0]
+        self.node = self.path.nodes[0]
+
+    def test_changes_are_stored(self):
+        node = self.path.nodes[1]
+        node.position.x = 12
+        node.position[1] = 34
+        node.type = GSNode.QCURVE
+        node.smooth = True
+        node.userData["key"] = "value"
+        node = self.path.nodes[1]
+        self.assertEqual(tuple(node.position), (12, 34))
+        self.assertEqual(node.type, GSNode.QCURVE)
+        self.assertTrue(node.smooth)
+        self.assertEqual(node.userData["key"], "value")
+        node.position = Point(1, 2)
+        self.assertEqual(tuple(self.path.nodes[1].position), (1, 2))
+
+    def test_nextNode(self):
+        self.assertIsInstance(self.path.nodes[-1].nextNode, GSNode)
+        self.assertEqual(self.path.nodes[-1].nextNode, self.path.nodes[0])
+
+    def test_prevNode(self):
+        self.assertIsInstance(self.path.nodes[0].prevNode, GSNode)
+        self.assertEqual(self.path.nodes[0].prevNode, self.path.nodes[-1])
+
+    def test_makeNodeFirst(self):
+        oldAmount = len(self.path.nodes)
+        oldSecondNode = repr(self.path.nodes[3])
+        self.path.nodes[3].makeNodeFirst()
+        self.assertEqual(oldAmount, len(self.path.nodes))
+        self.assertEqual(oldSecondNode, repr(self.path.nodes[0]))
+
+
 class GSCustomParameterTest(unittest.TestCase):
 
     def test_plistValue_string(self):
@@ -0,0 +1,121 @@
+# coding=UTF-8
+#
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import (
+    print_function, division, absolute_import, unicode_literals)
+
+import os
+import unittest
+
+from glyphsLib import geometry
+from glyphsLib.classes import GSFont, GSNode, GSPath
+
+TESTFILE_PATH = os.path.join(
+    os.path.dirname(__file__),
+    os.path.join('data', 'GlyphsUnitTestSans.glyphs')
+)
+
+
+def rect_values(rect):
+    if rect is None:
+        return None
+    return (rect.origin.x, rect.origin.y, rect.size.width, rect.size.height)
+
+
+def font_paths(font):
+    return [path for glyph in font.glyphs for layer in glyph.layers
+            for path in layer.paths]
+
+
+class PythonGeometryTest(unittest.TestCase):
+    engine = 'python'
+    compact = False
+
+    def setUp(self):
+        self.font = GSFont(TESTFILE_PATH, compact=self.compact)
+        # The reference: the bounds of the GS objects
+        self.expected = GSFont(TESTFILE_PATH, compact=self.compact)
+
+    def test_paths_bounds(self):
+        paths = font_paths(self.font)
+        self.assertEqual(
+            geometry.paths_bounds(paths, self.engine),
+            [rect_values(path.bounds) for path in font_paths(self.expected)])
+        # The bounds stay cached in the paths
+        self.assertEqual([rect_values(path.bounds) for path in paths],
+                         geometry.paths_bounds(paths, self.engine))
+
+    def test_font_bounds(self):
+        bounds = geometry.font_bounds(self.font, self.engine)
+        self.assertEqual(list(bounds), [g.name for g in self.font.glyphs])
+        for glyph in self.expected.glyphs:
+            self.assertEqual(
+                [rect_values(rect) for rect in bounds[glyph.name]],
+                [rect_values(layer.bounds) for layer in glyph.layers])
+
+    def test_layers_bounds_follow_the_nodes(self):
+        layer = self.font.glyphs['a'].layers[0]
+        geometry.layers_bounds([layer], self.engine)
+        layer.paths[0].nodes[0].position = (-1000, -1000)
+        bounds = geometry.layers_bounds([layer], self.engine)[0]
+        self.assertEqual((bounds.origin.x, bounds.origin.y), (-1000, -1000))
+
+    def test_transform_paths(self):
+        matrix = (0.9, 0.1, -0.2, 1.1, 10.5, -3)
+        paths = font_paths(self.font)
+        geometry.paths_bounds(paths, self.engine)
+        geometry.transform_paths(paths, matrix, self.engine)
+        expected = font_paths(self.expected)
+        for path in expected:
+            path.applyTransform(matrix)
+        for path, expected_path in zip(paths, expected):
+            self.assertEqual(
+                [tuple(node.position) for node in path.nodes],
+                [tuple(node.position) for node in expected_path.nodes])
+        # The cached bounds are those of the new nodes
+        self.assertEqual(geometry.paths_bounds(paths, self.engine),
+                         [rect_values(path.bounds) for path in expected])
+
+    def test_short_paths(self):
+        path = GSPath()
+        path.nodes = [GSNode((0, 0)), GSNode((100, 50))]
+        empty = GSPath()
+        self.assertEqual(geometry.paths_bounds([path], self.engine),
+                         [(0, 0, 100, 50)])
+        with self.assertRaises(TypeError):
+            geometry.paths_bounds([empty], self.engine)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            geometry.paths_bounds([], 'fortran')
+
+
+class CompactPythonGeometryTest(PythonGeometryTest):
+    compact = True
+
+
+@unittest.skipIf(geometry.numpy is None, "NumPy is not installed")
+class NumpyGeometryTest(PythonGeometryTest):
+    engine = 'numpy'
+
+
+@unittest.skipIf(geometry.numpy is None, "NumPy is not installed")
+class CompactNumpyGeometryTest(NumpyGeometryTest):
+    compact = True
+
+
+if __name__ == '__main__':
+    unittest.main()
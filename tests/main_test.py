@@ -22,6 +22,7 @@ import subprocess
 import os
 import glob
 
+import glyphsLib
 import glyphsLib.__main__
 import glyphsLib.parser
 
@@ -39,6 +40,35 @@ def test_glyphs_main_masters(tmpdir):
     assert glob.glob(master_dir + '/*.ufo')
 
 
+def test_build_masters_stream(tmpdir):
+    filename = os.path.join(
+        os.path.dirname(__file__), 'data/GlyphsUnitTestSans.glyphs')
+    results = {}
+    for stream in (False, True):
+        master_dir = os.path.join(str(tmpdir), str(stream), 'masters')
+        instance_dir = os.path.join(str(tmpdir), str(stream), 'instances')
+        results[stream] = glyphsLib.build_masters(
+            filename, master_dir, instance_dir, stream=stream)
+    ufos, designspace_path, _ = results[False]
+    paths, stream_designspace_path, _ = results[True]
+
+    assert paths == [
+        os.path.join(os.path.dirname(stream_designspace_path),
+                     os.path.basename(ufo.path))
+        for ufo in ufos]
+    with open(designspace_path) as fp:
+        expected = fp.read()
+    with open(stream_designspace_path) as fp:
+        assert fp.read() == expected
+    for ufo, path in zip(ufos, paths):
+        for name in ('fontinfo.plist', 'groups.plist', 'kerning.plist',
+                     'features.fea', 'glyphs/A_.glif'):
+            with open(os.path.join(ufo.path, name)) as fp:
+                expected = fp.read()
+            with open(os.path.join(path, name)) as fp:
+                assert fp.read() == expected
+
+
 def test_glyphs_main_instances(tmpdir):
     filename = os.path.join(
         os.path.dirname(__file__), 'data/GlyphsUnitTestSans.glyphs')
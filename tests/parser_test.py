@@ -19,11 +19,21 @@ from __future__ import (print_function, division, absolute_import,
                         unicode_literals)
 
 from collections import OrderedDict
+from io import open, BytesIO, StringIO
+import os
+import shutil
+import tempfile
 import unittest
 import datetime
 
-from glyphsLib.parser import Parser
-from glyphsLib.classes import GSGlyph
+import glyphsLib.parser
+from glyphsLib.parser import (
+    Parser, load, iterparse, _c_next_token, _py_next_token,
+    _c_next_bytes_token, _py_next_bytes_token, _skip_value)
+from glyphsLib.classes import GSFont, GSGlyph, GSPath
+from glyphsLib.writer import dumps
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
 
 GLYPH_DATA = '''\
 (
@@ -40,8 +50,10 @@ unicode = 0041;
 
 
 class ParserTest(unittest.TestCase):
+    engine = 'regex'
+
     def run_test(self, text, expected):
-        parser = Parser()
+        parser = Parser(engine=self.engine)
         self.assertEqual(parser.parse(text), OrderedDict(expected))
 
     def test_parse(self):
@@ -149,11 +161,399 @@ class ParserTest(unittest.TestCase):
         )
 
 
+class FastParserTest(ParserTest):
+    engine = 'fast'
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            Parser(engine='turbo')
+
+    def test_compact_requires_fast_engine(self):
+        with self.assertRaises(ValueError):
+            Parser(engine='regex', compact=True)
+
+    def test_missing_list_delimiter(self):
+        with self.assertRaises(ValueError):
+            self.run_test('{mylist=(1 2);}', [])
+
+    def test_same_font_as_regex_engine(self):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            path = os.path.join(
+                os.path.dirname(__file__), 'data', filename)
+            with open(path, encoding='utf-8') as fp:
+                text = fp.read()
+            expected = Parser(GSFont, engine='regex').parse(text)
+            actual = Parser(GSFont, engine='fast').parse(text)
+            self.assertEqual(dumps(expected), dumps(actual))
+            actual = Parser(GSFont, engine='fast').parse(text.encode('utf-8'))
+            self.assertEqual(dumps(expected), dumps(actual))
+
+    def test_nodes(self):
+        text = (
+            '({closed = 1; nodes = (\n"1 2 LINE",\n'
+            '"3.5 -4 OFFCURVE",'
+            '"5 6 CURVE SMOOTH {name = \\"Don\\U2019t\\";}" ,'
+            '\t"-7 8e1 QCURVE SMOOTH"\n);}, {nodes = ();})')
+        expected = [dumps(path) for path in
+                    Parser(GSPath, engine='regex').parse(text)]
+        for compact in (False, True):
+            parser = Parser(GSPath, engine='fast', compact=compact)
+            for source in (text, text.encode('utf-8')):
+                paths = parser.parse(source)
+                self.assertEqual([dumps(path) for path in paths], expected)
+                self.assertEqual(paths[0].nodes[2].name, 'Don’t')
+                self.assertIs(paths[0].nodes[0].parent, paths[0])
+        with self.assertRaises(ValueError):
+            Parser(GSPath, engine='fast').parse(
+                '({nodes = ("1 2 LINE" "3 4 LINE");})')
+
+    def test_same_untyped_values_as_regex_engine(self):
+        values = ['1', '-2', '3.5', '.5', '6.', '-7.25e-2', '1e3', 'A.alt',
+                  '1.2.3', 'e5', '-', '.', 'inf', '-inf', 'Infinity',
+                  '-Infinity', 'nan', '0x10', '_1', '$1']
+        text = '{%s}' % ''.join(
+            'key%d = %s;' % (n, value) for n, value in enumerate(values))
+        expected = Parser(engine='regex').parse(text)
+        actual = Parser(engine='fast').parse(text)
+        self.assertEqual(repr(actual), repr(expected))
+
+    def test_error_in_bytes(self):
+        with self.assertRaises(ValueError) as context:
+            self.run_test(b'{mystr="\xe2\x80\x99"; @}', [])
+        self.assertIn('@}', str(context.exception))
+
+
+class PythonTokenizerParserTest(FastParserTest):
+    next_token = staticmethod(_py_next_token)
+    next_bytes_token = staticmethod(_py_next_bytes_token)
+
+    def setUp(self):
+        self._next_token = glyphsLib.parser._next_token
+        self._next_bytes_token = glyphsLib.parser._next_bytes_token
+        glyphsLib.parser._next_token = self.next_token
+        glyphsLib.parser._next_bytes_token = self.next_bytes_token
+
+    def tearDown(self):
+        glyphsLib.parser._next_token = self._next_token
+        glyphsLib.parser._next_bytes_token = self._next_bytes_token
+
+
+@unittest.skipIf(_c_next_token is None, "C tokenizer is not compiled")
+class CTokenizerParserTest(PythonTokenizerParserTest):
+    next_token = staticmethod(_c_next_token)
+    next_bytes_token = staticmethod(_c_next_bytes_token)
+
+
+@unittest.skipIf(_c_next_token is None, "C tokenizer is not compiled")
+class TokenizerTest(unittest.TestCase):
+
+    def assertSameTokens(self, text):
+        for expected_next_token, next_token, data in (
+                (_py_next_token, _c_next_token, text),
+                (_py_next_bytes_token, _c_next_bytes_token,
+                 text.encode('utf-8'))):
+            i = 0
+            while True:
+                expected = expected_next_token(data, i)
+                self.assertEqual(next_token(data, i), expected)
+                if expected is None:
+                    break
+                i = expected[3]
+
+    def test_tokens(self):
+        for text in ('{myval=1; mylist=(1,2,3);}',
+                     '{mystr="a\\"s\\077d\\U2019f\\x";}',
+                     '{key = <48616c6c6f>;}',
+                     '{UUID0 = "{0.5, 0.5}";}',
+                     '{unterminated = "abc',
+                     '{myval=@unexpected;}',
+                     '{mystr="Don’t \\"crash\\" \\U2019";}',
+                     '  \n\t '):
+            self.assertSameTokens(text)
+
+    def test_odd_length_hex_data(self):
+        with self.assertRaises(ValueError):
+            _py_next_token('<486>', 0)
+        with self.assertRaises(ValueError):
+            _c_next_token('<486>', 0)
+        with self.assertRaises(ValueError):
+            _c_next_bytes_token(b'<486>', 0)
+
+    def test_data_files(self):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            path = os.path.join(
+                os.path.dirname(__file__), 'data', filename)
+            with open(path, encoding='utf-8') as fp:
+                self.assertSameTokens(fp.read())
+
+
+class IterparseTest(unittest.TestCase):
+
+    def iterparse(self, fp, chunk_size=2 ** 16):
+        events, glyphs = [], []
+        for event, obj in iterparse(fp, chunk_size):
+            events.append(event)
+            if event == 'glyph':
+                self.assertIsInstance(obj, GSGlyph)
+                glyphs.append(obj)
+            else:
+                self.assertIsInstance(obj, GSFont)
+                font = obj
+        return events, font, glyphs
+
+    def test_events(self):
+        path = os.path.join(DATA, 'GlyphsUnitTestSans.glyphs')
+        with open(path, encoding='utf-8') as fp:
+            events, font, glyphs = self.iterparse(fp)
+        self.assertEqual(events, ['font'] + ['glyph'] * 11 + ['end'])
+        self.assertEqual(len(font.glyphs), 0)
+        self.assertEqual(len(font.masters), 3)
+        self.assertEqual(glyphs[0].name, 'A')
+        self.assertIs(glyphs[0].parent, font)
+        self.assertIs(glyphs[0].layers[0].parent, glyphs[0])
+
+    def test_same_font_as_load(self):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            path = os.path.join(DATA, filename)
+            expected = dumps(GSFont(path))
+            for mode, chunk_size in (('r', 2 ** 16), ('r', 7), ('rb', 5)):
+                with open(path, mode) as fp:
+                    _, font, glyphs = self.iterparse(fp, chunk_size)
+                font.glyphs.extend(glyphs)
+                self.assertEqual(dumps(font), expected)
+
+    def test_no_glyphs(self):
+        events, font, glyphs = self.iterparse(
+            StringIO('{familyName = "Empty";}'))
+        self.assertEqual(events, ['font', 'end'])
+        self.assertEqual(font.familyName, 'Empty')
+        events, font, glyphs = self.iterparse(
+            BytesIO(b'{glyphs = (); unitsPerEm = 1000;}'), 4)
+        self.assertEqual(events, ['font', 'end'])
+        self.assertEqual(font.upm, 1000)
+
+    def test_truncated_file(self):
+        with self.assertRaises(ValueError):
+            self.iterparse(StringIO('{glyphs = ({glyphname = A;},'), 4)
+        with self.assertRaises(ValueError):
+            self.iterparse(StringIO('{familyName = "Unterminated'), 4)
+
+    def test_trailing_content(self):
+        with self.assertRaises(ValueError):
+            self.iterparse(StringIO('{glyphs = ();}' + ' ' * 20 + 'x'), 4)
+
+    def test_skip_value(self):
+        self.assertEqual(_skip_value('a = 1;', 4), 5)
+        self.assertEqual(_skip_value('{a = (1, "}", 2);}, ', 0), 18)
+        self.assertEqual(_skip_value('{a = "\\";"}', 0), -1)
+        self.assertEqual(_skip_value('(1, 2)', 1), 2)
+        self.assertEqual(_skip_value('{a = (1, 2', 0), -1)
+        self.assertEqual(_skip_value(b'{a = (1, "}", 2);}, ', 0), 18)
+        self.assertEqual(_skip_value(b'{a = "\\";"}', 0), -1)
+
+
+class BytesTokenizerTest(unittest.TestCase):
+
+    def test_same_tokens_as_text(self):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            with open(os.path.join(DATA, filename), encoding='utf-8') as fp:
+                text = fp.read()
+            data = text.encode('utf-8')
+            i = j = 0
+            while True:
+                expected = _py_next_token(text, i)
+                token = _py_next_bytes_token(data, j)
+                if expected is None:
+                    self.assertIsNone(token)
+                    break
+                self.assertEqual(token[:2], expected[:2])
+                # Positions are byte offsets
+                self.assertEqual(data[token[2]:token[3]].decode('utf-8'),
+                                 text[expected[2]:expected[3]])
+                i, j = expected[3], token[3]
+
+
+class MemoryMapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_same_font_as_text(self):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            path = os.path.join(DATA, filename)
+            with open(path, encoding='utf-8') as fp:
+                expected = dumps(glyphsLib.loads(fp.read()))
+            self.assertEqual(dumps(GSFont(path)), expected)
+            self.assertEqual(dumps(GSFont(path, lazy=True)), expected)
+            for mode in ('r', 'rb'):
+                with open(path, mode) as fp:
+                    self.assertEqual(dumps(load(fp)), expected)
+                    self.assertFalse(fp.read())
+
+    def test_file_objects_that_cannot_be_mapped(self):
+        text = '{familyName = "Café";}'
+        for fp in (StringIO(text), BytesIO(text.encode('utf-8'))):
+            self.assertEqual(load(fp).familyName, 'Café')
+        path = os.path.join(self.tempdir, 'font.glyphs')
+        with open(path, 'w', encoding='latin-1') as fp:
+            fp.write(text)
+        with open(path, encoding='latin-1') as fp:
+            self.assertEqual(load(fp).familyName, 'Café')
+        with open(path, 'w', encoding='utf-8') as fp:
+            fp.write('  ' + text)
+        with open(path, encoding='utf-8') as fp:
+            fp.read(2)
+            self.assertEqual(load(fp).familyName, 'Café')
+
+    def test_empty_file(self):
+        path = os.path.join(self.tempdir, 'font.glyphs')
+        open(path, 'w').close()
+        with self.assertRaises(ValueError):
+            GSFont(path)
+
+    def test_save_lazy_font_to_same_path(self):
+        path = os.path.join(self.tempdir, 'font.glyphs')
+        shutil.copy(os.path.join(DATA, 'GlyphsUnitTestSans.glyphs'), path)
+        expected = dumps(GSFont(path))
+        font = GSFont(path, lazy=True)
+        font.save()
+        self.assertEqual(dumps(font), expected)
+        self.assertEqual(dumps(GSFont(path)), expected)
+
+
+class ParallelParseTest(unittest.TestCase):
+
+    def assertSameFontAsLoad(self, workers):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            path = os.path.join(DATA, filename)
+            with open(path, 'rb') as fp:
+                expected = dumps(load(fp))
+            with open(path, 'rb') as fp:
+                font = load(fp, workers=workers)
+            self.assertEqual(dumps(font), expected)
+            for glyph in font.glyphs:
+                self.assertIs(glyph.parent, font)
+                self.assertIs(glyph.layers[0].parent, glyph)
+            self.assertIs(font.glyphs['A'], font.glyphs[0])
+
+    def test_load(self):
+        self.assertSameFontAsLoad(2)
+        self.assertSameFontAsLoad(None)
+
+    def test_workers_that_are_not_forked(self):
+        workers_are_forked = glyphsLib.parser.workers_are_forked
+        glyphsLib.parser.workers_are_forked = lambda: False
+        try:
+            self.assertSameFontAsLoad(3)
+        finally:
+            glyphsLib.parser.workers_are_forked = workers_are_forked
+
+    def test_loads(self):
+        text = '{familyName = "Few"; glyphs = ({glyphname = a;});}'
+        font = glyphsLib.loads(text, workers=4)
+        self.assertEqual([glyph.name for glyph in font.glyphs], ['a'])
+        font = glyphsLib.loads(text.replace('{glyphname = a;}', ''),
+                               workers=4)
+        self.assertEqual(len(font.glyphs), 0)
+
+
+class SelectiveParseTest(unittest.TestCase):
+
+    def setUp(self):
+        path = os.path.join(DATA, 'GlyphsUnitTestSans.glyphs')
+        with open(path, 'rb') as fp:
+            self.text = fp.read()
+        self.font = glyphsLib.loads(self.text)
+
+    def test_only(self):
+        font = glyphsLib.loads(self.text, only=("fontMaster", "kerning"))
+        self.assertEqual(len(font.glyphs), 0)
+        self.assertEqual(len(font.instances), 0)
+        self.assertEqual(font.familyName, "Unnamed font")
+        self.assertEqual([dumps(m) for m in font.masters],
+                         [dumps(m) for m in self.font.masters])
+        self.assertEqual(font.kerning, self.font.kerning)
+
+    def test_skip(self):
+        font = glyphsLib.loads(self.text, skip=("glyphs",))
+        self.assertEqual(len(font.glyphs), 0)
+        self.font.glyphs = []
+        self.assertEqual(dumps(font), dumps(self.font))
+
+    def test_load(self):
+        path = os.path.join(DATA, 'GlyphsUnitTestSans.glyphs')
+        for workers in (1, 2):
+            with open(path, 'rb') as fp:
+                font = load(fp, workers=workers, skip=("instances",))
+            self.assertEqual(len(font.instances), 0)
+            self.assertEqual(len(font.glyphs), len(self.font.glyphs))
+
+    def test_only_and_skip(self):
+        with self.assertRaises(ValueError):
+            glyphsLib.loads(self.text, only=("glyphs",), skip=("glyphs",))
+
+
+class MasterFilteredParseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(DATA, 'GlyphsUnitTestSans.glyphs')
+        self.font = GSFont(self.path)
+        self.bold = self.font.masters[2]
+
+    def assertOnlyBold(self, font):
+        self.assertEqual([dumps(master) for master in font.masters],
+                         [dumps(self.bold)])
+        for glyph, expected_glyph in zip(font.glyphs, self.font.glyphs):
+            self.assertEqual(
+                [dumps(layer) for layer in glyph.layers],
+                [dumps(layer) for layer in expected_glyph.layers
+                 if (layer.associatedMasterId or layer.layerId) ==
+                 self.bold.id])
+            self.assertIs(glyph.layers[self.bold.id].parent, glyph)
+
+    def test_by_id_or_name(self):
+        self.assertOnlyBold(GSFont(self.path, masters=[self.bold.id]))
+        self.assertOnlyBold(GSFont(self.path, masters=['Bold']))
+        self.assertOnlyBold(GSFont(self.path, lazy=True, masters=['Bold']))
+
+    def test_load(self):
+        for workers in (1, 2):
+            with open(self.path, 'rb') as fp:
+                self.assertOnlyBold(
+                    load(fp, workers=workers, masters=['Bold']))
+
+    def test_all_masters(self):
+        names = [master.name for master in self.font.masters]
+        font = GSFont(self.path, masters=names)
+        self.assertEqual(dumps(font), dumps(self.font))
+
+    def test_unknown_master(self):
+        with self.assertRaises(ValueError):
+            GSFont(self.path, masters=['Black'])
+
+    def test_masters_after_glyphs(self):
+        text = ('{glyphs = ({glyphname = a; layers = ();});'
+                'fontMaster = ({id = m;});}')
+        with self.assertRaises(ValueError):
+            glyphsLib.loads(text, masters=['m'])
+
+
 class ParserGlyphTest(unittest.TestCase):
+    engine = 'regex'
+
     def test_parse_empty_glyphs(self):
         # data = '({glyphname="A";})'
         data = '({})'
-        parser = Parser(GSGlyph)
+        parser = Parser(GSGlyph, engine=self.engine)
         result = parser.parse(data)
         self.assertEqual(len(result), 1)
         glyph = result[0]
@@ -184,7 +584,7 @@ class ParserGlyphTest(unittest.TestCase):
 
     def test_parse_glyphs(self):
         data = GLYPH_DATA
-        parser = Parser(GSGlyph)
+        parser = Parser(GSGlyph, engine=self.engine)
         result = parser.parse(data)
         glyph = result[0]
         self.assertEqual(glyph.name, "A")
@@ -196,5 +596,9 @@ class ParserGlyphTest(unittest.TestCase):
         self.assertEqual(glyph.unicode, "0041")
 
 
+class FastParserGlyphTest(ParserGlyphTest):
+    engine = 'fast'
+
+
 if __name__ == '__main__':
     unittest.main()
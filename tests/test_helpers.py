@@ -34,13 +34,13 @@ from ufonormalizer import normalizeUFO
 import defcon
 
 
-def write_to_lines(glyphs_object):
+def write_to_lines(glyphs_object, engine='stream'):
     """
     Use the Writer to write the given object to a UnicodeIO.
     Return an array of lines ready for diffing.
     """
     string = UnicodeIO()
-    writer = Writer(string)
+    writer = Writer(string, engine=engine)
     writer.write(glyphs_object)
     return string.getvalue().splitlines()
 
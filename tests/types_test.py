@@ -18,9 +18,12 @@ from __future__ import (
     print_function, division, absolute_import, unicode_literals)
 
 import datetime
+import random
 import unittest
 
-from glyphsLib.types import Transform, parse_datetime, parse_color
+from glyphsLib.types import (
+    Point, Rect, Transform, UnicodesList, parse_datetime, parse_color, floatToString, floatsToStrings,
+    _floatToString)
 
 
 class GlyphsDateTimeTest(unittest.TestCase):
@@ -63,6 +66,51 @@ class TransformTest(unittest.TestCase):
         assert Transform(1, 0, 0, 1, 0, 0) == Transform(1, 0, 0, 1, 0, 0)
         assert Transform(1, 0, 0, 1, 0, 0) == Transform(1.0, 0, 0, 1.0, 0, 0)
 
+    def test_read_write(self):
+        transform = Transform('"{1, 0.5, 0, 1, 120, -5.5}"')
+        self.assertEqual(transform.value, [1, 0.5, 0, 1, 120, -5.5])
+        self.assertEqual(transform.plistValue(),
+                         '"{1, 0.5, 0, 1, 120, -5.5}"')
+        self.assertEqual(Transform().value, [0] * 6)
+        self.assertRaises(ValueError, Transform, '{1, 0}')
+
+
+class PointTest(unittest.TestCase):
+    def test_read_write(self):
+        point = Point('{123.5, -20}')
+        self.assertEqual((point.x, point.y), (123.5, -20))
+        self.assertEqual(point.plistValue(), '"{123.5, -20}"')
+        self.assertEqual(Point(1, 2), Point([1, 2]))
+        self.assertEqual(Point(1, 2), Point((1, 2)))
+        self.assertEqual(Point().value, [0, 0])
+        self.assertRaises(ValueError, Point, '{1, 2, 3}')
+
+    def test_defaults_are_not_shared(self):
+        first, second = Point(), Point()
+        first.x = 5
+        self.assertEqual(second.x, 0)
+
+    def test_no_instance_dict(self):
+        for value in (Point(1, 2), Rect(), Transform(), UnicodesList()):
+            self.assertFalse(hasattr(value, '__dict__'))
+
+
+class RectTest(unittest.TestCase):
+    def test_read_write(self):
+        rect = Rect('"{{10, 20.5}, {300, 400}}"')
+        self.assertEqual(rect.value, [10, 20.5, 300, 400])
+        self.assertEqual(rect.plistValue(), '"{{10, 20.5}, {300, 400}}"')
+        self.assertEqual(Rect(Point(10, 20.5), Point(300, 400)), rect)
+
+    def test_origin_and_size_write_back(self):
+        rect = Rect(Point(10, 20), Point(300, 400))
+        origin, size = rect.origin, rect.size
+        self.assertEqual((origin.x, origin.y), (10, 20))
+        self.assertEqual((size.width, size.height), (300, 400))
+        origin.y = 25
+        size.width = 310
+        self.assertEqual(rect.value, [10, 25, 310, 400])
+
 
 class ColorTest(unittest.TestCase):
     def test_color_parsing(self):
@@ -83,5 +131,48 @@ class ColorTest(unittest.TestCase):
             self.assertRaises(ValueError, parse_color, value)
 
 
+class FloatToStringTest(unittest.TestCase):
+
+    def random_values(self, count):
+        rng = random.Random(20)
+        for _ in range(count):
+            kind = rng.randrange(6)
+            if kind == 0:
+                yield float(rng.randint(-5000, 5000))
+            elif kind == 1:
+                yield round(rng.uniform(-2000, 2000), rng.randint(0, 7))
+            elif kind == 2:
+                yield rng.randint(-10 ** 6, 10 ** 6)
+            elif kind == 3:
+                # Around the thresholds of each precision
+                yield rng.randint(-2000, 2000) + rng.choice([
+                    0.5, 0.05, 0.005, 0.0005, 0.00005, 0.000005, 0.95, 0.995,
+                    0.9995, 0.99995, 0.999995, 1e-7, 1 - 1e-7])
+            elif kind == 4:
+                yield rng.uniform(-1, 1) * 10 ** rng.randint(-8, 12)
+            else:
+                yield rng.choice([0.0, -0.0, 1e9, -1e9, 1e9 - 0.5,
+                                  999999999.99999, 123456.123455, 2.5e-6])
+
+    def test_same_as_slow_path(self):
+        values = list(self.random_values(100000))
+        for precision in (0, 1, 3, 5):
+            expected = [_floatToString(value, precision) for value in values]
+            self.assertEqual(
+                [floatToString(value, precision) for value in values],
+                expected)
+            # Again, from the cache
+            self.assertEqual(floatsToStrings(values, precision), expected)
+
+    def test_examples(self):
+        self.assertEqual(floatToString(1.0), '1')
+        self.assertEqual(floatToString(-0.0), '-0')
+        self.assertEqual(floatToString(12), '12')
+        self.assertEqual(floatToString(0.5), '0.5')
+        self.assertEqual(floatToString(1.23456), '1.235')
+        self.assertEqual(floatToString(1.23456, 5), '1.23456')
+        self.assertEqual(floatToString(1.000001, 5), '1')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -18,27 +18,35 @@ import unittest
 import math
 from textwrap import dedent
 from collections import OrderedDict
+import io
 import os
+import shutil
+import tempfile
 
-from fontTools.misc.py23 import UnicodeIO
+from fontTools.misc.py23 import BytesIO, UnicodeIO
 
 import glyphsLib
+import glyphsLib.writer
 from glyphsLib import classes
 from glyphsLib.types import parse_datetime, Point, Rect
-from glyphsLib.writer import dump, dumps
+from glyphsLib.writer import Writer, _FastWriter, dump, dumps
 from glyphsLib.parser import Parser
 
 from . import test_helpers
 
 
 class WriterTest(unittest.TestCase, test_helpers.AssertLinesEqual):
+    engine = 'stream'
+
+    def write_to_lines(self, glyphs_object):
+        return test_helpers.write_to_lines(glyphs_object, self.engine)
 
     def assertWrites(self, glyphs_object, text):
         """Assert that the given object, when given to the writer,
         produces the given text.
         """
         expected = text.splitlines()
-        actual = test_helpers.write_to_lines(glyphs_object)
+        actual = self.write_to_lines(glyphs_object)
         self.assertLinesEqual(
             expected, actual,
             "The writer has not produced the expected output")
@@ -51,7 +59,7 @@ class WriterTest(unittest.TestCase, test_helpers.AssertLinesEqual):
         }}
         """).format(text).splitlines()
         # We wrap the value in a dict to use the same test helper
-        actual = test_helpers.write_to_lines({'writtenValue': glyphs_value})
+        actual = self.write_to_lines({'writtenValue': glyphs_value})
         self.assertLinesEqual(
             expected, actual,
             "The writer has not produced the expected output")
@@ -241,13 +249,13 @@ class WriterTest(unittest.TestCase, test_helpers.AssertLinesEqual):
 
         # Don't write the keyboardIncrement if it's 1 (default)
         font.keyboardIncrement = 1
-        written = test_helpers.write_to_lines(font)
+        written = self.write_to_lines(font)
         self.assertFalse(any("keyboardIncrement" in line for line in written))
 
         # Always write versionMajor and versionMinor, even when 0
         font.versionMajor = 0
         font.versionMinor = 0
-        written = test_helpers.write_to_lines(font)
+        written = self.write_to_lines(font)
         self.assertIn("versionMajor = 0;", written)
         self.assertIn("versionMinor = 0;", written)
 
@@ -360,7 +368,7 @@ class WriterTest(unittest.TestCase, test_helpers.AssertLinesEqual):
         # Write the capHeight and xHeight even if they are "0"
         master.xHeight = 0
         master.capHeight = 0
-        written = test_helpers.write_to_lines(master)
+        written = self.write_to_lines(master)
         self.assertIn("xHeight = 0;", written)
         self.assertIn("capHeight = 0;", written)
 
@@ -681,14 +689,14 @@ class WriterTest(unittest.TestCase, test_helpers.AssertLinesEqual):
         glyph.script = ""
         glyph.category = ""
         glyph.subCategory = ""
-        written = test_helpers.write_to_lines(glyph)
+        written = self.write_to_lines(glyph)
         self.assertIn('script = "";', written)
         self.assertIn('category = "";', written)
         self.assertIn('subCategory = "";', written)
 
         # Write double unicodes
         glyph.unicodes = ['00C1', 'E002']
-        written = test_helpers.write_to_lines(glyph)
+        written = self.write_to_lines(glyph)
         self.assertIn('unicode = "00C1,E002";', written)
 
     def test_write_layer(self):
@@ -816,12 +824,12 @@ class WriterTest(unittest.TestCase, test_helpers.AssertLinesEqual):
 
         # Don't write a blank layer name
         layer.name = ""
-        written = test_helpers.write_to_lines(layer)
+        written = self.write_to_lines(layer)
         self.assertNotIn('name = "";', written)
 
         # Write the width even if 0
         layer.width = 0
-        written = test_helpers.write_to_lines(layer)
+        written = self.write_to_lines(layer)
         self.assertIn('width = 0;', written)
 
     def test_write_anchor(self):
@@ -1043,7 +1051,7 @@ rememberToDownloadARealRemindersApp = 1;}"'
         # FIXME: (jany) what does target = "up" mean?
         #   Is there an official python API to write that?
         # hint.targetNode = 'up'
-        # written = test_helpers.write_to_lines(hint)
+        # written = self.write_to_lines(hint)
         # self.assertIn('target = up;', written)
 
     def test_write_background_image(self):
@@ -1069,6 +1077,126 @@ rememberToDownloadARealRemindersApp = 1;}"'
         """))
 
 
+class FastWriterTest(WriterTest):
+    engine = 'fast'
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            Writer(UnicodeIO(), engine='turbo')
+
+    def test_same_output_as_stream_engine(self):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            font = classes.GSFont(os.path.join(
+                os.path.dirname(__file__), 'data', filename))
+            for stream_type in (UnicodeIO, BytesIO):
+                outputs = []
+                for engine in ('stream', 'fast'):
+                    fp = stream_type()
+                    Writer(fp, engine=engine).write(font)
+                    outputs.append(fp.getvalue())
+                self.assertEqual(outputs[0], outputs[1])
+
+    def test_flush(self):
+        font = classes.GSFont(os.path.join(
+            os.path.dirname(__file__), 'data', 'GlyphsUnitTestSans.glyphs'))
+        expected = UnicodeIO()
+        Writer(expected, engine='stream').write(font)
+        fp = UnicodeIO()
+        writer = _FastWriter(fp)
+        writer._FLUSH_SIZE = 10
+        writer.write(font)
+        self.assertEqual(fp.getvalue(), expected.getvalue())
+
+
+class IncrementalWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(
+            os.path.dirname(__file__), 'data', 'GlyphsUnitTestSans.glyphs')
+
+    def assertSameAsFullWrite(self, font):
+        fp = UnicodeIO()
+        dump(font, fp, incremental=True)
+        self.assertEqual(fp.getvalue(), dumps(font))
+
+    def test_unchanged_glyphs_are_not_parsed(self):
+        font = classes.GSFont(self.path, lazy=True)
+        font.glyphs['A'].layers[0].width = 1234
+        fp = UnicodeIO()
+        dump(font, fp, incremental=True)
+        self.assertEqual(
+            [glyph.name for glyph in font._glyphs
+             if isinstance(glyph, classes.GSGlyph)], ['A'])
+        self.assertIn('width = 1234;', fp.getvalue())
+        self.assertSameAsFullWrite(font)
+
+    def test_added_and_removed_glyphs(self):
+        font = classes.GSFont(self.path, lazy=True)
+        del font.glyphs[1]
+        font.glyphs.append(classes.GSGlyph('Z'))
+        self.assertSameAsFullWrite(font)
+
+    def test_filtered_masters(self):
+        font = classes.GSFont(self.path, lazy=True, masters=['Bold'])
+        self.assertSameAsFullWrite(font)
+
+    def test_save_to_same_path(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'font.glyphs')
+            shutil.copy(self.path, path)
+            font = classes.GSFont(path, lazy=True)
+            font.glyphs['A'].leftMetricsKey = 'H'
+            expected = dumps(font)
+            font.save(incremental=True)
+            with io.open(path, encoding='utf-8') as fp:
+                self.assertEqual(fp.read(), expected)
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_requires_fast_engine(self):
+        with self.assertRaises(ValueError):
+            Writer(UnicodeIO(), incremental=True)
+
+
+class ParallelWriterTest(unittest.TestCase):
+
+    def assertSameAsSequentialWrite(self, workers, **kwargs):
+        for filename in ('GlyphsUnitTestSans.glyphs',
+                         'MontserratStrippedDown.glyphs'):
+            path = os.path.join(os.path.dirname(__file__), 'data', filename)
+            expected = dumps(classes.GSFont(path))
+            font = classes.GSFont(path, **kwargs)
+            for stream_type in (UnicodeIO, BytesIO):
+                fp = stream_type()
+                Writer(fp, engine='fast', workers=workers,
+                       incremental=bool(kwargs)).write(font)
+                output = fp.getvalue()
+                if stream_type is BytesIO:
+                    output = output.decode('utf-8')
+                self.assertEqual(output, expected)
+
+    def test_workers(self):
+        self.assertSameAsSequentialWrite(2)
+        self.assertSameAsSequentialWrite(None)
+
+    def test_workers_that_are_not_forked(self):
+        workers_are_forked = glyphsLib.writer.workers_are_forked
+        glyphsLib.writer.workers_are_forked = lambda: False
+        try:
+            self.assertSameAsSequentialWrite(3)
+        finally:
+            glyphsLib.writer.workers_are_forked = workers_are_forked
+
+    def test_incremental(self):
+        self.assertSameAsSequentialWrite(2, lazy=True)
+
+    def test_requires_fast_engine(self):
+        with self.assertRaises(ValueError):
+            Writer(UnicodeIO(), workers=2)
+
+
 class WriterDumpInterfaceTest(unittest.TestCase):
     def test_dump(self):
         obj = classes.GSFont()